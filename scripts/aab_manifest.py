@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Android App Bundle Manifest Reader
+Reads versionCode/versionName from an AAB without bundletool or aapt2.
+
+Inside an .aab the manifest (base/manifest/AndroidManifest.xml) is not
+XML but an aapt2 `XmlNode` protobuf message (frameworks/base/tools/aapt2/
+Resources.proto). Only the handful of fields needed to walk the root
+<manifest> element's attributes are decoded here:
+
+    XmlNode       element = 1 (XmlElement)
+    XmlElement    name = 3, attribute = 4 (XmlAttribute, repeated)
+    XmlAttribute  name = 2, value = 3, compiled_item = 6 (Item)
+    Item          prim = 7 (Primitive)
+    Primitive     int_decimal_value = 6, int_hexadecimal_value = 7
+"""
+
+import zipfile
+from pathlib import Path
+
+MANIFEST_PATH = "base/manifest/AndroidManifest.xml"
+
+
+# ============================================================
+# Minimal Protobuf Decoding
+# ============================================================
+
+def _read_varint(data: bytes, pos: int) -> tuple:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(data: bytes):
+    """Yield (field_number, wire_type, value) for each field of a message
+
+    Varints are returned as ints, length-delimited fields as bytes; fixed
+    32/64-bit fields as raw bytes.
+    """
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        field_number, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        elif wire_type == 5:
+            value, pos = data[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"unsupported wire type {wire_type}")
+        yield field_number, wire_type, value
+
+
+def _field(data: bytes, number: int, default=None):
+    """First occurrence of a field (proto3 singular fields)"""
+    for field_number, _, value in _fields(data):
+        if field_number == number:
+            return value
+    return default
+
+
+def _signed32(value: int) -> int:
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+# ============================================================
+# Manifest Attributes
+# ============================================================
+
+def _attribute_value(attribute: bytes):
+    """String value of an XmlAttribute, falling back to its compiled integer"""
+    value = _field(attribute, 3)
+    if value:
+        return value.decode("utf-8")
+
+    item = _field(attribute, 6)
+    primitive = _field(item, 7) if item else None
+    if primitive:
+        for field_number, wire_type, number in _fields(primitive):
+            if field_number in (6, 7) and wire_type == 0:
+                return str(_signed32(number))
+    return None
+
+
+def manifest_attributes(manifest: bytes) -> dict:
+    """{name: value} for the attributes of the root <manifest> element"""
+    element = _field(manifest, 1)
+    if element is None or _field(element, 3, b"") != b"manifest":
+        raise ValueError("root element is not <manifest>")
+
+    attributes = {}
+    for field_number, _, attribute in _fields(element):
+        if field_number == 4:
+            name = _field(attribute, 2, b"").decode("utf-8")
+            attributes[name] = _attribute_value(attribute)
+    return attributes
+
+
+def read_manifest(aab_path: Path) -> dict:
+    """Root manifest attributes of an .aab (versionCode, versionName, package, ...)"""
+    with zipfile.ZipFile(aab_path) as aab:
+        return manifest_attributes(aab.read(MANIFEST_PATH))
+
+
+def read_version_code(aab_path: Path):
+    """versionCode of an .aab as int, or None if it can't be read"""
+    try:
+        version_code = read_manifest(aab_path).get("versionCode")
+        return int(version_code) if version_code is not None else None
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+App Store Connect API - Async Bulk Client
+Runs many independent App Store Connect calls (one PATCH per locale and the
+like) concurrently from asyncio.
+
+Each call runs asc_client's blocking helpers on a worker thread, so it shares
+the keep-alive session, the cached JWT and the rate limiter with everything
+else in the process; a semaphore caps the calls in flight (by default at the
+API host's connection pool size, so every call reuses a warm connection).
+429s are retried by asc_client; 5xx responses and connection errors are
+retried here with backoff for GET, PATCH and DELETE. POSTs are not retried:
+one that reached Apple before failing would come back 409 and a write that
+succeeded would be reported as failed.
+
+    async def patch_locale(client, locale):
+        return await client.patch(f"/appStoreVersionLocalizations/{ids[locale]}", data)
+
+    results = asc_async.run_all(locales, patch_locale, concurrency=8)
+"""
+
+import asyncio
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import asc_client
+import tracing
+from asc_client import BASE_URL_V1
+
+# ============================================================
+# Configuration
+# ============================================================
+
+DEFAULT_CONCURRENCY = asc_client.API_POOL_SIZE
+
+# Retries for 5xx responses and connection errors
+MAX_RETRIES = 3
+RETRY_DELAY = 1.0
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed call is worth retrying (5xx, connection error, timeout)"""
+    import requests
+
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+# ============================================================
+# Client
+# ============================================================
+
+class AsyncClient:
+    """asc_client calls awaitable from asyncio, at most `concurrency` in flight"""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY):
+        self.concurrency = max(concurrency, 1)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="asc")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._executor.shutdown(wait=False)
+
+    async def call(self, fn, *args, retry: bool = True, **kwargs):
+        """Await a blocking call (e.g. asc_client.api_patch), retrying transient failures
+
+        Pass retry=False for calls that are not idempotent.
+        """
+        loop = asyncio.get_running_loop()
+        retries = MAX_RETRIES if retry else 0
+        for attempt in range(retries + 1):
+            async with self._semaphore:
+                try:
+                    return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+                except Exception as e:
+                    if attempt == retries or not is_transient(e):
+                        raise
+            # Back off outside the semaphore so other calls keep going
+            delay = RETRY_DELAY * (2 ** attempt)
+            delay += random.uniform(0, delay / 2)
+            with tracing.span("retry wait", "sleep", seconds=round(delay, 3), attempt=attempt + 1):
+                await asyncio.sleep(delay)
+
+    async def get(self, endpoint: str, base_url: str = BASE_URL_V1) -> dict:
+        return await self.call(asc_client.api_get, endpoint, base_url)
+
+    async def post(self, endpoint: str, data: dict, base_url: str = BASE_URL_V1) -> dict:
+        return await self.call(asc_client.api_post, endpoint, data, base_url, retry=False)
+
+    async def patch(self, endpoint: str, data: dict, base_url: str = BASE_URL_V1) -> dict:
+        return await self.call(asc_client.api_patch, endpoint, data, base_url)
+
+    async def delete(self, endpoint: str, base_url: str = BASE_URL_V1) -> None:
+        return await self.call(asc_client.api_delete, endpoint, base_url)
+
+
+def run_all(items: list, job, concurrency: int = DEFAULT_CONCURRENCY) -> list:
+    """Run `await job(client, item)` for every item concurrently; results in item order
+
+    `job` should handle its own per-item errors; an exception it lets escape
+    is returned in that item's place.
+    """
+    async def _run():
+        async with AsyncClient(concurrency) as client:
+            return await asyncio.gather(*(job(client, item) for item in items), return_exceptions=True)
+
+    return asyncio.run(_run())
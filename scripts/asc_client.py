@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+App Store Connect API - Shared Client
+JWT auth and pooled HTTP sessions shared by all App Store Connect scripts.
+
+The signing key is parsed once per process and a signed token is reused
+until shortly before it expires. Tokens are also cached on disk (0600) so
+back-to-back script invocations skip signing entirely.
+
+All traffic (API calls and screenshot part uploads) goes through one
+keep-alive session with per-host connection pools, so a full run pays the
+TCP+TLS handshake once per host instead of once per request. API calls are
+paced by a shared rate limiter (see rate_limit.py) and retried on 429.
+
+requests, PyJWT and cryptography are imported on first use, so importing
+this module (e.g. for `--help` or `--list`) costs next to nothing.
+
+    SCANNIE_ASC_API_ORIGIN   API origin (e.g. a local mock_asc_server.py)
+    SCANNIE_ASC_KEY_PATH     .p8 signing key path
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import tracing
+from rate_limit import RateLimiter
+
+# ============================================================
+# Configuration
+# ============================================================
+
+BUNDLE_ID = "com.kobbokkom.scannie"
+ISSUER_ID = "a7524762-b1db-463b-84a8-bbee51a37cc2"
+KEY_ID = "74HC92L9NA"
+PRIVATE_KEY_PATH = Path(os.environ.get(
+    "SCANNIE_ASC_KEY_PATH", "/Users/semanticist/Documents/API/AuthKey_74HC92L9NA.p8"))
+
+API_ORIGIN = os.environ.get("SCANNIE_ASC_API_ORIGIN", "https://api.appstoreconnect.apple.com").rstrip("/")
+BASE_URL_V1 = f"{API_ORIGIN}/v1"
+BASE_URL_V2 = f"{API_ORIGIN}/v2"
+BASE_URL = BASE_URL_V1
+API_HOST = urlparse(API_ORIGIN).hostname
+
+# Apple rejects tokens that live longer than 20 minutes
+TOKEN_LIFETIME = 20 * 60
+# Refresh this many seconds before expiry so in-flight requests never carry a stale token
+TOKEN_REFRESH_MARGIN = 60
+
+# On-disk token cache (set SCANNIE_ASC_TOKEN_CACHE="" to disable)
+_token_cache_env = os.environ.get("SCANNIE_ASC_TOKEN_CACHE")
+if _token_cache_env is None:
+    TOKEN_CACHE_PATH = Path.home() / ".cache" / "scannie" / "asc_token.json"
+else:
+    TOKEN_CACHE_PATH = Path(_token_cache_env) if _token_cache_env else None
+
+# Keep-alive connections per host (screenshot uploads go to Apple's blob hosts)
+API_POOL_SIZE = 8
+HOST_POOL_SIZES = {
+    API_HOST: API_POOL_SIZE,
+}
+DEFAULT_POOL_SIZE = 4
+# Number of distinct host pools kept open (upload hosts vary per reservation)
+MAX_HOST_POOLS = 16
+
+# (connect, read) timeouts in seconds
+API_TIMEOUT = (5, 60)
+UPLOAD_TIMEOUT = (10, 120)
+
+# Retries for API calls rejected with 429 Too Many Requests
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Page size for list calls (the API maximum; the default is 50)
+PAGE_LIMIT = 200
+
+
+# ============================================================
+# JWT Token Generation
+# ============================================================
+
+class TokenProvider:
+    """Signs App Store Connect JWTs and reuses them until shortly before expiry"""
+
+    def __init__(self, key_path: Path = PRIVATE_KEY_PATH, key_id: str = KEY_ID,
+                 issuer_id: str = ISSUER_ID, cache_path: Path = TOKEN_CACHE_PATH):
+        self.key_path = key_path
+        self.key_id = key_id
+        self.issuer_id = issuer_id
+        self.cache_path = cache_path
+        self._private_key = None
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load_key(self):
+        """Parse the .p8 signing key once per process"""
+        if self._private_key is None:
+            from cryptography.hazmat.primitives import serialization
+            self._private_key = serialization.load_pem_private_key(
+                self.key_path.read_bytes(), password=None
+            )
+        return self._private_key
+
+    def _is_fresh(self, expires_at: float) -> bool:
+        return expires_at - TOKEN_REFRESH_MARGIN > time.time()
+
+    def _read_cache(self):
+        """Return (token, expires_at) from the disk cache, or None"""
+        if self.cache_path is None:
+            return None
+        try:
+            cached = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if cached.get("kid") != self.key_id or cached.get("iss") != self.issuer_id:
+            return None
+        if not self._is_fresh(cached.get("exp", 0)):
+            return None
+        return cached["token"], float(cached["exp"])
+
+    def _write_cache(self, token: str, expires_at: float) -> None:
+        """Atomically write the token cache, readable by the current user only"""
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({
+                    "kid": self.key_id,
+                    "iss": self.issuer_id,
+                    "exp": expires_at,
+                    "token": token,
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # Cache is an optimization only; signing still works without it
+            pass
+
+    def _sign(self):
+        """Sign a new token, returning (token, expires_at)"""
+        now = int(time.time())
+        expires_at = now + TOKEN_LIFETIME
+        payload = {
+            "iss": self.issuer_id,
+            "iat": now,
+            "exp": expires_at,
+            "aud": "appstoreconnect-v1",
+        }
+
+        headers = {
+            "alg": "ES256",
+            "kid": self.key_id,
+            "typ": "JWT",
+        }
+
+        import jwt
+        with tracing.span("jwt sign", "auth"):
+            token = jwt.encode(payload, self._load_key(), algorithm="ES256", headers=headers)
+        return token, float(expires_at)
+
+    def get_token(self) -> str:
+        """Return a valid token, signing a new one only when needed"""
+        with self._lock:
+            if self._token and self._is_fresh(self._expires_at):
+                return self._token
+
+            cached = self._read_cache()
+            if cached:
+                self._token, self._expires_at = cached
+                return self._token
+
+            self._token, self._expires_at = self._sign()
+            self._write_cache(self._token, self._expires_at)
+            return self._token
+
+    def invalidate(self, token: str = None) -> None:
+        """Drop the current token (e.g. after a 401) so the next call re-signs
+
+        With `token`, only drops it if it is still current, so concurrent
+        401s for the same token re-sign once.
+        """
+        with self._lock:
+            if token is not None and self._token is not None and self._token != token:
+                return
+            self._token = None
+            self._expires_at = 0.0
+            if self.cache_path is not None and self.cache_path.exists():
+                try:
+                    self.cache_path.unlink()
+                except OSError:
+                    pass
+
+
+_token_provider = TokenProvider()
+
+
+def generate_token() -> str:
+    """Get a JWT token for App Store Connect API (cached until near expiry)"""
+    return _token_provider.get_token()
+
+
+def get_headers() -> dict:
+    """Get authorization headers"""
+    return {
+        "Authorization": f"Bearer {generate_token()}",
+        "Content-Type": "application/json",
+    }
+
+
+# ============================================================
+# Pooled HTTP Session
+# ============================================================
+
+def _add_pool_counts(stats: dict, pool) -> None:
+    host = stats.setdefault(pool.host, {"opened": 0, "requests": 0})
+    host["opened"] += pool.num_connections
+    host["requests"] += pool.num_requests
+
+
+def _create_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class _CountingAdapter(HTTPAdapter):
+        """HTTPAdapter that remembers connection counts of pools it evicts"""
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.retired = {}
+            pools = self.poolmanager.pools
+            dispose = pools.dispose_func
+
+            def _retire(pool):
+                _add_pool_counts(self.retired, pool)
+                if dispose:
+                    dispose(pool)
+
+            pools.dispose_func = _retire
+
+    session = requests.Session()
+    default_adapter = _CountingAdapter(
+        pool_connections=MAX_HOST_POOLS,
+        pool_maxsize=DEFAULT_POOL_SIZE,
+    )
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+    scheme = urlparse(API_ORIGIN).scheme
+    for host, size in HOST_POOL_SIZES.items():
+        session.mount(f"{scheme}://{host}", _CountingAdapter(
+            pool_connections=1,
+            pool_maxsize=size,
+        ))
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+rate_limiter = RateLimiter()
+
+
+def _get_session() -> "requests.Session":
+    """The shared session, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def request(method: str, url: str, **kwargs) -> "requests.Response":
+    """Send a request through the shared keep-alive session
+
+    App Store Connect calls are paced by `rate_limiter` and retried after a
+    429, and retried once with a freshly signed token after a 401 (a cached
+    token Apple no longer accepts). Uses API_TIMEOUT for App Store Connect
+    and UPLOAD_TIMEOUT for any other host unless an explicit timeout is given.
+    """
+    is_api = url.startswith(f"{API_ORIGIN}/")
+    kwargs.setdefault("timeout", API_TIMEOUT if is_api else UPLOAD_TIMEOUT)
+    if not is_api:
+        return _traced_request(method, url, "upload", **kwargs)
+
+    response = _send_api_request(method, url, **kwargs)
+    headers = kwargs.get("headers") or {}
+    authorization = headers.get("Authorization", "")
+    if response.status_code != 401 or not authorization.startswith("Bearer "):
+        return response
+
+    print("    🔑 Token rejected (401), signing a new one...")
+    _token_provider.invalidate(authorization[len("Bearer "):])
+    kwargs["headers"] = {**headers, "Authorization": f"Bearer {generate_token()}"}
+    return _send_api_request(method, url, **kwargs)
+
+
+def _send_api_request(method: str, url: str, **kwargs) -> "requests.Response":
+    """App Store Connect request paced by `rate_limiter`, retrying 429s"""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        rate_limiter.acquire()
+        response = None
+        try:
+            response = _traced_request(method, url, "api", attempt=attempt, **kwargs)
+        finally:
+            rate_limiter.release(response)
+
+        if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+            return response
+        delay = rate_limiter.backoff(response, attempt)
+        print(f"    ⏳ Rate limited, retrying in {delay:.1f}s...")
+    return response
+
+
+def _traced_request(method: str, url: str, category: str, attempt: int = 0, **kwargs) -> "requests.Response":
+    """Session request recorded as a span named after the endpoint template"""
+    session = _get_session()
+    if not tracing.is_enabled():
+        return session.request(method, url, **kwargs)
+
+    endpoint = tracing.endpoint_template(url) if category == "api" else urlparse(url).hostname
+    with tracing.span(f"{method} {endpoint}", category, method=method, endpoint=endpoint) as span:
+        if attempt:
+            span["attempt"] = attempt
+        response = session.request(method, url, **kwargs)
+        span["status"] = response.status_code
+        span["bytes_sent"] = len(response.request.body or b"")
+        span["bytes_received"] = len(response.content)
+    return response
+
+
+def connection_stats() -> dict:
+    """Return {host: {"opened", "reused", "requests"}} for this process"""
+    stats = {}
+    if _session is None:
+        return stats
+    for adapter in set(_session.adapters.values()):
+        for host, counts in adapter.retired.items():
+            total = stats.setdefault(host, {"opened": 0, "requests": 0})
+            total["opened"] += counts["opened"]
+            total["requests"] += counts["requests"]
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                _add_pool_counts(stats, pool)
+
+    for counts in stats.values():
+        counts["reused"] = max(counts["requests"] - counts["opened"], 0)
+    return stats
+
+
+def print_connection_stats() -> None:
+    """Print connections opened vs reused per host, and rate limiter activity"""
+    stats = connection_stats()
+    if not stats:
+        return
+    print("🔌 Connections:")
+    for host, counts in sorted(stats.items()):
+        print(f"   {host}: {counts['opened']} opened, {counts['reused']} reused "
+              f"({counts['requests']} requests)")
+    print(f"⏱️  Rate limit: {rate_limiter.summary()}")
+
+
+# ============================================================
+# API Calls
+# ============================================================
+
+def api_get(endpoint: str, base_url: str = BASE_URL_V1) -> dict:
+    """Make GET request to App Store Connect API"""
+    response = request("GET", f"{base_url}{endpoint}", headers=get_headers())
+    response.raise_for_status()
+    return response.json()
+
+
+def api_post(endpoint: str, data: dict, base_url: str = BASE_URL_V1) -> dict:
+    """Make POST request to App Store Connect API"""
+    response = request("POST", f"{base_url}{endpoint}", headers=get_headers(), json=data)
+    response.raise_for_status()
+    return response.json()
+
+
+def api_patch(endpoint: str, data: dict, base_url: str = BASE_URL_V1) -> dict:
+    """Make PATCH request to App Store Connect API"""
+    response = request("PATCH", f"{base_url}{endpoint}", headers=get_headers(), json=data)
+    response.raise_for_status()
+    # Relationship updates answer 204 No Content
+    return response.json() if response.content else {}
+
+
+def api_delete(endpoint: str, base_url: str = BASE_URL_V1) -> None:
+    """Make DELETE request to App Store Connect API"""
+    response = request("DELETE", f"{base_url}{endpoint}", headers=get_headers())
+    response.raise_for_status()
+
+
+# ============================================================
+# Pagination
+# ============================================================
+
+def list_pages(endpoint: str, fields: dict = None, params: dict = None,
+               limit: int = PAGE_LIMIT, base_url: str = BASE_URL_V1):
+    """Yield each page (JSON:API document) of a list endpoint, following links.next
+
+    `fields` maps resource types to the attributes to return, e.g.
+    {"appStoreVersionLocalizations": ["locale", "supportUrl"]} is sent as
+    fields[appStoreVersionLocalizations]=locale,supportUrl. Pages are fetched
+    only as the caller iterates.
+    """
+    query = dict(params or {})
+    for resource_type, names in (fields or {}).items():
+        query[f"fields[{resource_type}]"] = ",".join(names)
+    if limit:
+        query["limit"] = limit
+
+    url = f"{base_url}{endpoint}"
+    while url:
+        response = request("GET", url, headers=get_headers(), params=query)
+        response.raise_for_status()
+        page = response.json()
+        yield page
+        # links.next carries the whole query (cursor, limit, fields...)
+        url = page.get("links", {}).get("next")
+        query = None
+
+
+def paginate(endpoint: str, fields: dict = None, params: dict = None,
+             limit: int = PAGE_LIMIT, base_url: str = BASE_URL_V1):
+    """Yield every resource of a list endpoint across all pages (see list_pages)"""
+    for page in list_pages(endpoint, fields, params, limit, base_url):
+        yield from page.get("data", [])
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+App Store Connect API - Screenshot Sets
+Shared by upload_app_store.py (iPhone promos) and upload_ipad_screenshots.py.
+
+sync_screenshot_set() compares local files with the remote appScreenshots
+by file name, MD5 (`sourceFileChecksum`) and position, and only deletes,
+uploads or reorders what actually changed. An unchanged set costs one GET.
+
+Parts of a reserved upload are PUT concurrently (PART_CONCURRENCY) with
+per-part retries; the screenshot is committed only after every part landed.
+"""
+
+import hashlib
+
+import asc_client
+import tracing
+from asc_client import api_post, api_patch, api_delete, paginate
+
+# Screenshots in these states are usable and can be kept as-is
+KEEP_DELIVERY_STATES = {"UPLOAD_COMPLETE", "COMPLETE"}
+
+# Parallel part uploads per screenshot (scripts override with --part-concurrency)
+PART_CONCURRENCY = 4
+# Retries per part for connection errors, 429 and 5xx
+PART_RETRIES = 3
+PART_RETRY_DELAY = 1.0
+
+
+# ============================================================
+# App Store Connect Operations
+# ============================================================
+
+def get_screenshot_sets(localization_id: str) -> list:
+    """Get all screenshot sets for a localization"""
+    return list(paginate(
+        f"/appStoreVersionLocalizations/{localization_id}/appScreenshotSets",
+        fields={"appScreenshotSets": ["screenshotDisplayType"]}
+    ))
+
+
+def create_screenshot_set(localization_id: str, display_type: str) -> dict:
+    """Create a new screenshot set"""
+    data = {
+        "data": {
+            "type": "appScreenshotSets",
+            "attributes": {
+                "screenshotDisplayType": display_type
+            },
+            "relationships": {
+                "appStoreVersionLocalization": {
+                    "data": {
+                        "type": "appStoreVersionLocalizations",
+                        "id": localization_id
+                    }
+                }
+            }
+        }
+    }
+    return api_post("/appScreenshotSets", data)
+
+
+def get_or_create_screenshot_set(localization_id: str, display_type: str) -> dict:
+    """Get the screenshot set for a display type, creating it if missing"""
+    for ss in get_screenshot_sets(localization_id):
+        if ss["attributes"]["screenshotDisplayType"] == display_type:
+            return ss
+
+    print(f"    Creating screenshot set for {display_type}")
+    return create_screenshot_set(localization_id, display_type)["data"]
+
+
+def get_screenshots_in_set(screenshot_set_id: str) -> list:
+    """Get all screenshots in a set, in display order"""
+    return list(paginate(
+        f"/appScreenshotSets/{screenshot_set_id}/appScreenshots",
+        fields={"appScreenshots": ["fileName", "sourceFileChecksum", "assetDeliveryState"]}
+    ))
+
+
+def delete_screenshot(screenshot_id: str) -> None:
+    """Delete a screenshot"""
+    api_delete(f"/appScreenshots/{screenshot_id}")
+
+
+def reorder_screenshots(screenshot_set_id: str, screenshot_ids: list) -> None:
+    """Replace the display order of a screenshot set"""
+    data = {
+        "data": [
+            {"type": "appScreenshots", "id": screenshot_id}
+            for screenshot_id in screenshot_ids
+        ]
+    }
+    api_patch(f"/appScreenshotSets/{screenshot_set_id}/relationships/appScreenshots", data)
+
+
+def reserve_screenshot(screenshot_set_id: str, filename: str, file_size: int) -> dict:
+    """Reserve a screenshot upload"""
+    data = {
+        "data": {
+            "type": "appScreenshots",
+            "attributes": {
+                "fileName": filename,
+                "fileSize": file_size
+            },
+            "relationships": {
+                "appScreenshotSet": {
+                    "data": {
+                        "type": "appScreenshotSets",
+                        "id": screenshot_set_id
+                    }
+                }
+            }
+        }
+    }
+    return api_post("/appScreenshots", data)
+
+
+def commit_screenshot(screenshot_id: str, checksum: str) -> dict:
+    """Commit a screenshot upload"""
+    data = {
+        "data": {
+            "type": "appScreenshots",
+            "id": screenshot_id,
+            "attributes": {
+                "uploaded": True,
+                "sourceFileChecksum": checksum
+            }
+        }
+    }
+    return api_patch(f"/appScreenshots/{screenshot_id}", data)
+
+
+def upload_screenshot_part(op: dict, file_data: bytes) -> None:
+    """Upload one part described by an upload operation, retrying transient failures"""
+    offset = op["offset"]
+    length = op["length"]
+
+    headers = {}
+    if isinstance(op.get("requestHeaders"), list):
+        headers = {h["name"]: h["value"] for h in op["requestHeaders"]}
+
+    import requests
+
+    part_data = file_data[offset:offset + length]
+    for attempt in range(PART_RETRIES + 1):
+        try:
+            response = asc_client.request(op.get("method", "PUT"), op["url"], headers=headers, data=part_data)
+            response.raise_for_status()
+            return
+        except requests.HTTPError as e:
+            status = e.response.status_code
+            if status != 429 and status < 500:
+                raise
+            error = e
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+
+        if attempt == PART_RETRIES:
+            raise error
+        tracing.sleep(PART_RETRY_DELAY * (2 ** attempt), "part retry wait", offset=offset)
+
+
+def upload_screenshot(screenshot_set_id: str, file_name: str, file_data: bytes) -> str:
+    """Upload a single screenshot, returning its ID (None if Apple gave no upload operations)"""
+    with tracing.span("upload screenshot", "upload", file=file_name, bytes=len(file_data)) as span:
+        checksum = hashlib.md5(file_data).hexdigest()
+
+        # Reserve upload
+        reservation = reserve_screenshot(screenshot_set_id, file_name, len(file_data))
+        screenshot_id = reservation["data"]["id"]
+
+        # Get upload operations
+        upload_ops = reservation["data"]["attributes"].get("uploadOperations", [])
+        span["parts"] = len(upload_ops)
+
+        if not upload_ops:
+            print(f"    No upload operations returned for {file_name}")
+            return None
+
+        # Upload parts concurrently
+        from concurrent.futures import ThreadPoolExecutor
+        try:
+            workers = max(1, min(PART_CONCURRENCY, len(upload_ops)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="part") as pool:
+                list(pool.map(lambda op: upload_screenshot_part(op, file_data), upload_ops))
+        except Exception:
+            # Don't leave a reservation stuck in AWAITING_UPLOAD
+            try:
+                delete_screenshot(screenshot_id)
+            except Exception:
+                pass
+            raise
+
+        # Commit only once every part is in
+        commit_screenshot(screenshot_id, checksum)
+        return screenshot_id
+
+
+# ============================================================
+# Checksum-based Sync
+# ============================================================
+
+def _screenshot_key(screenshot: dict) -> tuple:
+    attributes = screenshot["attributes"]
+    return attributes.get("fileName"), attributes.get("sourceFileChecksum")
+
+
+def _is_usable(screenshot: dict) -> bool:
+    delivery = screenshot["attributes"].get("assetDeliveryState") or {}
+    return delivery.get("state") in KEEP_DELIVERY_STATES
+
+
+def sync_screenshot_set(screenshot_set_id: str, files: list, missing: int = 0) -> dict:
+    """Make a screenshot set match `files`, a list of (file_name, png_bytes) in display order
+
+    Remote screenshots with the same file name and checksum are kept, the
+    rest are deleted, missing ones are uploaded and the set is reordered
+    only if the resulting order is wrong. Returns counts of what was done.
+
+    `missing` counts wanted files that could not be produced (failed
+    renders). `files` is then incomplete, so nothing is deleted or
+    reordered, and the missing files count as failed.
+    """
+    with tracing.span("sync screenshot set", files=len(files)) as span:
+        stats = _sync_screenshot_set(screenshot_set_id, files, missing)
+        span.update(stats)
+    return stats
+
+
+def _sync_screenshot_set(screenshot_set_id: str, files: list, missing: int = 0) -> dict:
+    stats = {"kept": 0, "deleted": 0, "uploaded": 0, "failed": missing, "reordered": False}
+    desired = [(name, hashlib.md5(data).hexdigest()) for name, data in files]
+
+    existing = get_screenshots_in_set(screenshot_set_id)
+    if [_screenshot_key(ss) for ss in existing] == desired and all(map(_is_usable, existing)):
+        stats["kept"] = len(existing)
+        print(f"    ⏭️  {len(existing)} screenshots unchanged")
+        return stats
+
+    # Match remote screenshots to desired slots by (file name, checksum)
+    reusable = {}
+    to_delete = []
+    for ss in existing:
+        if _is_usable(ss):
+            reusable.setdefault(_screenshot_key(ss), []).append(ss)
+        else:
+            to_delete.append(ss)
+
+    final_ids = []
+    for key in desired:
+        candidates = reusable.get(key)
+        final_ids.append(candidates.pop(0)["id"] if candidates else None)
+    for candidates in reusable.values():
+        to_delete.extend(candidates)
+
+    if missing:
+        # A screenshot that failed to render is not an unwanted one
+        print(f"    ⚠️  {missing} screenshots failed to render; keeping remote screenshots and order")
+        to_delete = []
+    for ss in to_delete:
+        print(f"    Deleting: {ss['attributes'].get('fileName')}")
+        delete_screenshot(ss["id"])
+        stats["deleted"] += 1
+
+    kept_ids = {screenshot_id for screenshot_id in final_ids if screenshot_id}
+    stats["kept"] = len(kept_ids)
+    current_order = [ss["id"] for ss in existing if ss["id"] in kept_ids]
+
+    for index, (file_name, file_data) in enumerate(files):
+        if final_ids[index]:
+            continue
+        print(f"    Uploading {file_name}...")
+        try:
+            screenshot_id = upload_screenshot(screenshot_set_id, file_name, file_data)
+        except Exception as e:
+            print(f"    ✗ Failed to upload {file_name}: {e}")
+            screenshot_id = None
+        if screenshot_id:
+            print(f"    ✓ Uploaded {file_name}")
+            final_ids[index] = screenshot_id
+            current_order.append(screenshot_id)
+            stats["uploaded"] += 1
+        else:
+            stats["failed"] += 1
+
+    final_order = [screenshot_id for screenshot_id in final_ids if screenshot_id]
+    if final_order != current_order and not missing:
+        print(f"    Reordering {len(final_order)} screenshots")
+        reorder_screenshots(screenshot_set_id, final_order)
+        stats["reordered"] = True
+
+    return stats
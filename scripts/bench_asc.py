@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+App Store Connect Benchmark
+Runs the ASC scripts end to end against mock_asc_server.py and reports wall
+time, request counts and bytes per scenario.
+
+    python bench_asc.py                                   # cold + warm run of every scenario
+    python bench_asc.py --latency-ms 120 --error-429 0.03 --jobs 4
+    python bench_asc.py --scenario update_support_url --endpoints
+    python bench_asc.py --json bench.json
+
+Each scenario runs as a subprocess with SCANNIE_ASC_API_ORIGIN pointed at
+an in-process mock, a throwaway signing key and a fresh render cache. The
+first run is cold (empty cache, nothing uploaded yet); later runs see the
+state the previous ones left behind, like re-running a release.
+"""
+
+import json
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from mock_asc_server import MockASC
+
+SCRIPTS_DIR = Path(__file__).parent
+
+SCENARIOS = ["upload_app_store", "upload_ipad", "update_support_url"]
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+def write_signing_key(path: Path) -> None:
+    """Throwaway ES256 key in the .p8 (PKCS#8 PEM) format Apple hands out"""
+    key = ec.generate_private_key(ec.SECP256R1())
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ))
+
+
+def write_noise_png(path: Path, size_kb: int, seed: int) -> None:
+    """RGB noise PNG of roughly size_kb (noise does not compress)"""
+    rng = random.Random(seed)
+    width = 512
+    height = max(size_kb * 1024 // (width * 3), 1)
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def can_render_promos() -> bool:
+    """Whether upload_app_store.py can render its SVG screenshots here"""
+    try:
+        import cairosvg  # noqa: F401
+        import PIL  # noqa: F401
+        return True
+    except ImportError:
+        return bool(shutil.which("rsvg-convert") and shutil.which("magick"))
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+
+def scenario_command(name: str, args, ipad_dir: Path, skip_screenshots: bool) -> list:
+    if name == "upload_app_store":
+        command = ["upload_app_store.py", "--all", "--jobs", str(args.jobs)]
+        return command + (["--skip-screenshots"] if skip_screenshots else [])
+    if name == "upload_ipad":
+        return ["upload_ipad_screenshots.py", "--all", "--dir", str(ipad_dir)]
+    return ["update_support_url.py"]
+
+
+def run_scenario(mock: MockASC, name: str, command: list, env: dict, verbose: bool) -> dict:
+    """Run one script against the mock; returns timing and the server's stats"""
+    mock.reset_stats()
+    started = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, *command],
+        cwd=SCRIPTS_DIR,
+        env=env,
+        stdout=None if verbose else subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+    wall = time.monotonic() - started
+    stats = mock.stats()
+    return {
+        "scenario": name,
+        "command": " ".join(command),
+        "exit_code": result.returncode,
+        "output": result.stdout or "",
+        "wall_seconds": round(wall, 3),
+        "requests": stats["requests"],
+        "bytes_sent": stats["bytes_in"],
+        "bytes_received": stats["bytes_out"],
+        "status": stats["status"],
+        "endpoints": stats["endpoints"],
+    }
+
+
+def _count(status: dict, predicate) -> int:
+    return sum(n for code, n in status.items() if predicate(int(code)))
+
+
+def print_report(results: list, show_endpoints: bool) -> None:
+    print(f"\n{'='*86}")
+    print(f"{'scenario':<20} {'run':>3} {'exit':>4} {'wall':>8} {'reqs':>6} {'429':>5} {'5xx':>5}"
+          f" {'sent KB':>10} {'recv KB':>10}")
+    print(f"{'-'*86}")
+    for r in results:
+        print(f"{r['scenario']:<20} {r['run']:>3} {r['exit_code']:>4} {r['wall_seconds']:>7.2f}s"
+              f" {r['requests']:>6} {_count(r['status'], lambda c: c == 429):>5}"
+              f" {_count(r['status'], lambda c: c >= 500):>5}"
+              f" {r['bytes_sent'] / 1024:>10.1f} {r['bytes_received'] / 1024:>10.1f}")
+    print(f"{'='*86}")
+
+    if not show_endpoints:
+        return
+    for r in results:
+        print(f"\n📊 {r['scenario']} (run {r['run']})")
+        endpoints = sorted(r["endpoints"].items(), key=lambda item: -item[1]["requests"])
+        for endpoint, stats in endpoints:
+            print(f"   {stats['requests']:>5}  {stats['bytes_in'] / 1024:>9.1f} KB up"
+                  f"  {stats['bytes_out'] / 1024:>9.1f} KB down  {endpoint}")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the ASC scripts against a local mock API")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=2, help="Runs per scenario (default: cold + warm)")
+    parser.add_argument("--jobs", type=int, default=4, help="--jobs for upload_app_store.py")
+    parser.add_argument("--skip-screenshots", action="store_true",
+                        help="Pass --skip-screenshots to upload_app_store.py")
+    parser.add_argument("--ipad-shots", type=int, default=3, help="Placeholder iPad screenshots")
+    parser.add_argument("--ipad-shot-kb", type=int, default=900, help="Size of each placeholder")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mock latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Mock random extra latency")
+    parser.add_argument("--error-429", type=float, default=0, metavar="RATE")
+    parser.add_argument("--error-5xx", type=float, default=0, metavar="RATE")
+    parser.add_argument("--seed", type=int, default=1, help="Mock random seed")
+    parser.add_argument("--endpoints", action="store_true", help="Show per-endpoint breakdown")
+    parser.add_argument("--verbose", action="store_true", help="Show script output")
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    parser.add_argument("--trace-dir", type=Path, metavar="DIR",
+                        help="Write a --trace file per scenario run into DIR")
+
+    args = parser.parse_args()
+    scenarios = args.scenario or SCENARIOS
+
+    skip_screenshots = args.skip_screenshots
+    if "upload_app_store" in scenarios and not skip_screenshots and not can_render_promos():
+        print("⚠️  No SVG renderer (cairosvg+Pillow or rsvg-convert+magick); "
+              "running upload_app_store.py with --skip-screenshots")
+        skip_screenshots = True
+
+    mock = MockASC(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        seed=args.seed,
+    ).start(port=0)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="scannie-bench-") as tmp:
+        tmp = Path(tmp)
+        key_path = tmp / "AuthKey_BENCH.p8"
+        write_signing_key(key_path)
+        ipad_dir = tmp / "ipad"
+        ipad_dir.mkdir()
+        for i in range(args.ipad_shots):
+            write_noise_png(ipad_dir / f"ipad_{i + 1:02d}.png", args.ipad_shot_kb, seed=i)
+
+        env = dict(
+            os.environ,
+            SCANNIE_ASC_API_ORIGIN=mock.api_origin,
+            SCANNIE_ASC_KEY_PATH=str(key_path),
+            SCANNIE_ASC_TOKEN_CACHE="",
+            SCANNIE_RENDER_CACHE=str(tmp / "render-cache"),
+            PYTHONUNBUFFERED="1",
+        )
+
+        print(f"🧪 Mock API at {mock.api_origin} "
+              f"(latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+              f"429 {args.error_429:.0%}, 5xx {args.error_5xx:.0%})")
+        for run in range(1, args.runs + 1):
+            for name in scenarios:
+                command = scenario_command(name, args, ipad_dir, skip_screenshots)
+                if args.trace_dir:
+                    args.trace_dir.mkdir(parents=True, exist_ok=True)
+                    command += ["--trace", str(args.trace_dir.resolve() / f"{name}-{run}.json")]
+                print(f"▶️  [{run}] {' '.join(command)}")
+                result = run_scenario(mock, name, command, env, args.verbose)
+                result["run"] = run
+                results.append(result)
+                if result["exit_code"] != 0 and not args.verbose:
+                    print(f"   ❌ exited {result['exit_code']}; last output:")
+                    for line in result["output"].splitlines()[-10:]:
+                        print(f"      {line}")
+
+    mock.stop()
+    print_report(results, args.endpoints)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            [{k: v for k, v in r.items() if k != "output"} for r in results], indent=2))
+        print(f"\n💾 Results written to {args.json}")
+
+    sys.exit(0 if all(r["exit_code"] == 0 for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Google Play Benchmark
+Runs the Play Store scripts end to end against mock_play_server.py and
+reports wall time, HTTP round trips, API calls per endpoint and bytes.
+
+    python bench_play.py                                  # cold + warm run of every scenario
+    python bench_play.py --latency-ms 150 --jobs 8
+    python bench_play.py --scenario upload_play_store --json bench.json
+
+upload_play_store runs `--all` over the repo's store metadata (every
+language in store/metadata/android). upload_aab uploads a synthetic App
+Bundle with a real aapt2 manifest. Each script runs as a subprocess with
+SCANNIE_PLAY_API_ORIGIN pointed at an in-process mock and a throwaway
+service account whose token_uri is the mock. Later runs see the state the
+previous ones committed, like re-running a release.
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from aab_manifest import MANIFEST_PATH
+from mock_play_server import MockPlay
+
+SCRIPTS_DIR = Path(__file__).parent
+
+SCENARIOS = ["upload_play_store", "upload_aab"]
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+def write_service_account(path: Path, token_uri: str) -> None:
+    """Throwaway service account JSON that authenticates against the mock"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "scannie-bench",
+        "private_key_id": "bench",
+        "private_key": key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode(),
+        "client_email": "bench@scannie-bench.iam.gserviceaccount.com",
+        "client_id": "0",
+        "token_uri": token_uri,
+    }))
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _message_field(number: int, data: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(data)) + data
+
+
+def write_aab(path: Path, version_code: int, size_mb: int) -> None:
+    """App Bundle with an aapt2 XmlNode manifest and size_mb of incompressible dex"""
+    attributes = b"".join(
+        _message_field(4, _message_field(2, name.encode()) + _message_field(3, value.encode()))
+        for name, value in (("versionCode", str(version_code)), ("versionName", "1.0.0"),
+                            ("package", "com.kobbokkom.scannie"))
+    )
+    manifest = _message_field(1, _message_field(3, b"manifest") + attributes)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as aab:
+        aab.writestr(MANIFEST_PATH, manifest)
+        aab.writestr("base/dex/classes.dex", random.Random(version_code).randbytes(size_mb * 1024 * 1024))
+
+
+def can_render_promos() -> bool:
+    """Whether upload_play_store.py can render its SVG screenshots here"""
+    try:
+        import cairosvg  # noqa: F401
+        import PIL  # noqa: F401
+        return True
+    except ImportError:
+        return bool(shutil.which("rsvg-convert") and shutil.which("magick"))
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+
+def scenario_command(name: str, args, aab_path: Path, skip_screenshots: bool) -> list:
+    if name == "upload_play_store":
+        command = ["upload_play_store.py", "--all", "--jobs", str(args.jobs)]
+        return command + (["--skip-screenshots"] if skip_screenshots else [])
+    return ["upload_aab_alpha.py", "--track", "internal", "--aab", str(aab_path),
+            "--chunk-mb", str(args.chunk_mb)]
+
+
+def run_scenario(mock: MockPlay, name: str, command: list, env: dict, verbose: bool) -> dict:
+    """Run one script against the mock; returns timing and the server's stats"""
+    mock.reset_stats()
+    started = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, *command],
+        cwd=SCRIPTS_DIR,
+        env=env,
+        stdout=None if verbose else subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+    wall = time.monotonic() - started
+    stats = mock.stats()
+    return {
+        "scenario": name,
+        "command": " ".join(command),
+        "exit_code": result.returncode,
+        "output": result.stdout or "",
+        "wall_seconds": round(wall, 3),
+        "requests": stats["requests"],
+        "calls": stats["calls"],
+        "bytes_sent": stats["bytes_in"],
+        "bytes_received": stats["bytes_out"],
+        "status": stats["status"],
+        "endpoints": stats["endpoints"],
+    }
+
+
+def _count(status: dict, predicate) -> int:
+    return sum(n for code, n in status.items() if predicate(int(code)))
+
+
+def print_report(results: list) -> None:
+    print(f"\n{'='*88}")
+    print(f"{'scenario':<18} {'run':>3} {'exit':>4} {'wall':>8} {'http':>5} {'calls':>6} {'429':>4} {'5xx':>4}"
+          f" {'sent KB':>11} {'recv KB':>9}")
+    print(f"{'-'*88}")
+    for r in results:
+        print(f"{r['scenario']:<18} {r['run']:>3} {r['exit_code']:>4} {r['wall_seconds']:>7.2f}s"
+              f" {r['requests']:>5} {r['calls']:>6} {_count(r['status'], lambda c: c == 429):>4}"
+              f" {_count(r['status'], lambda c: c >= 500):>4}"
+              f" {r['bytes_sent'] / 1024:>11.1f} {r['bytes_received'] / 1024:>9.1f}")
+    print(f"{'='*88}")
+
+    for r in results:
+        print(f"\n📊 {r['scenario']} (run {r['run']})")
+        endpoints = sorted(r["endpoints"].items(), key=lambda item: (-item[1]["calls"], item[0]))
+        for endpoint, stats in endpoints:
+            print(f"   {stats['calls']:>5}  {stats['bytes_in'] / 1024:>9.1f} KB up"
+                  f"  {stats['bytes_out'] / 1024:>8.1f} KB down  {endpoint}")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the Play Store scripts against a local mock API")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=2, help="Runs per scenario (default: cold + warm)")
+    parser.add_argument("--jobs", type=int, default=4, help="--jobs for upload_play_store.py")
+    parser.add_argument("--skip-screenshots", action="store_true",
+                        help="Pass --skip-screenshots to upload_play_store.py")
+    parser.add_argument("--aab-mb", type=int, default=24, help="Size of the synthetic App Bundle")
+    parser.add_argument("--chunk-mb", type=int, default=8, help="--chunk-mb for upload_aab_alpha.py")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mock latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Mock random extra latency")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="Mock upload bandwidth")
+    parser.add_argument("--error-429", type=float, default=0, metavar="RATE")
+    parser.add_argument("--error-5xx", type=float, default=0, metavar="RATE")
+    parser.add_argument("--seed", type=int, default=1, help="Mock random seed")
+    parser.add_argument("--verbose", action="store_true", help="Show script output")
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    parser.add_argument("--trace-dir", type=Path, metavar="DIR",
+                        help="Write a --trace file per scenario run into DIR")
+
+    args = parser.parse_args()
+    scenarios = args.scenario or SCENARIOS
+
+    skip_screenshots = args.skip_screenshots
+    if "upload_play_store" in scenarios and not skip_screenshots and not can_render_promos():
+        print("⚠️  No SVG renderer (cairosvg+Pillow or rsvg-convert+magick); "
+              "running upload_play_store.py with --skip-screenshots")
+        skip_screenshots = True
+
+    mock = MockPlay(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        seed=args.seed,
+    ).start(port=0)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="scannie-bench-") as tmp:
+        tmp = Path(tmp)
+        account_path = tmp / "service_account.json"
+        write_service_account(account_path, f"{mock.origin}/token")
+        aab_path = tmp / "app-release.aab"
+        if "upload_aab" in scenarios:
+            write_aab(aab_path, version_code=1000, size_mb=args.aab_mb)
+
+        env = dict(
+            os.environ,
+            SCANNIE_PLAY_API_ORIGIN=mock.origin,
+            SCANNIE_PLAY_SERVICE_ACCOUNT=str(account_path),
+            SCANNIE_AAB_UPLOAD_STATE="",
+            SCANNIE_RENDER_CACHE=str(tmp / "render-cache"),
+            PYTHONUNBUFFERED="1",
+        )
+
+        print(f"🧪 Mock API at {mock.origin} "
+              f"(latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+              f"429 {args.error_429:.0%}, 5xx {args.error_5xx:.0%})")
+        for run in range(1, args.runs + 1):
+            for name in scenarios:
+                command = scenario_command(name, args, aab_path, skip_screenshots)
+                if args.trace_dir:
+                    args.trace_dir.mkdir(parents=True, exist_ok=True)
+                    command += ["--trace", str(args.trace_dir.resolve() / f"{name}-{run}.json")]
+                print(f"▶️  [{run}] {' '.join(command)}")
+                result = run_scenario(mock, name, command, env, args.verbose)
+                result["run"] = run
+                results.append(result)
+                if result["exit_code"] != 0 and not args.verbose:
+                    print(f"   ❌ exited {result['exit_code']}; last output:")
+                    for line in result["output"].splitlines()[-10:]:
+                        print(f"      {line}")
+
+    mock.stop()
+    print_report(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            [{k: v for k, v in r.items() if k != "output"} for r in results], indent=2))
+        print(f"\n💾 Results written to {args.json}")
+
+    sys.exit(0 if all(r["exit_code"] == 0 for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Times cheap CLI commands (help, --list) against a bare interpreter start and
+checks that none of them imports the heavy client libraries.
+
+    python bench_startup.py                   # median of 10 runs per command
+    python bench_startup.py --runs 30 --budget-ms 40
+    python bench_startup.py --json startup.json
+
+A command fails when its median start exceeds the bare interpreter by more
+than --budget-ms, or when `python -X importtime` shows it loading requests,
+PyJWT, cryptography, google-api-python-client, google-auth or httplib2.
+Those belong to the first API call, not to printing help. Exits non-zero
+on any failure, so it can gate a release script or CI job.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# Cheap commands: nothing here may touch the network
+COMMANDS = [
+    ["scannie_store.py", "--help"],
+    ["scannie_store.py", "ios", "--help"],
+    ["scannie_store.py", "ios", "upload", "--list"],
+    ["scannie_store.py", "ios", "upload", "--help"],
+    ["scannie_store.py", "ios", "ipad", "--help"],
+    ["scannie_store.py", "ios", "support-url", "--help"],
+    ["scannie_store.py", "ios", "submit", "--help"],
+    ["scannie_store.py", "play", "upload", "--list"],
+    ["scannie_store.py", "play", "aab", "--help"],
+    ["scannie_store.py", "iap", "--help"],
+    ["scannie_store.py", "iap", "list", "--help"],
+    ["scannie_store.py", "iap", "price", "--help"],
+    ["scannie_store.py", "iap", "localize", "--help"],
+    ["scannie_store.py", "iap", "update-localizations", "--help"],
+    ["upload_app_store.py", "--list"],
+    ["upload_play_store.py", "--list"],
+]
+
+HEAVY_MODULES = ["requests", "jwt", "cryptography", "googleapiclient", "google.auth",
+                 "google.oauth2", "google_auth_httplib2", "httplib2", "urllib3"]
+
+
+# ============================================================
+# Measurement
+# ============================================================
+
+def time_command(command: list, runs: int) -> list:
+    """Wall seconds of `runs` subprocess runs of command"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *command], cwd=SCRIPTS_DIR,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def heavy_imports(command: list) -> list:
+    """HEAVY_MODULES (top-level names) that command imports, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=SCRIPTS_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imported = {line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines()
+                if line.startswith("import time:") and "|" in line}
+    return [module for module in HEAVY_MODULES
+            if any(name == module or name.startswith(f"{module}.") for name in imported)]
+
+
+def measure(command: list, runs: int, baseline: float, budget_ms: float) -> dict:
+    timings = time_command(command, runs)
+    median = statistics.median(timings)
+    heavy = heavy_imports(command)
+    overhead_ms = (median - baseline) * 1000
+    return {
+        "command": " ".join(command),
+        "median_ms": round(median * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+        "overhead_ms": round(overhead_ms, 1),
+        "heavy_imports": heavy,
+        "ok": not heavy and overhead_ms <= budget_ms,
+    }
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+
+def print_report(results: list, baseline: float, budget_ms: float) -> None:
+    print(f"\n{'='*88}")
+    print(f"{'command':<50} {'median':>8} {'min':>8} {'+python':>8}  heavy imports")
+    print(f"{'-'*88}")
+    print(f"{'python -c pass':<50} {baseline * 1000:>6.1f}ms")
+    for r in results:
+        mark = "✓" if r["ok"] else "✗"
+        print(f"{r['command']:<50} {r['median_ms']:>6.1f}ms {r['min_ms']:>6.1f}ms"
+              f" {r['overhead_ms']:>+6.1f}ms  {mark} {', '.join(r['heavy_imports']) or '-'}")
+    print(f"{'='*88}")
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        print(f"❌ {len(failed)} of {len(results)} commands over budget ({budget_ms:.0f} ms) "
+              f"or importing client libraries")
+    else:
+        print(f"✅ All {len(results)} commands within {budget_ms:.0f} ms of a bare interpreter start")
+
+
+def main(argv: list = None):
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time of cheap commands")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=50,
+                        help="Allowed median time over `python -c pass` (default: 50)")
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+
+    args = parser.parse_args(argv)
+
+    time_command(["-c", "pass"], 2)  # warm the OS file cache
+    baseline = statistics.median(time_command(["-c", "pass"], args.runs))
+
+    results = []
+    for command in COMMANDS:
+        results.append(measure(command, args.runs, baseline, args.budget_ms))
+    print_report(results, baseline, args.budget_ms)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "baseline_ms": round(baseline * 1000, 1),
+            "budget_ms": args.budget_ms,
+            "commands": results,
+        }, indent=2))
+        print(f"\n💾 Results written to {args.json}")
+
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
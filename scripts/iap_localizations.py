@@ -3,9 +3,9 @@
 Add IAP localizations for all supported languages
 """
 
-import sys
-sys.path.insert(0, '.')
-from manage_iap import api_post, api_get, BASE_URL_V1, BASE_URL_V2
+import asc_client
+import tracing
+from manage_iap import BASE_URL_V1, BASE_URL_V2
 
 IAP_ID = '6755902740'
 
@@ -52,7 +52,7 @@ TRANSLATIONS = {
     "zh-Hant": ("移除廣告", "永久移除所有廣告。"),
 }
 
-def create_localization(locale: str, name: str, description: str) -> bool:
+async def create_localization(client, locale: str, name: str, description: str) -> bool:
     """Create IAP localization for a locale"""
     data = {
         'data': {
@@ -74,47 +74,63 @@ def create_localization(locale: str, name: str, description: str) -> bool:
     }
 
     try:
-        api_post('/inAppPurchaseLocalizations', data, base_url=BASE_URL_V1)
+        await client.post('/inAppPurchaseLocalizations', data, base_url=BASE_URL_V1)
         return True
     except Exception as e:
-        print(f"    Error: {e}")
+        response = getattr(e, "response", None)
+        print(f"    Error ({locale}): {e} {response.text[:300] if response is not None else ''}")
         return False
 
 
 def get_existing_locales() -> set:
     """Get existing localization locales"""
-    response = api_get(f'/inAppPurchases/{IAP_ID}/inAppPurchaseLocalizations', base_url=BASE_URL_V2)
-    locs = response.get('data', [])
+    locs = asc_client.paginate(f'/inAppPurchases/{IAP_ID}/inAppPurchaseLocalizations',
+                               fields={'inAppPurchaseLocalizations': ['locale']}, base_url=BASE_URL_V2)
     return {loc['attributes']['locale'] for loc in locs}
 
 
-if __name__ == "__main__":
+def main(argv: list = None):
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add IAP localizations for all supported languages")
+    parser.add_argument("--concurrency", type=int, default=asc_client.API_POOL_SIZE, metavar="N",
+                        help="Localizations written at once (default: %(default)s)")
+    tracing.add_argument(parser)
+    args = parser.parse_args(argv)
+    tracing.start(args.trace)
+
+    import asc_async
+
     print("🔍 Checking existing localizations...")
     existing = get_existing_locales()
     print(f"   Found {len(existing)} existing: {', '.join(sorted(existing))}")
 
     print(f"\n📝 Adding {len(TRANSLATIONS)} localizations...")
 
-    success = 0
     skipped = 0
-    failed = 0
 
-    for locale, (name, desc) in TRANSLATIONS.items():
+    missing = [locale for locale in TRANSLATIONS if locale not in existing]
+    for locale in TRANSLATIONS:
         if locale in existing:
             print(f"   ⏭️  {locale}: already exists")
             skipped += 1
-            continue
 
-        print(f"   🌐 {locale}: {name}...", end=" ")
+    async def add(client, locale: str) -> bool:
+        name, desc = TRANSLATIONS[locale]
+        ok = await create_localization(client, locale, name, desc)
+        print(f"   🌐 {locale}: {name} {'✅' if ok else '❌'}")
+        return ok
 
-        if create_localization(locale, name, desc):
-            print("✅")
-            success += 1
-        else:
-            print("❌")
-            failed += 1
+    results = asc_async.run_all(missing, add, concurrency=args.concurrency)
+    success = sum(1 for ok in results if ok is True)
+    failed = len(results) - success
 
     print(f"\n📊 Results:")
     print(f"   ✅ Added: {success}")
     print(f"   ⏭️  Skipped: {skipped}")
     print(f"   ❌ Failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,9 @@
 Update IAP localizations with friendly marketing copy (카카오/토스 style)
 """
 
-import sys
-import requests
-sys.path.insert(0, '.')
-from manage_iap import get_headers, api_get, BASE_URL_V1, BASE_URL_V2
+import asc_client
+import tracing
+from manage_iap import BASE_URL_V2
 
 IAP_ID = '6755902740'
 
@@ -56,20 +55,7 @@ TRANSLATIONS = {
 }
 
 
-def api_patch(endpoint: str, data: dict, base_url: str = BASE_URL_V1) -> dict:
-    """Make PATCH request to App Store Connect API"""
-    url = f"{base_url}{endpoint}"
-    response = requests.patch(url, headers=get_headers(), json=data)
-
-    if response.status_code not in [200, 201]:
-        print(f"Error PATCH {url}: {response.status_code}")
-        print(response.text)
-        raise Exception(f"API error: {response.status_code}")
-
-    return response.json()
-
-
-def update_localization(loc_id: str, name: str, description: str) -> bool:
+async def update_localization(client, loc_id: str, name: str, description: str) -> bool:
     """Update IAP localization"""
     data = {
         'data': {
@@ -83,48 +69,63 @@ def update_localization(loc_id: str, name: str, description: str) -> bool:
     }
 
     try:
-        api_patch(f'/inAppPurchaseLocalizations/{loc_id}', data)
+        await client.patch(f'/inAppPurchaseLocalizations/{loc_id}', data)
         return True
     except Exception as e:
-        print(f"    Error: {e}")
+        response = getattr(e, "response", None)
+        print(f"    Error ({loc_id}): {e} {response.text[:300] if response is not None else ''}")
         return False
 
 
 def get_localizations() -> dict:
     """Get all localizations with their IDs"""
-    response = api_get(f'/inAppPurchases/{IAP_ID}/inAppPurchaseLocalizations', base_url=BASE_URL_V2)
-    locs = response.get('data', [])
+    locs = asc_client.paginate(f'/inAppPurchases/{IAP_ID}/inAppPurchaseLocalizations',
+                               fields={'inAppPurchaseLocalizations': ['locale']}, base_url=BASE_URL_V2)
     return {loc['attributes']['locale']: loc['id'] for loc in locs}
 
 
-if __name__ == "__main__":
+def main(argv: list = None):
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update IAP localizations with friendly marketing copy")
+    parser.add_argument("--concurrency", type=int, default=asc_client.API_POOL_SIZE, metavar="N",
+                        help="Localizations written at once (default: %(default)s)")
+    tracing.add_argument(parser)
+    args = parser.parse_args(argv)
+    tracing.start(args.trace)
+
+    import asc_async
+
     print("🔍 Fetching existing localizations...")
     loc_map = get_localizations()
     print(f"   Found {len(loc_map)} localizations")
 
     print(f"\n✨ Updating to friendly marketing copy...")
 
-    success = 0
-    failed = 0
     skipped = 0
 
-    for locale, (name, desc) in TRANSLATIONS.items():
+    found = [locale for locale in TRANSLATIONS if locale in loc_map]
+    for locale in TRANSLATIONS:
         if locale not in loc_map:
             print(f"   ⏭️  {locale}: not found, skipping")
             skipped += 1
-            continue
 
-        loc_id = loc_map[locale]
-        print(f"   🌐 {locale}: {name}...", end=" ")
+    async def update(client, locale: str) -> bool:
+        name, desc = TRANSLATIONS[locale]
+        ok = await update_localization(client, loc_map[locale], name, desc)
+        print(f"   🌐 {locale}: {name} {'✅' if ok else '❌'}")
+        return ok
 
-        if update_localization(loc_id, name, desc):
-            print("✅")
-            success += 1
-        else:
-            print("❌")
-            failed += 1
+    results = asc_async.run_all(found, update, concurrency=args.concurrency)
+    success = sum(1 for ok in results if ok is True)
+    failed = len(results) - success
 
     print(f"\n📊 Results:")
     print(f"   ✅ Updated: {success}")
     print(f"   ⏭️  Skipped: {skipped}")
     print(f"   ❌ Failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,57 +6,9 @@ Manages in-app purchases for Scannie iOS app
 
 import json
 import sys
-from pathlib import Path
-from datetime import datetime, timedelta
-
-import jwt
-import requests
-
-# ============================================================
-# Configuration
-# ============================================================
-
-BUNDLE_ID = "com.kobbokkom.scannie"
-ISSUER_ID = "a7524762-b1db-463b-84a8-bbee51a37cc2"
-KEY_ID = "74HC92L9NA"
-PRIVATE_KEY_PATH = Path("/Users/semanticist/Documents/API/AuthKey_74HC92L9NA.p8")
-
-BASE_URL_V1 = "https://api.appstoreconnect.apple.com/v1"
-BASE_URL_V2 = "https://api.appstoreconnect.apple.com/v2"
-
-# ============================================================
-# JWT Token Generation
-# ============================================================
-
-def generate_token() -> str:
-    """Generate JWT token for App Store Connect API"""
-    private_key = PRIVATE_KEY_PATH.read_text()
-
-    now = datetime.utcnow()
-    payload = {
-        "iss": ISSUER_ID,
-        "iat": now,
-        "exp": now + timedelta(minutes=19),
-        "aud": "appstoreconnect-v1",
-    }
-
-    headers = {
-        "alg": "ES256",
-        "kid": KEY_ID,
-        "typ": "JWT",
-    }
-
-    token = jwt.encode(payload, private_key, algorithm="ES256", headers=headers)
-    return token
-
-
-def get_headers() -> dict:
-    """Get authorization headers"""
-    return {
-        "Authorization": f"Bearer {generate_token()}",
-        "Content-Type": "application/json",
-    }
 
+import tracing
+from asc_client import BUNDLE_ID, BASE_URL_V1, BASE_URL_V2, get_headers, paginate, request
 
 # ============================================================
 # API Helpers
@@ -65,7 +17,7 @@ def get_headers() -> dict:
 def api_get(endpoint: str, base_url: str = BASE_URL_V1) -> dict:
     """Make GET request to App Store Connect API"""
     url = f"{base_url}{endpoint}"
-    response = requests.get(url, headers=get_headers())
+    response = request("GET", url, headers=get_headers())
 
     if response.status_code != 200:
         print(f"Error GET {url}: {response.status_code}")
@@ -78,7 +30,7 @@ def api_get(endpoint: str, base_url: str = BASE_URL_V1) -> dict:
 def api_post(endpoint: str, data: dict, base_url: str = BASE_URL_V2) -> dict:
     """Make POST request to App Store Connect API"""
     url = f"{base_url}{endpoint}"
-    response = requests.post(url, headers=get_headers(), json=data)
+    response = request("POST", url, headers=get_headers(), json=data)
 
     if response.status_code not in [200, 201]:
         print(f"Error POST {url}: {response.status_code}")
@@ -91,7 +43,7 @@ def api_post(endpoint: str, data: dict, base_url: str = BASE_URL_V2) -> dict:
 def api_delete(endpoint: str, base_url: str = BASE_URL_V2) -> bool:
     """Make DELETE request to App Store Connect API"""
     url = f"{base_url}{endpoint}"
-    response = requests.delete(url, headers=get_headers())
+    response = request("DELETE", url, headers=get_headers())
 
     if response.status_code not in [200, 204]:
         print(f"Error DELETE {url}: {response.status_code}")
@@ -107,17 +59,19 @@ def api_delete(endpoint: str, base_url: str = BASE_URL_V2) -> bool:
 
 def get_app_id() -> str:
     """Get app ID by bundle ID"""
-    response = api_get(f"/apps?filter[bundleId]={BUNDLE_ID}")
-    apps = response.get("data", [])
-    if not apps:
+    app = next(paginate("/apps", fields={"apps": ["bundleId"]},
+                        params={"filter[bundleId]": BUNDLE_ID}), None)
+    if not app:
         raise ValueError(f"App not found: {BUNDLE_ID}")
-    return apps[0]["id"]
+    return app["id"]
 
 
 def list_in_app_purchases(app_id: str) -> list:
     """List all in-app purchases for the app"""
-    response = api_get(f"/apps/{app_id}/inAppPurchasesV2")
-    return response.get("data", [])
+    return list(paginate(
+        f"/apps/{app_id}/inAppPurchasesV2",
+        fields={"inAppPurchases": ["productId", "name", "inAppPurchaseType", "state"]}
+    ))
 
 
 def delete_in_app_purchase(iap_id: str) -> bool:
@@ -244,12 +198,13 @@ def cmd_create(product_id: str, name: str):
 
 
 def get_price_points(iap_id: str, territory: str = "USA") -> list:
-    """Get available price points for an IAP"""
-    response = api_get(
-        f"/inAppPurchases/{iap_id}/pricePoints?filter[territory]={territory}&include=territory",
+    """Get all available price points for an IAP (several hundred per territory)"""
+    return list(paginate(
+        f"/inAppPurchases/{iap_id}/pricePoints",
+        fields={"inAppPurchasePricePoints": ["customerPrice"]},
+        params={"filter[territory]": territory},
         base_url=BASE_URL_V2
-    )
-    return response.get("data", []), response.get("included", [])
+    ))
 
 
 def set_price(iap_id: str, price_point_id: str, territory_id: str = "USA") -> dict:
@@ -321,7 +276,7 @@ def cmd_set_price(product_id: str, target_price: float):
     print(f"   IAP ID: {iap_id}")
 
     print(f"\n💰 Finding price point for ${target_price}...")
-    price_points, territories = get_price_points(iap_id, "USA")
+    price_points = get_price_points(iap_id, "USA")
 
     # Find closest price point
     best_match = None
@@ -370,38 +325,56 @@ Examples:
 """)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def main(argv: list = None) -> int:
+    """Run a manage_iap command; argv excludes the program name"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    tracing.start(tracing.pop_argument(argv))
+    if not argv or argv[0] in ("-h", "--help"):
         print_usage()
-        sys.exit(1)
+        return 0 if argv else 1
 
-    command = sys.argv[1]
+    command = argv[0]
+    # `<command> --help` prints usage rather than running the command
+    if any(arg in ("-h", "--help") for arg in argv[1:]):
+        print_usage()
+        return 0
 
     if command == "list":
         cmd_list()
 
     elif command == "delete":
-        if len(sys.argv) < 3:
+        if len(argv) < 2:
             print("Error: product_id required")
             print_usage()
-            sys.exit(1)
-        cmd_delete(sys.argv[2])
+            return 1
+        cmd_delete(argv[1])
 
     elif command == "create":
-        if len(sys.argv) < 4:
+        if len(argv) < 3:
             print("Error: product_id and name required")
             print_usage()
-            sys.exit(1)
-        cmd_create(sys.argv[2], sys.argv[3])
+            return 1
+        cmd_create(argv[1], argv[2])
 
     elif command == "price":
-        if len(sys.argv) < 4:
+        if len(argv) < 3:
             print("Error: product_id and amount required")
             print_usage()
-            sys.exit(1)
-        cmd_set_price(sys.argv[2], float(sys.argv[3]))
+            return 1
+        try:
+            amount = float(argv[2])
+        except ValueError:
+            print(f"Error: invalid amount: {argv[2]}")
+            print_usage()
+            return 1
+        cmd_set_price(argv[1], amount)
 
     else:
         print(f"Unknown command: {command}")
         print_usage()
-        sys.exit(1)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
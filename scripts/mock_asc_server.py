@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+"""
+App Store Connect Mock Server
+Local stand-in for the parts of the App Store Connect API the scripts use,
+so they can be benchmarked and dry-run without touching the real account.
+
+    python mock_asc_server.py --port 8765 --latency-ms 80 --error-429 0.02
+    SCANNIE_ASC_API_ORIGIN=http://127.0.0.1:8765 SCANNIE_ASC_KEY_PATH=key.p8 \\
+        SCANNIE_ASC_TOKEN_CACHE= python upload_app_store.py --all
+
+Resources (apps, appInfos, appStoreVersions, both localization types,
+screenshot sets and screenshots, IAPs, IAP localizations, price points and
+price schedules) live in memory as JSON:API objects. Collections honor
+`filter[...]`, `fields[...]` and `limit`, and are paged with an opaque
+`cursor` in `links.next`. Screenshot reservations return upload operations
+on a second port, a separate origin like Apple's upload hosts, and commits
+are verified against `sourceFileChecksum`.
+
+Every response carries an `X-Rate-Limit` header. Latency, 429s (with
+Retry-After) and 5xx faults are configurable. `GET /_stats` returns request
+counts and bytes per endpoint, and `POST /_reset` clears them.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import jwt
+
+import tracing
+
+# ============================================================
+# Configuration
+# ============================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BUNDLE_ID = "com.kobbokkom.scannie"
+
+APP_ID = "6755000001"
+IAP_ID = "6755902740"
+
+# Apple's defaults for collection paging
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+# USA price points per IAP (Apple has ~800, so they span several pages)
+PRICE_POINTS = 800
+
+# Screenshot reservations are split into parts of this size
+UPLOAD_PART_SIZE = 512 * 1024
+
+HOURLY_LIMIT = 3600
+
+LOCALES = [
+    "ar-SA", "ca", "cs", "da", "de-DE", "el", "en-AU", "en-CA", "en-GB", "en-US",
+    "es-ES", "es-MX", "fi", "fr-CA", "fr-FR", "he", "hi", "hr", "hu", "id",
+    "it", "ja", "ko", "ms", "nl-NL", "no", "pl", "pt-BR", "pt-PT", "ro",
+    "ru", "sk", "sv", "th", "tr", "uk", "vi", "zh-Hans", "zh-Hant"
+]
+
+# GET /{parent type}/{id}/{relationship} -> (child type, child's relationship to the parent)
+RELATED = {
+    ("apps", "appStoreVersions"): ("appStoreVersions", "app"),
+    ("apps", "appInfos"): ("appInfos", "app"),
+    ("apps", "inAppPurchasesV2"): ("inAppPurchases", "app"),
+    ("appStoreVersions", "appStoreVersionLocalizations"): ("appStoreVersionLocalizations", "appStoreVersion"),
+    ("appInfos", "appInfoLocalizations"): ("appInfoLocalizations", "appInfo"),
+    ("appStoreVersionLocalizations", "appScreenshotSets"): ("appScreenshotSets", "appStoreVersionLocalization"),
+    ("appScreenshotSets", "appScreenshots"): ("appScreenshots", "appScreenshotSet"),
+    ("inAppPurchases", "inAppPurchaseLocalizations"): ("inAppPurchaseLocalizations", "inAppPurchaseV2"),
+    ("inAppPurchases", "pricePoints"): ("inAppPurchasePricePoints", "inAppPurchaseV2"),
+}
+
+# Only one child per parent may have the same value of this attribute
+UNIQUE_ATTRIBUTES = {
+    "appStoreVersionLocalizations": ("appStoreVersion", "locale"),
+    "appInfoLocalizations": ("appInfo", "locale"),
+    "inAppPurchaseLocalizations": ("inAppPurchaseV2", "locale"),
+    "appScreenshotSets": ("appStoreVersionLocalization", "screenshotDisplayType"),
+}
+
+
+class ApiError(Exception):
+    """Answered as a JSON:API error document"""
+
+    def __init__(self, status: int, code: str, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.code = code
+        self.detail = detail
+
+
+def endpoint_template(method: str, path: str) -> str:
+    """'GET /v1/apps/123/appInfos' -> 'GET /v1/apps/{id}/appInfos'"""
+    if path.startswith("/_upload/"):
+        return f"{method} /_upload/{{id}}/{{part}}"
+    return f"{method} {tracing.endpoint_template(path)}"
+
+
+# ============================================================
+# In-memory Store
+# ============================================================
+
+class MockASC:
+    """Resource store, fault injection and stats shared by both servers"""
+
+    def __init__(self, bundle_id: str = DEFAULT_BUNDLE_ID, seed_locales: int = len(LOCALES),
+                 latency_ms: float = 0, jitter_ms: float = 0, error_429: float = 0,
+                 error_5xx: float = 0, retry_after: int = 1, seed: int = None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.retry_after = retry_after
+        self.api_origin = None
+        self.upload_origin = None
+
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._resources = {}
+        self._parts = {}
+        self._set_order = {}
+        self._remaining = HOURLY_LIMIT
+        self._servers = []
+        self.reset_stats()
+        self._seed(bundle_id, LOCALES[:seed_locales])
+
+    # ----- resources -----
+
+    def _new_id(self, resource_type: str) -> str:
+        if resource_type in ("apps", "inAppPurchases"):
+            return str(self._rng.randrange(10 ** 9, 10 ** 10))
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def add(self, resource_type: str, attributes: dict, relationships: dict = None,
+            resource_id: str = None) -> dict:
+        """Store a resource; `relationships` maps name -> (type, id)"""
+        with self._lock:
+            resource_id = resource_id or self._new_id(resource_type)
+            resource = {
+                "type": resource_type,
+                "id": resource_id,
+                "attributes": dict(attributes),
+                "relationships": {
+                    name: {"data": {"type": related_type, "id": related_id}}
+                    for name, (related_type, related_id) in (relationships or {}).items()
+                },
+            }
+            self._resources.setdefault(resource_type, {})[resource_id] = resource
+            return resource
+
+    def _get(self, resource_type: str, resource_id: str) -> dict:
+        resource = self._resources.get(resource_type, {}).get(resource_id)
+        if resource is None:
+            raise ApiError(404, "NOT_FOUND", f"There is no resource of type '{resource_type}' with id '{resource_id}'")
+        return resource
+
+    @staticmethod
+    def _parent_id(resource: dict, relationship: str):
+        data = (resource["relationships"].get(relationship) or {}).get("data") or {}
+        return data.get("id")
+
+    def _children(self, parent_type: str, parent_id: str, relationship: str) -> list:
+        self._get(parent_type, parent_id)
+        key = (parent_type, relationship)
+        if key not in RELATED:
+            raise ApiError(404, "NOT_FOUND", f"The relationship '{relationship}' does not exist")
+        child_type, parent_field = RELATED[key]
+        if child_type == "appScreenshots":
+            screenshots = self._resources.get(child_type, {})
+            return [screenshots[i] for i in self._set_order.get(parent_id, []) if i in screenshots]
+        return [
+            child for child in self._resources.get(child_type, {}).values()
+            if self._parent_id(child, parent_field) == parent_id
+        ]
+
+    def _seed(self, bundle_id: str, locales: list) -> None:
+        self.add("apps", {"bundleId": bundle_id, "name": "Scannie", "sku": "SCANNIE",
+                          "primaryLocale": "en-US"}, resource_id=APP_ID)
+        app_info = self.add("appInfos", {"appStoreState": "PREPARE_FOR_SUBMISSION"},
+                            {"app": ("apps", APP_ID)})
+        self.add("appStoreVersions", {"platform": "IOS", "versionString": "1.0.0",
+                                      "appStoreState": "READY_FOR_SALE"}, {"app": ("apps", APP_ID)})
+        version = self.add("appStoreVersions", {"platform": "IOS", "versionString": "1.1.1",
+                                                "appStoreState": "PREPARE_FOR_SUBMISSION"},
+                           {"app": ("apps", APP_ID)})
+        for locale in locales:
+            self.add("appStoreVersionLocalizations", {
+                "locale": locale, "description": "", "keywords": "", "whatsNew": "",
+                "promotionalText": None, "marketingUrl": None, "supportUrl": None,
+            }, {"appStoreVersion": ("appStoreVersions", version["id"])})
+            self.add("appInfoLocalizations", {
+                "locale": locale, "name": "Scannie", "subtitle": "", "privacyPolicyUrl": None,
+            }, {"appInfo": ("appInfos", app_info["id"])})
+
+        self.add("inAppPurchases", {"name": "Remove Ads", "productId": "remove_ads",
+                                    "inAppPurchaseType": "NON_CONSUMABLE", "state": "READY_TO_SUBMIT",
+                                    "familySharable": False},
+                 {"app": ("apps", APP_ID)}, resource_id=IAP_ID)
+        self.add("inAppPurchaseLocalizations", {"locale": "en-US", "name": "Remove Ads",
+                                                "description": "Remove all ads"},
+                 {"inAppPurchaseV2": ("inAppPurchases", IAP_ID)})
+        for tier in range(1, PRICE_POINTS + 1):
+            price = tier - 0.01
+            self.add("inAppPurchasePricePoints", {
+                "customerPrice": f"{price:.2f}",
+                "proceeds": f"{price * 0.85:.2f}",
+            }, {"inAppPurchaseV2": ("inAppPurchases", IAP_ID), "territory": ("territories", "USA")},
+                resource_id=base64.urlsafe_b64encode(f'{{"s":"{IAP_ID}","t":"USA","p":"{tier}"}}'.encode()).decode())
+        self.add("territories", {"currency": "USD"}, resource_id="USA")
+
+    # ----- operations -----
+
+    def list_collection(self, resource_type: str) -> list:
+        return list(self._resources.get(resource_type, {}).values())
+
+    def create(self, resource_type: str, document: dict) -> dict:
+        data = document.get("data") or {}
+        if data.get("type") != resource_type:
+            raise ApiError(409, "ENTITY_ERROR.TYPE_MISMATCH", f"Expected type '{resource_type}'")
+
+        relationships = {}
+        for name, value in (data.get("relationships") or {}).items():
+            linkage = (value or {}).get("data")
+            if isinstance(linkage, dict):
+                if linkage.get("type") in self._resources:
+                    self._get(linkage["type"], linkage["id"])
+                relationships[name] = (linkage["type"], linkage["id"])
+        attributes = dict(data.get("attributes") or {})
+
+        with self._lock:
+            unique = UNIQUE_ATTRIBUTES.get(resource_type)
+            if unique:
+                parent_field, attribute = unique
+                parent = relationships.get(parent_field, (None, None))[1]
+                for sibling in self._resources.get(resource_type, {}).values():
+                    if (self._parent_id(sibling, parent_field) == parent
+                            and sibling["attributes"].get(attribute) == attributes.get(attribute)):
+                        raise ApiError(409, "ENTITY_ERROR.DUPLICATE",
+                                       f"A resource with this {attribute} already exists")
+
+            if resource_type == "appScreenshots":
+                return self._reserve_screenshot(attributes, relationships)
+
+            resource = self.add(resource_type, attributes, relationships)
+            if resource_type == "appScreenshotSets":
+                self._set_order[resource["id"]] = []
+            return resource
+
+    def _reserve_screenshot(self, attributes: dict, relationships: dict) -> dict:
+        set_id = relationships.get("appScreenshotSet", (None, None))[1]
+        self._get("appScreenshotSets", set_id)
+        size = int(attributes.get("fileSize") or 0)
+        resource = self.add("appScreenshots", {
+            "fileName": attributes.get("fileName"),
+            "fileSize": size,
+            "sourceFileChecksum": None,
+            "assetDeliveryState": {"state": "AWAITING_UPLOAD", "errors": [], "warnings": []},
+        }, relationships)
+        resource["attributes"]["uploadOperations"] = [
+            {
+                "method": "PUT",
+                "url": f"{self.upload_origin}/_upload/{resource['id']}/{index}",
+                "offset": offset,
+                "length": min(UPLOAD_PART_SIZE, size - offset),
+                "requestHeaders": [{"name": "Content-Type", "value": "image/png"}],
+            }
+            for index, offset in enumerate(range(0, size, UPLOAD_PART_SIZE))
+        ]
+        self._parts[resource["id"]] = {}
+        self._set_order[set_id].append(resource["id"])
+        return resource
+
+    def update(self, resource_type: str, resource_id: str, document: dict) -> dict:
+        with self._lock:
+            resource = self._get(resource_type, resource_id)
+            attributes = dict((document.get("data") or {}).get("attributes") or {})
+            if resource_type == "appScreenshots" and attributes.pop("uploaded", False):
+                self._commit_screenshot(resource, attributes.get("sourceFileChecksum"))
+            resource["attributes"].update(attributes)
+            return resource
+
+    def _commit_screenshot(self, resource: dict, checksum: str) -> None:
+        attributes = resource["attributes"]
+        parts = self._parts.get(resource["id"], {})
+        data = b"".join(parts[index] for index in sorted(parts))
+        errors = []
+        if len(data) != attributes["fileSize"]:
+            errors.append({"code": "FILE_SIZE_MISMATCH",
+                           "description": f"Received {len(data)} of {attributes['fileSize']} bytes"})
+        elif checksum and hashlib.md5(data).hexdigest() != checksum:
+            errors.append({"code": "CHECKSUM_MISMATCH", "description": "sourceFileChecksum does not match"})
+        attributes.pop("uploadOperations", None)
+        attributes["assetDeliveryState"] = {
+            "state": "FAILED" if errors else "COMPLETE",
+            "errors": errors,
+            "warnings": [],
+        }
+
+    def delete(self, resource_type: str, resource_id: str) -> None:
+        with self._lock:
+            self._get(resource_type, resource_id)
+            del self._resources[resource_type][resource_id]
+            if resource_type == "appScreenshots":
+                self._parts.pop(resource_id, None)
+                for order in self._set_order.values():
+                    if resource_id in order:
+                        order.remove(resource_id)
+
+    def reorder_screenshots(self, set_id: str, document: dict) -> None:
+        with self._lock:
+            self._get("appScreenshotSets", set_id)
+            ids = [item["id"] for item in document.get("data") or []]
+            if sorted(ids) != sorted(self._set_order[set_id]):
+                raise ApiError(409, "ENTITY_ERROR.RELATIONSHIP.INVALID",
+                               "The order must contain every screenshot in the set")
+            self._set_order[set_id] = ids
+
+    def receive_part(self, screenshot_id: str, index: int, data: bytes) -> None:
+        with self._lock:
+            if screenshot_id not in self._parts:
+                raise ApiError(404, "NOT_FOUND", "Unknown upload")
+            self._parts[screenshot_id][index] = data
+
+    # ----- faults & stats -----
+
+    def rate_limit_header(self) -> str:
+        with self._lock:
+            self._remaining = max(self._remaining - 1, 0)
+            return f"user-hour-lim:{HOURLY_LIMIT};user-hour-rem:{self._remaining};"
+
+    def delay(self) -> None:
+        seconds = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def pick_fault(self):
+        """None, 429 or a 5xx status to answer instead of handling the request"""
+        roll = self._rng.random()
+        if roll < self.error_429:
+            return 429
+        if roll < self.error_429 + self.error_5xx:
+            return self._rng.choice((500, 503))
+        return None
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {"requests": 0, "bytes_in": 0, "bytes_out": 0,
+                           "status": {}, "endpoints": {}}
+
+    def record(self, method: str, path: str, status: int, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            stats = self._stats
+            stats["requests"] += 1
+            stats["bytes_in"] += bytes_in
+            stats["bytes_out"] += bytes_out
+            stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+            endpoint = stats["endpoints"].setdefault(
+                endpoint_template(method, path), {"requests": 0, "bytes_in": 0, "bytes_out": 0})
+            endpoint["requests"] += 1
+            endpoint["bytes_in"] += bytes_in
+            endpoint["bytes_out"] += bytes_out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    # ----- servers -----
+
+    def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, upload_port: int = 0) -> "MockASC":
+        """Serve the API on `port` and uploads on `upload_port` (0: any free port)"""
+        api_server = ThreadingHTTPServer((host, port), _ApiHandler)
+        upload_server = ThreadingHTTPServer((host, upload_port), _UploadHandler)
+        for server in (api_server, upload_server):
+            server.daemon_threads = True
+            server.mock = self
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers = [api_server, upload_server]
+        self.api_origin = f"http://{host}:{api_server.server_address[1]}"
+        self.upload_origin = f"http://{host}:{upload_server.server_address[1]}"
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+
+# ============================================================
+# JSON:API Rendering
+# ============================================================
+
+def _sparse(resource: dict, fields: dict) -> dict:
+    """Copy of a resource restricted to fields[type] if requested"""
+    rendered = json.loads(json.dumps(resource))
+    wanted = fields.get(resource["type"])
+    if wanted is not None:
+        rendered["attributes"] = {k: v for k, v in rendered["attributes"].items() if k in wanted}
+        rendered["relationships"] = {k: v for k, v in rendered["relationships"].items() if k in wanted}
+    return rendered
+
+
+def _matches(resource: dict, filters: dict) -> bool:
+    for name, allowed in filters.items():
+        if name in resource["attributes"]:
+            value = resource["attributes"][name]
+        else:
+            value = MockASC._parent_id(resource, name)
+        if str(value) not in allowed:
+            return False
+    return True
+
+
+def collection_document(mock: MockASC, path: str, query: dict, items: list) -> dict:
+    """Filter, sparse-fieldset and page a list of resources"""
+    filters = {k[7:-1]: set(v[0].split(",")) for k, v in query.items()
+               if k.startswith("filter[") and k.endswith("]")}
+    fields = {k[7:-1]: set(v[0].split(",")) for k, v in query.items()
+              if k.startswith("fields[") and k.endswith("]")}
+    items = [item for item in items if _matches(item, filters)]
+
+    try:
+        limit = int(query.get("limit", [DEFAULT_PAGE_LIMIT])[0])
+    except ValueError:
+        raise ApiError(400, "PARAMETER_ERROR.INVALID", "limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        raise ApiError(400, "PARAMETER_ERROR.INVALID", f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+    cursor = query.get("cursor", [""])[0]
+    offset = int(base64.urlsafe_b64decode(cursor.encode()).decode()) if cursor else 0
+
+    page = items[offset:offset + limit]
+    links = {"self": f"{mock.api_origin}{path}"}
+    if offset + limit < len(items):
+        next_query = {k: v[0] for k, v in query.items()}
+        next_query["cursor"] = base64.urlsafe_b64encode(str(offset + limit).encode()).decode()
+        links["next"] = f"{mock.api_origin}{path}?{urlencode(next_query)}"
+
+    document = {
+        "data": [_sparse(item, fields) for item in page],
+        "links": links,
+        "meta": {"paging": {"total": len(items), "limit": limit}},
+    }
+    if "territory" in query.get("include", [""])[0].split(","):
+        territories = {MockASC._parent_id(item, "territory") for item in page} - {None}
+        document["included"] = [_sparse(mock._get("territories", t), fields) for t in sorted(territories)]
+    return document
+
+
+# ============================================================
+# HTTP Handlers
+# ============================================================
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, document=None, headers: dict = None) -> int:
+        body = json.dumps(document).encode() if document is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        return len(body)
+
+    def _send_error(self, error: ApiError, headers: dict = None) -> int:
+        return self._send(error.status, {"errors": [{
+            "status": str(error.status),
+            "code": error.code,
+            "title": error.code.split(".")[0].replace("_", " ").title(),
+            "detail": error.detail,
+        }]}, headers)
+
+    def _handle(self, method: str) -> None:
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        body = self._read_body()
+
+        if url.path.startswith("/_"):
+            if self._control(method, url.path, mock):
+                return
+
+        mock.delay()
+        headers = self._extra_headers(mock)
+        fault = mock.pick_fault()
+        if fault == 429:
+            error = ApiError(429, "RATE_LIMIT_EXCEEDED", "The request rate limit has been reached.")
+            status, sent = 429, self._send_error(error, dict(headers, **{"Retry-After": str(mock.retry_after)}))
+        elif fault:
+            error = ApiError(fault, "INTERNAL_ERROR", "An unexpected error occurred on the server side.")
+            status, sent = fault, self._send_error(error, headers)
+        else:
+            try:
+                status, document = self.route(mock, method, url.path, parse_qs(url.query), body)
+                sent = self._send(status, document, headers)
+            except ApiError as error:
+                status, sent = error.status, self._send_error(error, headers)
+            except (ValueError, KeyError, TypeError) as e:
+                status = 400
+                sent = self._send_error(ApiError(400, "PARAMETER_ERROR.INVALID", str(e)), headers)
+
+        mock.record(method, url.path, status, len(body), sent)
+
+    def _control(self, method: str, path: str, mock: MockASC) -> bool:
+        return False
+
+    def _extra_headers(self, mock: MockASC) -> dict:
+        return {}
+
+    def route(self, mock, method, path, query, body):
+        raise NotImplementedError
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class _ApiHandler(_Handler):
+    """JSON:API endpoints under /v1 and /v2, plus /_stats and /_reset"""
+
+    def _control(self, method: str, path: str, mock: MockASC) -> bool:
+        if method == "GET" and path == "/_stats":
+            self._send(200, mock.stats())
+            return True
+        if method == "POST" and path == "/_reset":
+            mock.reset_stats()
+            self._send(204)
+            return True
+        return False
+
+    def _extra_headers(self, mock: MockASC) -> dict:
+        return {"X-Rate-Limit": mock.rate_limit_header()}
+
+    def _authorize(self) -> None:
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            raise ApiError(401, "NOT_AUTHORIZED", "Provide a properly configured and signed bearer token")
+        try:
+            claims = jwt.decode(header[7:], options={"verify_signature": False})
+        except jwt.PyJWTError:
+            raise ApiError(401, "NOT_AUTHORIZED", "Malformed bearer token")
+        if claims.get("aud") != "appstoreconnect-v1" or claims.get("exp", 0) < time.time():
+            raise ApiError(401, "NOT_AUTHORIZED", "Expired or invalid bearer token")
+
+    def route(self, mock, method, path, query, body):
+        segments = path.strip("/").split("/")
+        if segments[0] not in ("v1", "v2") or len(segments) < 2:
+            raise ApiError(404, "NOT_FOUND", f"The URL path '{path}' is not valid")
+        self._authorize()
+        document = json.loads(body) if body else {}
+        segments = segments[1:]
+
+        with mock._lock:
+            if len(segments) == 1:
+                resource_type = segments[0]
+                if method == "GET":
+                    return 200, collection_document(mock, path, query, mock.list_collection(resource_type))
+                if method == "POST":
+                    return 201, {"data": _sparse(mock.create(resource_type, document), {})}
+
+            elif len(segments) == 2:
+                resource_type, resource_id = segments
+                if method == "GET":
+                    return 200, {"data": _sparse(mock._get(resource_type, resource_id), {})}
+                if method == "PATCH":
+                    return 200, {"data": _sparse(mock.update(resource_type, resource_id, document), {})}
+                if method == "DELETE":
+                    mock.delete(resource_type, resource_id)
+                    return 204, None
+
+            elif len(segments) == 3 and method == "GET":
+                parent_type, parent_id, relationship = segments
+                items = mock._children(parent_type, parent_id, relationship)
+                return 200, collection_document(mock, path, query, items)
+
+            elif len(segments) == 4 and segments[2] == "relationships":
+                parent_type, parent_id, _, relationship = segments
+                if (parent_type, relationship, method) == ("appScreenshotSets", "appScreenshots", "PATCH"):
+                    mock.reorder_screenshots(parent_id, document)
+                    return 204, None
+                if method == "GET":
+                    items = mock._children(parent_type, parent_id, relationship)
+                    return 200, {"data": [{"type": i["type"], "id": i["id"]} for i in items]}
+
+        raise ApiError(405 if len(segments) <= 2 else 404, "METHOD_NOT_ALLOWED",
+                       f"{method} is not allowed on '{path}'")
+
+
+class _UploadHandler(_Handler):
+    """Screenshot part uploads: PUT /_upload/{screenshot id}/{part index}"""
+
+    def route(self, mock, method, path, query, body):
+        segments = path.strip("/").split("/")
+        if method != "PUT" or len(segments) != 3 or segments[0] != "_upload":
+            raise ApiError(404, "NOT_FOUND", f"The URL path '{path}' is not valid")
+        mock.receive_part(segments[1], int(segments[2]), body)
+        return 200, None
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local App Store Connect API stand-in")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--upload-port", type=int, default=0,
+                        help="Port for screenshot part uploads (default: any free port)")
+    parser.add_argument("--bundle-id", default=DEFAULT_BUNDLE_ID)
+    parser.add_argument("--seed-locales", type=int, default=len(LOCALES), metavar="N",
+                        help="Pre-existing localizations (default: all %(default)s)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra delay per request")
+    parser.add_argument("--error-429", type=float, default=0, metavar="RATE",
+                        help="Fraction of requests answered 429 (e.g. 0.02)")
+    parser.add_argument("--error-5xx", type=float, default=0, metavar="RATE",
+                        help="Fraction of requests answered 500/503")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int, help="Random seed for ids and faults")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+    _Handler.verbose = args.verbose
+
+    mock = MockASC(
+        bundle_id=args.bundle_id,
+        seed_locales=args.seed_locales,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ).start(args.host, args.port, args.upload_port)
+
+    print(f"🧪 Mock App Store Connect API: {mock.api_origin}")
+    print(f"   Uploads: {mock.upload_origin}")
+    print(f"   Stats:   {mock.api_origin}/_stats")
+    print(f"\n   export SCANNIE_ASC_API_ORIGIN={mock.api_origin}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
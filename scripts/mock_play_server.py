@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+Google Play Developer API Mock Server
+Local stand-in for the androidpublisher v3 endpoints the Play Store scripts
+use, so uploads can be benchmarked without touching the real listing.
+
+    python mock_play_server.py --port 8766 --latency-ms 80
+    SCANNIE_PLAY_API_ORIGIN=http://127.0.0.1:8766 \\
+        SCANNIE_PLAY_SERVICE_ACCOUNT=account.json python upload_play_store.py --all
+
+Routes come from the pinned discovery document play_client builds the
+service from (discovery/androidpublisher.v3.json), so every request maps
+to its method id (e.g. edits.listings.update). Edits, listings, images,
+bundles (simple and resumable uploads) and tracks are kept in memory; an
+edit works on a copy of the app's state that commit makes live. Batch
+requests are unpacked and each call is counted on its own endpoint.
+
+The service account's token_uri can point at `/token` here. Latency,
+upload bandwidth, 429s and 5xx faults are configurable. `GET /_stats`
+returns call counts and bytes per endpoint, and `POST /_reset` clears them.
+"""
+
+import copy
+import email.parser
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from aab_manifest import MANIFEST_PATH, manifest_attributes
+from play_client import discovery_document, discovery_routes
+
+# ============================================================
+# Configuration
+# ============================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_PACKAGE = "com.kobbokkom.scannie"
+
+EDIT_LIFETIME = 60 * 60
+
+_STATUS_NAMES = {
+    400: "INVALID_ARGUMENT", 401: "UNAUTHENTICATED", 403: "PERMISSION_DENIED",
+    404: "NOT_FOUND", 409: "ABORTED", 429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL", 501: "UNIMPLEMENTED", 503: "UNAVAILABLE",
+}
+
+
+class ApiError(Exception):
+    """Answered as a Google API error document"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+    def document(self) -> dict:
+        return {"error": {
+            "code": self.status,
+            "message": self.message,
+            "status": _STATUS_NAMES.get(self.status, "UNKNOWN"),
+            "errors": [{"message": self.message, "domain": "global", "reason": "mock"}],
+        }}
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def _image_hashes(data: bytes) -> dict:
+    return {"sha1": hashlib.sha1(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _empty_app_state() -> dict:
+    return {"listings": {}, "images": {}, "bundles": [], "tracks": {}}
+
+
+# ============================================================
+# In-memory Play Console
+# ============================================================
+
+class MockPlay:
+    """App state, edits, fault injection and stats shared by all connections"""
+
+    def __init__(self, package_name: str = DEFAULT_PACKAGE, latency_ms: float = 0,
+                 jitter_ms: float = 0, bandwidth_mbps: float = 0, error_429: float = 0,
+                 error_5xx: float = 0, seed: int = None):
+        self.package_name = package_name
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.bandwidth = bandwidth_mbps * 1_000_000 / 8
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.origin = None
+        self.routes = discovery_routes(discovery_document())
+
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._app = _empty_app_state()
+        self._app["listings"]["en-US"] = {"language": "en-US", "title": "Scannie",
+                                          "shortDescription": "", "fullDescription": ""}
+        self._edits = {}
+        self._sessions = {}
+        self._server = None
+        self.reset_stats()
+
+        self.handlers = {
+            "edits.insert": self.edits_insert,
+            "edits.get": self.edits_get,
+            "edits.delete": self.edits_delete,
+            "edits.commit": self.edits_commit,
+            "edits.validate": self.edits_get,
+            "edits.listings.list": self.listings_list,
+            "edits.listings.get": self.listings_get,
+            "edits.listings.update": self.listings_update,
+            "edits.listings.patch": self.listings_update,
+            "edits.listings.delete": self.listings_delete,
+            "edits.listings.deleteall": self.listings_deleteall,
+            "edits.images.list": self.images_list,
+            "edits.images.upload": self.images_upload,
+            "edits.images.delete": self.images_delete,
+            "edits.images.deleteall": self.images_deleteall,
+            "edits.bundles.list": self.bundles_list,
+            "edits.bundles.upload": self.bundles_upload,
+            "edits.tracks.list": self.tracks_list,
+            "edits.tracks.get": self.tracks_get,
+            "edits.tracks.update": self.tracks_update,
+            "edits.tracks.patch": self.tracks_update,
+        }
+
+    def _new_id(self) -> str:
+        return "%020d" % self._rng.randrange(10 ** 19, 10 ** 20)
+
+    # ----- dispatch -----
+
+    def dispatch(self, method: str, path: str, query: dict, body: bytes, content_type: str) -> tuple:
+        """Route one API call; returns (method id, status, response document or None)"""
+        for http_method, pattern, method_id, _, is_media in self.routes:
+            match = pattern.fullmatch(path)
+            if match and http_method == method:
+                break
+        else:
+            raise ApiError(404, f"No API method for {method} {path}")
+
+        handler = self.handlers.get(method_id)
+        if handler is None:
+            raise ApiError(501, f"{method_id} is not implemented by mock_play_server")
+        params = {name: unquote(value) for name, value in match.groupdict().items()}
+        if params.get("packageName") not in (None, self.package_name):
+            raise ApiError(404, "Package not found: " + params["packageName"])
+
+        upload_type = query.get("uploadType", [None])[0]
+        if is_media and upload_type == "resumable":
+            return method_id, 200, self._start_session(method_id, params)
+        media = None
+        if is_media:
+            media = self._multipart_media(body, content_type) if upload_type == "multipart" else body
+            body = b""
+        document = json.loads(body) if body else {}
+
+        with self._lock:
+            status, response = handler(params, document, media)
+        return method_id, status, response
+
+    def _multipart_media(self, body: bytes, content_type: str) -> bytes:
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        parts = message.get_payload()
+        return parts[-1].get_payload(decode=True) if parts else b""
+
+    # ----- resumable uploads -----
+
+    def _start_session(self, method_id: str, params: dict) -> dict:
+        session_id = self._new_id()
+        with self._lock:
+            self._sessions[session_id] = {"method": method_id, "params": params,
+                                          "data": bytearray(), "done": None}
+        return {"_location": f"{self.origin}/_upload/{session_id}"}
+
+    def upload_chunk(self, session_id: str, body: bytes, content_range: str) -> tuple:
+        """PUT to a session URI; returns (status, document or None, headers)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise ApiError(404, "Upload session not found")
+            match = re.fullmatch(r"bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)", content_range or "")
+            if match is None:
+                raise ApiError(400, f"Invalid Content-Range: {content_range}")
+            start, _, total = match.groups()
+            if start is not None:
+                if int(start) != len(session["data"]):
+                    raise ApiError(400, f"Chunk starts at {start}, expected {len(session['data'])}")
+                session["data"].extend(body)
+            if session["done"] is not None:
+                return 200, session["done"], {}
+            if total != "*" and len(session["data"]) >= int(total):
+                handler = self.handlers[session["method"]]
+                status, document = handler(session["params"], {}, bytes(session["data"]))
+                if status == 200:
+                    session["done"] = document
+                return status, document, {}
+            received = len(session["data"])
+            return 308, None, {"Range": f"bytes=0-{received - 1}"} if received else {}
+
+    # ----- edits -----
+
+    def _edit(self, params: dict) -> dict:
+        edit = self._edits.get(params["editId"])
+        if edit is None or edit["expires"] < time.time():
+            raise ApiError(404, f"Edit {params['editId']} does not exist or has expired")
+        return edit
+
+    def _edit_resource(self, edit_id: str, edit: dict) -> dict:
+        return {"id": edit_id, "expiryTimeSeconds": str(int(edit["expires"]))}
+
+    def edits_insert(self, params, body, media):
+        edit_id = self._new_id()
+        edit = {"state": copy.deepcopy(self._app), "expires": time.time() + EDIT_LIFETIME}
+        self._edits[edit_id] = edit
+        return 200, self._edit_resource(edit_id, edit)
+
+    def edits_get(self, params, body, media):
+        return 200, self._edit_resource(params["editId"], self._edit(params))
+
+    def edits_delete(self, params, body, media):
+        self._edit(params)
+        del self._edits[params["editId"]]
+        return 204, None
+
+    def edits_commit(self, params, body, media):
+        edit = self._edit(params)
+        self._app = edit["state"]
+        del self._edits[params["editId"]]
+        return 200, self._edit_resource(params["editId"], edit)
+
+    # ----- listings -----
+
+    def listings_list(self, params, body, media):
+        listings = self._edit(params)["state"]["listings"]
+        return 200, {"kind": "androidpublisher#listingsListResponse",
+                     "listings": [listings[lang] for lang in sorted(listings)]}
+
+    def listings_get(self, params, body, media):
+        listing = self._edit(params)["state"]["listings"].get(params["language"])
+        if listing is None:
+            raise ApiError(404, f"No listing for {params['language']}")
+        return 200, listing
+
+    def listings_update(self, params, body, media):
+        listings = self._edit(params)["state"]["listings"]
+        listing = dict(listings.get(params["language"], {}))
+        listing.update({k: v for k, v in body.items() if k != "language"})
+        listing["language"] = params["language"]
+        listings[params["language"]] = listing
+        return 200, listing
+
+    def listings_delete(self, params, body, media):
+        self._edit(params)["state"]["listings"].pop(params["language"], None)
+        return 204, None
+
+    def listings_deleteall(self, params, body, media):
+        self._edit(params)["state"]["listings"].clear()
+        return 204, None
+
+    # ----- images -----
+
+    def _images(self, params) -> list:
+        images = self._edit(params)["state"]["images"]
+        return images.setdefault(params["language"], {}).setdefault(params["imageType"], [])
+
+    def images_list(self, params, body, media):
+        return 200, {"images": list(self._images(params))}
+
+    def images_upload(self, params, body, media):
+        if not media:
+            raise ApiError(400, "Media is required")
+        image_id = self._new_id()
+        image = {"id": image_id, "url": f"{self.origin}/_images/{image_id}", **_image_hashes(media)}
+        self._images(params).append(image)
+        return 200, {"image": image}
+
+    def images_delete(self, params, body, media):
+        images = self._images(params)
+        remaining = [image for image in images if image["id"] != params["imageId"]]
+        if len(remaining) == len(images):
+            raise ApiError(404, f"Image {params['imageId']} not found")
+        images[:] = remaining
+        return 204, None
+
+    def images_deleteall(self, params, body, media):
+        images = self._images(params)
+        deleted = list(images)
+        images.clear()
+        return 200, {"deleted": deleted}
+
+    # ----- bundles & tracks -----
+
+    def bundles_list(self, params, body, media):
+        return 200, {"kind": "androidpublisher#bundlesListResponse",
+                     "bundles": list(self._edit(params)["state"]["bundles"])}
+
+    def bundles_upload(self, params, body, media):
+        bundles = self._edit(params)["state"]["bundles"]
+        try:
+            with zipfile.ZipFile(io.BytesIO(media)) as aab:
+                version_code = int(manifest_attributes(aab.read(MANIFEST_PATH))["versionCode"])
+        except (KeyError, ValueError, zipfile.BadZipFile):
+            raise ApiError(400, "The Android App Bundle is invalid")
+        if any(bundle["versionCode"] == version_code for bundle in bundles):
+            raise ApiError(403, "APK specifies a version code that has already been used.")
+        bundle = {"versionCode": version_code, **_image_hashes(media)}
+        bundles.append(bundle)
+        return 200, bundle
+
+    def tracks_list(self, params, body, media):
+        tracks = self._edit(params)["state"]["tracks"]
+        return 200, {"kind": "androidpublisher#tracksListResponse",
+                     "tracks": [tracks[name] for name in sorted(tracks)]}
+
+    def tracks_get(self, params, body, media):
+        track = self._edit(params)["state"]["tracks"].get(params["track"])
+        if track is None:
+            raise ApiError(404, f"Track {params['track']} not found")
+        return 200, track
+
+    def tracks_update(self, params, body, media):
+        state = self._edit(params)["state"]
+        known = {str(bundle["versionCode"]) for bundle in state["bundles"]}
+        for release in body.get("releases", []):
+            unknown = [code for code in release.get("versionCodes", []) if str(code) not in known]
+            if unknown:
+                raise ApiError(403, f"Version codes not uploaded: {', '.join(unknown)}")
+        track = {"track": params["track"], "releases": body.get("releases", [])}
+        state["tracks"][params["track"]] = track
+        return 200, track
+
+    # ----- faults & stats -----
+
+    def delay(self, payload_bytes: int = 0) -> None:
+        seconds = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if self.bandwidth and payload_bytes:
+            seconds += payload_bytes / self.bandwidth
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def pick_fault(self):
+        """None, 429 or a 5xx status to answer instead of handling the request"""
+        roll = self._rng.random()
+        if roll < self.error_429:
+            return 429
+        if roll < self.error_429 + self.error_5xx:
+            return self._rng.choice((500, 503))
+        return None
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {"requests": 0, "calls": 0, "bytes_in": 0, "bytes_out": 0,
+                           "status": {}, "endpoints": {}}
+
+    def record(self, endpoint: str, status: int, bytes_in: int, bytes_out: int, http: bool = True) -> None:
+        """Count an HTTP round trip (http=True) or an API call inside a batch"""
+        with self._lock:
+            stats = self._stats
+            if http:
+                stats["requests"] += 1
+                stats["bytes_in"] += bytes_in
+                stats["bytes_out"] += bytes_out
+            if endpoint not in ("batch", "token"):
+                stats["calls"] += 1
+            stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+            entry = stats["endpoints"].setdefault(endpoint, {"calls": 0, "bytes_in": 0, "bytes_out": 0})
+            entry["calls"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    # ----- server -----
+
+    def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "MockPlay":
+        server = ThreadingHTTPServer((host, port), _PlayHandler)
+        server.daemon_threads = True
+        server.mock = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._server = server
+        self.origin = f"http://{host}:{server.server_address[1]}"
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# ============================================================
+# Batch Requests
+# ============================================================
+
+def parse_batch(body: bytes, content_type: str) -> list:
+    """[(Content-ID, method, path, query, body, content type)] of a multipart/mixed batch"""
+    message = email.parser.BytesParser().parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    calls = []
+    for part in message.get_payload():
+        request_line, rest = part.get_payload().split("\n", 1)
+        inner = email.parser.Parser().parsestr(rest)
+        method, target, _ = request_line.strip().split(" ", 2)
+        url = urlsplit(target)
+        payload = inner.get_payload() or ""
+        calls.append((part["Content-ID"], method, url.path, parse_qs(url.query),
+                      payload.encode(), inner.get("Content-Type", "application/json")))
+    return calls
+
+
+def batch_response(parts: list) -> tuple:
+    """multipart/mixed body for [(Content-ID, status, document)]; returns (content type, body)"""
+    boundary = f"batch_{random.getrandbits(64):016x}"
+    chunks = []
+    for content_id, status, document in parts:
+        payload = json.dumps(document) if document is not None else ""
+        response_id = f"<response-{content_id.strip('<>')}>"
+        chunks.append(
+            f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: {response_id}\r\n\r\n"
+            f"HTTP/1.1 {status} {_STATUS_NAMES.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json; charset=UTF-8\r\n\r\n{payload}\r\n"
+        )
+    chunks.append(f"--{boundary}--\r\n")
+    return f"multipart/mixed; boundary={boundary}", "".join(chunks).encode()
+
+
+# ============================================================
+# HTTP Handler
+# ============================================================
+
+class _PlayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, document=None, headers: dict = None,
+              body: bytes = None, content_type: str = "application/json; charset=UTF-8") -> int:
+        if body is None:
+            body = json.dumps(document).encode() if document is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        return len(body)
+
+    def _handle(self, method: str) -> None:
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if url.path == "/_stats" and method == "GET":
+            self._send(200, mock.stats())
+            return
+        if url.path == "/_reset" and method == "POST":
+            mock.reset_stats()
+            self._send(204)
+            return
+        if url.path == "/token" and method == "POST":
+            sent = self._send(200, {"access_token": f"mock-{mock._new_id()}",
+                                    "expires_in": 3600, "token_type": "Bearer"})
+            mock.record("token", 200, len(body), sent)
+            return
+
+        mock.delay(len(body))
+        endpoint = "unknown"
+        fault = mock.pick_fault()
+        try:
+            if fault:
+                raise ApiError(fault, "Injected fault" if fault != 429 else "Quota exceeded")
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                raise ApiError(401, "Request is missing required authentication credential")
+
+            if url.path.startswith("/_upload/"):
+                endpoint = "upload chunk"
+                status, document, headers = mock.upload_chunk(
+                    url.path.rsplit("/", 1)[1], body, self.headers.get("Content-Range"))
+                sent = self._send(status, document, headers)
+            elif url.path == "/batch":
+                endpoint = "batch"
+                status, sent = self._batch(mock, body)
+            else:
+                endpoint, status, document = mock.dispatch(
+                    method, url.path, parse_qs(url.query), body, self.headers.get("Content-Type", ""))
+                headers = {}
+                if document and "_location" in document:
+                    headers["Location"] = document.pop("_location")
+                    document = None
+                sent = self._send(status, document, headers)
+        except ApiError as error:
+            status = error.status
+            headers = {"Retry-After": "1"} if status == 429 else {}
+            sent = self._send(status, error.document(), headers)
+        except (ValueError, KeyError, TypeError) as e:
+            status = 400
+            sent = self._send(status, ApiError(400, str(e)).document())
+
+        mock.record(endpoint, status, len(body), sent)
+
+    def _batch(self, mock: MockPlay, body: bytes) -> tuple:
+        parts = []
+        for content_id, method, path, query, inner_body, content_type in parse_batch(
+                body, self.headers.get("Content-Type", "")):
+            endpoint = "unknown"
+            try:
+                endpoint, status, document = mock.dispatch(method, path, query, inner_body, content_type)
+            except ApiError as error:
+                status, document = error.status, error.document()
+            parts.append((content_id, status, document))
+            mock.record(endpoint, status, len(inner_body),
+                        len(json.dumps(document)) if document is not None else 0, http=False)
+        content_type, payload = batch_response(parts)
+        return 200, self._send(200, body=payload, content_type=content_type)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Google Play Developer API stand-in")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--package", default=DEFAULT_PACKAGE)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra delay per request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0,
+                        help="Simulated upload bandwidth (default: unlimited)")
+    parser.add_argument("--error-429", type=float, default=0, metavar="RATE",
+                        help="Fraction of requests answered 429 (e.g. 0.02)")
+    parser.add_argument("--error-5xx", type=float, default=0, metavar="RATE",
+                        help="Fraction of requests answered 500/503")
+    parser.add_argument("--seed", type=int, help="Random seed for ids and faults")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+    _PlayHandler.verbose = args.verbose
+
+    mock = MockPlay(
+        package_name=args.package,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        seed=args.seed,
+    ).start(args.host, args.port)
+
+    print(f"🧪 Mock Google Play Developer API: {mock.origin}")
+    print(f"   Token URI: {mock.origin}/token")
+    print(f"   Stats:     {mock.origin}/_stats")
+    print(f"\n   export SCANNIE_PLAY_API_ORIGIN={mock.origin}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
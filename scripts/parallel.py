@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Parallel Execution Helpers
+Runs per-locale work on a bounded thread pool while keeping each locale's
+console output together, so logs read the same as a sequential run.
+"""
+
+import io
+import sys
+import threading
+
+
+class _ThreadRoutedStream:
+    """Stream proxy that sends each worker thread's output to its own buffer"""
+
+    def __init__(self, target, local: threading.local):
+        self._target = target
+        self._local = local
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self._target.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self._target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+def run_grouped(items: list, fn, jobs: int = 1) -> list:
+    """Run fn(item) for every item on up to `jobs` worker threads
+
+    Anything a worker prints (stdout or stderr) is buffered and written as
+    one block when its item finishes. Results are returned in input order.
+    With jobs <= 1 items run sequentially with output streamed as usual.
+    """
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    local = threading.local()
+    output_lock = threading.Lock()
+
+    def _run(item):
+        local.buffer = io.StringIO()
+        try:
+            return fn(item)
+        finally:
+            output = local.buffer.getvalue()
+            local.buffer = None
+            with output_lock:
+                real_stdout.write(output)
+                real_stdout.flush()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    sys.stdout = _ThreadRoutedStream(real_stdout, local)
+    sys.stderr = _ThreadRoutedStream(real_stderr, local)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_run, items))
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Google Play Developer API - Shared Client
+Service-account auth and the androidpublisher service shared by the Play
+Store scripts.
+
+httplib2 connections are not thread-safe, so every request is built on an
+AuthorizedHttp owned by the thread that creates it. One service object can
+then be used from a worker pool (e.g. upload_play_store.py --jobs) without
+any change at the call sites: `request.execute()` just works.
+
+execute_batch() sends many small calls (listings updates, deleteall) as
+Google API batch requests: a few round trips instead of one per call.
+
+The service is built from a pinned discovery document checked in under
+discovery/, so runs never fetch one; refresh_play_discovery.py updates it.
+
+google-api-python-client, google-auth and httplib2 are imported on first
+use, so importing this module (e.g. for `--help` or `--list`) stays cheap.
+
+    SCANNIE_PLAY_API_ORIGIN        API origin (e.g. a local mock_play_server.py)
+    SCANNIE_PLAY_SERVICE_ACCOUNT   service account JSON path
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import tracing
+
+# ============================================================
+# Configuration
+# ============================================================
+
+PACKAGE_NAME = "com.kobbokkom.scannie"
+SERVICE_ACCOUNT_JSON = os.environ.get(
+    "SCANNIE_PLAY_SERVICE_ACCOUNT", "/Users/semanticist/Documents/API/simple-anzan-3e199a55a5b1.json")
+
+# Replaces the discovery document's rootUrl (API calls, uploads and batches) when set
+API_ORIGIN = os.environ.get("SCANNIE_PLAY_API_ORIGIN", "").rstrip("/") or None
+
+# Pinned androidpublisher v3 discovery document (see refresh_play_discovery.py)
+DISCOVERY_PATH = Path(__file__).parent / "discovery" / "androidpublisher.v3.json"
+
+# Google Play API scopes
+SCOPES = ['https://www.googleapis.com/auth/androidpublisher']
+
+# Socket timeout for each per-thread connection, in seconds
+HTTP_TIMEOUT = 120
+
+# Calls per HTTP batch request (the API accepts up to 1000)
+BATCH_SIZE = 50
+
+
+# ============================================================
+# Auth & Per-thread HTTP
+# ============================================================
+
+_credentials = None
+_credentials_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_credentials():
+    """Service account credentials, loaded once per process."""
+    global _credentials
+    with _credentials_lock:
+        if _credentials is None:
+            from google.oauth2 import service_account
+            with tracing.span("load credentials", "auth"):
+                _credentials = service_account.Credentials.from_service_account_file(
+                    SERVICE_ACCOUNT_JSON,
+                    scopes=SCOPES
+                )
+        return _credentials
+
+
+def _traced_http():
+    """httplib2.Http that records each round trip as a span named by API method."""
+    import httplib2
+
+    class _TracedHttp(httplib2.Http):
+        def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+            if not tracing.is_enabled():
+                return super().request(uri, method, body, headers, *args, **kwargs)
+
+            method_id, endpoint = route_for(method, uri)
+            if 'content-range' in {name.lower() for name in headers or {}}:
+                # PUT to a resumable upload session
+                name, category = "upload chunk", "upload"
+            else:
+                name, category = method_id or f"{method} {endpoint}", "api"
+            with tracing.span(name, category, method=method, endpoint=endpoint) as span:
+                resp, content = super().request(uri, method, body, headers, *args, **kwargs)
+                span["status"] = resp.status
+                span["bytes_sent"] = len(body or b"") if isinstance(body, (bytes, str)) else 0
+                span["bytes_received"] = len(content or b"")
+            return resp, content
+
+    return _TracedHttp(timeout=HTTP_TIMEOUT)
+
+
+def thread_http() -> "google_auth_httplib2.AuthorizedHttp":
+    """Authorized HTTP object for the calling thread (created on first use)."""
+    http = getattr(_local, 'http', None)
+    if http is None:
+        import google_auth_httplib2
+
+        base = _traced_http()
+        # Resumable uploads answer 308 for "chunk received"; not a redirect
+        # (same as googleapiclient.http.build_http)
+        base.redirect_codes = base.redirect_codes - {308}
+        http = google_auth_httplib2.AuthorizedHttp(get_credentials(), http=base)
+        _local.http = http
+    return http
+
+
+def _build_request(http, *args, **kwargs) -> "HttpRequest":
+    """requestBuilder hook: bind each request to the creating thread's HTTP."""
+    from googleapiclient.http import HttpRequest
+    return HttpRequest(thread_http(), *args, **kwargs)
+
+
+_discovery_text = None
+
+
+def discovery_document() -> dict:
+    """Pinned androidpublisher v3 discovery document (a fresh dict per call)."""
+    global _discovery_text
+    if _discovery_text is None:
+        _discovery_text = DISCOVERY_PATH.read_text(encoding='utf-8')
+    document = json.loads(_discovery_text)
+    if API_ORIGIN:
+        document['rootUrl'] = document['mtlsRootUrl'] = f"{API_ORIGIN}/"
+    return document
+
+
+def route_pattern(path: str):
+    """Discovery path template ('.../edits/{editId}:commit') as a regex with named groups."""
+    return re.compile(re.sub(r"\\\{(?:\\\+)?(\w+)\\\}", r"(?P<\1>[^/:]+)", re.escape(path)))
+
+
+def discovery_routes(document: dict) -> list:
+    """[(http method, path regex, method id, path template, is media upload)] for every API method."""
+    routes = []
+
+    def walk(resource):
+        for method in resource.get('methods', {}).values():
+            method_id = method['id'].split('.', 1)[1]
+            path = '/' + method['path']
+            routes.append((method['httpMethod'], route_pattern(path), method_id, path, False))
+            for protocol in method.get('mediaUpload', {}).get('protocols', {}).values():
+                routes.append((method['httpMethod'], route_pattern(protocol['path']), method_id,
+                               protocol['path'], True))
+        for child in resource.get('resources', {}).values():
+            walk(child)
+
+    walk(document)
+    return routes
+
+
+_routes = None
+
+
+def route_for(method: str, uri: str) -> tuple:
+    """(method id or None, endpoint template) of a request URI, e.g. for trace spans."""
+    global _routes
+    if _routes is None:
+        _routes = discovery_routes(discovery_document())
+    path = urlsplit(uri).path
+    for http_method, pattern, method_id, template, _ in _routes:
+        if http_method == method and pattern.fullmatch(path):
+            return method_id, template
+    return None, tracing.endpoint_template(uri)
+
+
+def get_play_service():
+    """Create authenticated Google Play Developer API service (thread-safe)."""
+    with tracing.span("build service", "setup") as span:
+        from googleapiclient.discovery import build_from_document
+        document = discovery_document()
+        span["revision"] = document['revision']
+        return build_from_document(
+            document,
+            http=thread_http(),
+            requestBuilder=_build_request
+        )
+
+
+# ============================================================
+# Batch Requests
+# ============================================================
+
+def execute_batch(service, requests: dict) -> dict:
+    """Execute {request_id: HttpRequest} as batch requests of up to BATCH_SIZE calls.
+
+    Returns {request_id: (response, exception)}; exception is None when that
+    call succeeded. A failed batch round trip is reported for each of its calls.
+    """
+    results = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    items = list(requests.items())
+    for start in range(0, len(items), BATCH_SIZE):
+        chunk = items[start:start + BATCH_SIZE]
+        batch = service.new_batch_http_request(callback=callback)
+        for request_id, request in chunk:
+            batch.add(request, request_id=request_id)
+        methods = sorted({route_for(r.method, r.uri)[0] or "?" for _, r in chunk}) if tracing.is_enabled() else None
+        with tracing.span("batch", "api", calls=len(chunk), methods=methods):
+            try:
+                batch.execute()
+            except Exception as e:
+                for request_id, _ in chunk:
+                    results.setdefault(request_id, (None, e))
+
+    return results
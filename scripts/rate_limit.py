@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+App Store Connect Rate Limiter
+Token bucket driven by the `X-Rate-Limit` response header.
+
+App Store Connect allows a fixed number of requests per rolling hour and
+reports the quota on every response:
+
+    X-Rate-Limit: user-hour-lim:3600;user-hour-rem:3598;
+
+The bucket is refilled at lim/3600 tokens per second and re-synced to the
+server's remaining count after each response, so requests go out as fast
+as the quota allows instead of at a guessed pace. A 429 pauses every
+thread sharing the limiter until the Retry-After delay has passed.
+"""
+
+import random
+import threading
+import time
+
+import tracing
+
+# Used until the first response tells us the real quota
+DEFAULT_HOURLY_LIMIT = 3600
+INITIAL_BURST = 5
+# Requests kept in reserve so other tools sharing the key are not starved
+QUOTA_RESERVE = 10
+# 429 backoff when the server does not send Retry-After
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+def parse_rate_limit_header(value: str) -> dict:
+    """Parse 'user-hour-lim:3600;user-hour-rem:3598;' into a dict of ints"""
+    fields = {}
+    for part in value.split(";"):
+        name, _, number = part.strip().partition(":")
+        if name and number.strip().isdigit():
+            fields[name] = int(number)
+    return fields
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every request to one API"""
+
+    def __init__(self, hourly_limit: int = DEFAULT_HOURLY_LIMIT, burst: int = INITIAL_BURST):
+        self.hourly_limit = hourly_limit
+        self.remaining = None
+        self._tokens = float(burst)
+        self._capacity = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        # Stats
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Sustained requests per second the hourly quota allows"""
+        return self.hourly_limit / 3600.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                blocked = now < self._blocked_until
+                if blocked:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.requests += 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+
+            tracing.sleep(wait, "rate limit wait", reason="backoff" if blocked else "quota")
+            with self._lock:
+                self.wait_time += wait
+
+    def release(self, response=None) -> None:
+        """Record the outcome of a request started with acquire()"""
+        with self._lock:
+            self._in_flight -= 1
+            if response is None:
+                return
+
+            header = response.headers.get("X-Rate-Limit")
+            if header:
+                quota = parse_rate_limit_header(header)
+                if "user-hour-lim" in quota:
+                    self.hourly_limit = max(quota["user-hour-lim"], 1)
+                if "user-hour-rem" in quota:
+                    self.remaining = quota["user-hour-rem"]
+                    # The server is authoritative; requests still in flight are not counted there yet
+                    self._capacity = float(max(self.hourly_limit - QUOTA_RESERVE, 1))
+                    self._tokens = float(max(self.remaining - QUOTA_RESERVE - self._in_flight, 0))
+                    self._updated = time.monotonic()
+
+    def backoff(self, response, attempt: int) -> float:
+        """Pause all callers after a 429 and return the delay applied"""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+            delay += random.uniform(0, delay / 2)
+
+        with self._lock:
+            self.throttled += 1
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    def summary(self) -> str:
+        quota = ""
+        if self.remaining is not None:
+            quota = f", quota {self.remaining}/{self.hourly_limit} left this hour"
+        return (f"{self.requests} requests, {self.throttled} throttled (429), "
+                f"{self.wait_time:.1f}s waiting{quota}")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Google Play Discovery Document Refresh
+Updates the pinned androidpublisher v3 discovery document that play_client.py
+builds the API service from (discovery/androidpublisher.v3.json).
+
+    python refresh_play_discovery.py                  # fetch from Google and update the pin
+    python refresh_play_discovery.py --check          # exit 1 if Google serves another revision
+    python refresh_play_discovery.py --from-library   # offline: copy google-api-python-client's copy
+
+Upload runs never fetch a discovery document; the pin only changes here, and
+the change is reviewed in git like any other. Added or removed API methods
+are listed before the file is replaced.
+"""
+
+import json
+import os
+import sys
+import urllib.request
+
+import play_client
+
+DISCOVERY_URL = "https://androidpublisher.googleapis.com/$discovery/rest?version=v3"
+FETCH_TIMEOUT = 30
+
+
+# ============================================================
+# Discovery Documents
+# ============================================================
+
+def fetch_document() -> str:
+    """Current discovery document from Google"""
+    with urllib.request.urlopen(DISCOVERY_URL, timeout=FETCH_TIMEOUT) as response:
+        return response.read().decode('utf-8')
+
+
+def library_document() -> str:
+    """Discovery document bundled with the installed google-api-python-client"""
+    from googleapiclient.discovery_cache import get_static_doc
+    return get_static_doc('androidpublisher', 'v3')
+
+
+def validate(text: str) -> dict:
+    """Parse a candidate document, rejecting anything that is not androidpublisher v3"""
+    document = json.loads(text)
+    if document.get('id') != 'androidpublisher:v3' or not document.get('resources'):
+        raise ValueError(f"Not an androidpublisher v3 discovery document (id: {document.get('id')})")
+    return document
+
+
+def method_ids(document: dict) -> set:
+    return {method_id for _, _, method_id, _, _ in play_client.discovery_routes(document)}
+
+
+def write_pin(text: str) -> None:
+    """Atomically replace the pinned document"""
+    path = play_client.DISCOVERY_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp_path.write_text(text if text.endswith('\n') else text + '\n', encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main(argv: list = None) -> int:
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update the pinned Google Play API discovery document")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--check", action="store_true",
+                        help="Only compare the pin with Google's current revision")
+    source.add_argument("--from-library", action="store_true",
+                        help="Use the copy bundled with google-api-python-client (no network)")
+    args = parser.parse_args(argv)
+
+    path = play_client.DISCOVERY_PATH
+    current = validate(path.read_text(encoding='utf-8')) if path.exists() else None
+    print(f"📌 Pinned: {current['revision'] if current else '(none)'} ({path.name})")
+
+    try:
+        text = library_document() if args.from_library else fetch_document()
+        latest = validate(text)
+    except Exception as e:
+        print(f"❌ Could not load discovery document: {e}")
+        return 1
+    print(f"🌐 {'Library' if args.from_library else 'Google'}: {latest['revision']}")
+
+    if current is not None:
+        added = sorted(method_ids(latest) - method_ids(current))
+        removed = sorted(method_ids(current) - method_ids(latest))
+        for method_id in added:
+            print(f"   + {method_id}")
+        for method_id in removed:
+            print(f"   - {method_id}")
+        if current == latest:
+            print("✅ Pin is up to date")
+            return 0
+
+    if args.check:
+        print("⚠️  Pin differs; run without --check to update it")
+        return 1
+
+    write_pin(text)
+    print(f"✅ Pinned {latest['revision']} to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
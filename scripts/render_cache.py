@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Content-addressed Render Cache
+Stores rasterized promo PNGs keyed by the SVG content hash, target size and
+render options, so an unchanged promo is never rendered twice - across runs,
+and across machines that share the cache directory.
+
+The cache is size-bounded; least recently used entries (by mtime, which is
+bumped on every hit) are evicted first.
+
+    SCANNIE_RENDER_CACHE          cache directory ("" disables the cache)
+    SCANNIE_RENDER_CACHE_MAX_MB   size bound in MB (default: 1024)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# Bump when rendering output changes for the same inputs
+CACHE_VERSION = 1
+
+_cache_env = os.environ.get("SCANNIE_RENDER_CACHE")
+if _cache_env is None:
+    CACHE_DIR = Path.home() / ".cache" / "scannie" / "render"
+else:
+    CACHE_DIR = Path(_cache_env) if _cache_env else None
+
+MAX_CACHE_BYTES = int(os.environ.get("SCANNIE_RENDER_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+
+def cache_key(svg_data: bytes, width: int, height: int, options: dict = None) -> str:
+    """Hash of everything that determines the rendered bytes"""
+    digest = hashlib.sha256()
+    params = json.dumps({
+        "version": CACHE_VERSION,
+        "width": width,
+        "height": height,
+        "options": options or {},
+    }, sort_keys=True)
+    digest.update(params.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(svg_data)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU file cache of rendered PNG bytes"""
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.png"
+
+    def get(self, key: str):
+        """Return cached bytes for `key`, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store bytes for `key` and evict old entries if over the size bound"""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+            tmp_path.write_bytes(data)
+        except OSError:
+            # Cache is an optimization only
+            return
+
+        with self._lock:
+            # Replacing an entry (a re-put, or racing renders of one key)
+            # must not count its bytes twice
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                return
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list:
+        """(path, size, mtime) for every cached file"""
+        entries = []
+        for path in self.directory.glob("*/*.png"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until below 90% of the bound"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+    def summary(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses"
+
+
+render_cache = RenderCache()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Scannie Store CLI
+One entry point for the store publishing scripts.
+
+    python scannie_store.py ios upload --all --jobs 4
+    python scannie_store.py play upload --list
+    python scannie_store.py iap list
+    python scannie_store.py --help
+
+Every command runs an existing script's main() with the remaining
+arguments (`ios upload` is upload_app_store.py), so the scripts still work
+on their own. A command's module is imported only when that command runs
+and the help below is static text, so `--help` and cheap commands like
+`--list` start in tens of milliseconds (see bench_startup.py).
+"""
+
+import importlib
+import sys
+
+PROG = "scannie_store.py"
+
+# group -> command -> ("module [leading args]", help)
+COMMANDS = {
+    "ios": {
+        "upload": ("upload_app_store", "Upload iPhone metadata and screenshots"),
+        "ipad": ("upload_ipad_screenshots", "Upload iPad screenshots"),
+        "support-url": ("update_support_url", "Set the Support URL for every locale"),
+        "submit": ("submit_app_store_review", "Submit the current version for App Review"),
+    },
+    "play": {
+        "upload": ("upload_play_store", "Upload listings, screenshots and feature graphics"),
+        "aab": ("upload_aab_alpha", "Upload the App Bundle to a testing track"),
+        "refresh-discovery": ("refresh_play_discovery", "Update the pinned Play API discovery document"),
+    },
+    "iap": {
+        "list": ("manage_iap list", "List in-app purchases"),
+        "create": ("manage_iap create", "Create a non-consumable IAP: <product_id> <name>"),
+        "delete": ("manage_iap delete", "Delete an IAP: <product_id>"),
+        "price": ("manage_iap price", "Set the price of an IAP: <product_id> <amount>"),
+        "localize": ("iap_localizations", "Add missing IAP localizations"),
+        "update-localizations": ("iap_update_localizations", "Rewrite IAP localizations"),
+    },
+}
+
+GROUP_HELP = {
+    "ios": "App Store Connect metadata, screenshots and review",
+    "play": "Google Play listings and App Bundles",
+    "iap": "App Store in-app purchases",
+}
+
+
+# ============================================================
+# Help
+# ============================================================
+
+def print_help() -> None:
+    print(f"usage: {PROG} <group> <command> [args]\n")
+    for group, commands in COMMANDS.items():
+        print(f"{group:<6} {GROUP_HELP[group]}")
+        for command, (_, text) in commands.items():
+            print(f"  {command:<22} {text}")
+    print(f"\nRun `{PROG} <group> <command> --help` for a command's options.")
+
+
+def print_group_help(group: str) -> None:
+    print(f"usage: {PROG} {group} <command> [args]\n")
+    print(f"{GROUP_HELP[group]}\n")
+    for command, (_, text) in COMMANDS[group].items():
+        print(f"  {command:<22} {text}")
+
+
+# ============================================================
+# Dispatch
+# ============================================================
+
+def exit_code(result) -> int:
+    """Map a script main()'s return value (None, bool or int) to an exit code"""
+    if isinstance(result, bool):
+        return 0 if result else 1
+    return result or 0
+
+
+def main(argv: list = None) -> int:
+    """Main entry point"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print_help()
+        return 0 if argv else 1
+
+    group, *rest = argv
+    if group not in COMMANDS:
+        print(f"❌ Unknown group: {group}\n")
+        print_help()
+        return 1
+    if not rest or rest[0] in ("-h", "--help"):
+        print_group_help(group)
+        return 0 if rest else 1
+
+    command, *args = rest
+    if command not in COMMANDS[group]:
+        print(f"❌ Unknown command: {group} {command}\n")
+        print_group_help(group)
+        return 1
+
+    module_name, *leading = COMMANDS[group][command][0].split()
+    # argparse takes its usage line from argv[0]
+    sys.argv = [f"{PROG} {group} {command}", *args]
+    module = importlib.import_module(module_name)
+    return exit_code(module.main(leading + args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,70 +4,27 @@ App Store Connect API - Submit for Review Script
 Cancel pending review, update build, and resubmit for review.
 """
 
+import itertools
 import sys
-import time
-from pathlib import Path
-from datetime import datetime, timedelta
-
-import jwt
-import requests
-
-# ============================================================
-# Configuration
-# ============================================================
-
-BUNDLE_ID = "com.kobbokkom.scannie"
-ISSUER_ID = "a7524762-b1db-463b-84a8-bbee51a37cc2"
-KEY_ID = "74HC92L9NA"
-PRIVATE_KEY_PATH = Path("/Users/semanticist/Documents/API/AuthKey_74HC92L9NA.p8")
-
-BASE_URL = "https://api.appstoreconnect.apple.com/v1"
-
-
-def generate_token():
-    """Generate JWT token for App Store Connect API."""
-    private_key = PRIVATE_KEY_PATH.read_text()
-
-    now = datetime.utcnow()
-    payload = {
-        "iss": ISSUER_ID,
-        "iat": now,
-        "exp": now + timedelta(minutes=20),
-        "aud": "appstoreconnect-v1"
-    }
-
-    return jwt.encode(
-        payload,
-        private_key,
-        algorithm="ES256",
-        headers={"kid": KEY_ID}
-    )
 
+import tracing
+from asc_client import BUNDLE_ID, BASE_URL, get_headers, paginate, request
 
-def get_headers():
-    """Get request headers with auth token."""
-    return {
-        "Authorization": f"Bearer {generate_token()}",
-        "Content-Type": "application/json"
-    }
+# Newest builds listed (and searchable with --build)
+BUILD_LIST_SIZE = 10
 
 
 def get_app_id():
     """Get app ID from bundle identifier."""
     print("🔍 Finding app...")
-    resp = requests.get(
-        f"{BASE_URL}/apps",
-        headers=get_headers(),
-        params={"filter[bundleId]": BUNDLE_ID}
-    )
-    resp.raise_for_status()
-    data = resp.json()
+    app = next(paginate("/apps", fields={"apps": ["name"]},
+                        params={"filter[bundleId]": BUNDLE_ID}), None)
 
-    if not data["data"]:
+    if not app:
         raise ValueError(f"App not found: {BUNDLE_ID}")
 
-    app_id = data["data"][0]["id"]
-    app_name = data["data"][0]["attributes"]["name"]
+    app_id = app["id"]
+    app_name = app["attributes"]["name"]
     print(f"✅ Found: {app_name} (ID: {app_id})")
     return app_id
 
@@ -75,18 +32,16 @@ def get_app_id():
 def get_app_store_version(app_id):
     """Get the current editable App Store version."""
     print("\n🔍 Finding App Store version...")
-    resp = requests.get(
-        f"{BASE_URL}/apps/{app_id}/appStoreVersions",
-        headers=get_headers(),
+    fields = {"appStoreVersions": ["appStoreState", "versionString"]}
+    versions = paginate(
+        f"/apps/{app_id}/appStoreVersions",
+        fields=fields,
         params={
-            "filter[appStoreState]": "READY_FOR_SALE,PENDING_DEVELOPER_RELEASE,WAITING_FOR_REVIEW,IN_REVIEW,PREPARE_FOR_SUBMISSION,DEVELOPER_REJECTED,REJECTED",
-            "limit": 5
+            "filter[appStoreState]": "READY_FOR_SALE,PENDING_DEVELOPER_RELEASE,WAITING_FOR_REVIEW,IN_REVIEW,PREPARE_FOR_SUBMISSION,DEVELOPER_REJECTED,REJECTED"
         }
     )
-    resp.raise_for_status()
-    data = resp.json()
 
-    for version in data["data"]:
+    for version in versions:
         state = version["attributes"]["appStoreState"]
         version_string = version["attributes"]["versionString"]
         print(f"   Found version {version_string}: {state}")
@@ -95,16 +50,9 @@ def get_app_store_version(app_id):
         if state in ["WAITING_FOR_REVIEW", "IN_REVIEW", "PREPARE_FOR_SUBMISSION", "DEVELOPER_REJECTED", "REJECTED"]:
             return version
 
-    # If no editable version, check for one being prepared
-    resp = requests.get(
-        f"{BASE_URL}/apps/{app_id}/appStoreVersions",
-        headers=get_headers(),
-        params={"limit": 5}
-    )
-    resp.raise_for_status()
-    data = resp.json()
-
-    for version in data["data"]:
+    # If no editable version, check for one being prepared (newest first;
+    # further pages are only fetched while none matches)
+    for version in paginate(f"/apps/{app_id}/appStoreVersions", fields=fields, limit=5):
         state = version["attributes"]["appStoreState"]
         if state != "READY_FOR_SALE":
             return version
@@ -117,7 +65,8 @@ def cancel_review_submission(version_id):
     print("\n🛑 Cancelling pending review...")
 
     # Get app store version submission
-    resp = requests.get(
+    resp = request(
+        "GET",
         f"{BASE_URL}/appStoreVersions/{version_id}/appStoreVersionSubmission",
         headers=get_headers()
     )
@@ -133,7 +82,8 @@ def cancel_review_submission(version_id):
         submission_id = submission["data"]["id"]
 
         # Delete the submission to cancel review
-        delete_resp = requests.delete(
+        delete_resp = request(
+            "DELETE",
             f"{BASE_URL}/appStoreVersionSubmissions/{submission_id}",
             headers=get_headers()
         )
@@ -151,21 +101,19 @@ def cancel_review_submission(version_id):
 def get_available_builds(app_id):
     """Get list of available builds for the app."""
     print("\n🔍 Getting available builds...")
-    resp = requests.get(
-        f"{BASE_URL}/builds",
-        headers=get_headers(),
+    newest = paginate(
+        "/builds",
+        fields={"builds": ["version", "uploadedDate", "processingState"]},
         params={
             "filter[app]": app_id,
             "filter[processingState]": "VALID",
-            "sort": "-uploadedDate",
-            "limit": 10
-        }
+            "sort": "-uploadedDate"
+        },
+        limit=BUILD_LIST_SIZE
     )
-    resp.raise_for_status()
-    data = resp.json()
 
     builds = []
-    for build in data["data"]:
+    for build in itertools.islice(newest, BUILD_LIST_SIZE):
         version = build["attributes"]["version"]
         uploaded = build["attributes"]["uploadedDate"]
         processing = build["attributes"]["processingState"]
@@ -184,7 +132,8 @@ def update_version_build(version_id, build_id):
     """Update the App Store version to use a specific build."""
     print(f"\n🔄 Updating version to use build...")
 
-    resp = requests.patch(
+    resp = request(
+        "PATCH",
         f"{BASE_URL}/appStoreVersions/{version_id}",
         headers=get_headers(),
         json={
@@ -217,7 +166,8 @@ def submit_for_review(app_id, version_id):
     print("\n📤 Submitting for review...")
 
     # New API: use reviewSubmissions endpoint
-    resp = requests.post(
+    resp = request(
+        "POST",
         f"{BASE_URL}/reviewSubmissions",
         headers=get_headers(),
         json={
@@ -247,7 +197,8 @@ def submit_for_review(app_id, version_id):
 
         # Try legacy API as fallback
         print("\n🔄 Trying legacy API...")
-        resp2 = requests.post(
+        resp2 = request(
+            "POST",
             f"{BASE_URL}/appStoreVersionSubmissions",
             headers=get_headers(),
             json={
@@ -273,7 +224,7 @@ def submit_for_review(app_id, version_id):
             return False
 
 
-def main():
+def main(argv: list = None):
     """Main entry point."""
     import argparse
 
@@ -289,8 +240,10 @@ Examples:
     )
     parser.add_argument('--build', type=str, help='Specific build version to use')
     parser.add_argument('--cancel-only', action='store_true', help='Only cancel pending review')
+    tracing.add_argument(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    tracing.start(args.trace)
 
     print("=" * 60)
     print("🍎 App Store Connect - Review Submission")
@@ -312,7 +265,7 @@ Examples:
         # 3. Cancel pending review if needed
         if state in ["WAITING_FOR_REVIEW", "IN_REVIEW"]:
             cancel_review_submission(version_id)
-            time.sleep(2)  # Wait for state to update
+            tracing.sleep(2, "wait for state")  # Wait for state to update
 
         if args.cancel_only:
             print("\n✅ Cancel only mode - done!")
@@ -340,7 +293,7 @@ Examples:
         if not update_version_build(version_id, target_build["id"]):
             print("⚠️ Continuing anyway...")
 
-        time.sleep(2)  # Wait for state to update
+        tracing.sleep(2, "wait for state")  # Wait for state to update
 
         # 7. Submit for review
         if submit_for_review(app_id, version_id):
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+SVG Rasterization Engine
+Renders promo SVGs straight to PNG bytes for both store uploaders.
+
+Backends, in order of preference:
+  cairosvg + Pillow   in-process rasterize and alpha flatten (pip install cairosvg pillow)
+  rsvg-convert/magick CLI fallback, piped through stdin/stdout (no temp files)
+
+flatten_png() applies the same flatten to existing PNG bytes (Pillow, or
+magick over stdin/stdout).
+
+Batches are rendered on a process pool sized to the CPU count, and every
+result goes through the content-addressed render cache (render_cache.py).
+Flattened output is 24-bit RGB on white, as the App Store and Google Play
+require for screenshots.
+
+RenderPipeline renders batches ahead of their consumers on a background
+thread, so rasterization overlaps with network I/O.
+"""
+
+import io
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import tracing
+from render_cache import cache_key, render_cache
+
+FLATTEN_BACKGROUND = (255, 255, 255)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _has_pillow() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _has_inprocess_backend() -> bool:
+    try:
+        import cairosvg  # noqa: F401
+        import PIL  # noqa: F401
+    except (ImportError, OSError):
+        # OSError: cairosvg installed but the cairo shared library is missing
+        return False
+    return True
+
+
+BACKEND = "cairosvg" if _has_inprocess_backend() else "cli"
+
+
+# ============================================================
+# Backends
+# ============================================================
+
+def _render_inprocess(svg_data: bytes, width: int, height: int, flatten: bool) -> bytes:
+    import cairosvg
+
+    png_data = cairosvg.svg2png(bytestring=svg_data, output_width=width, output_height=height)
+    if not flatten:
+        return png_data
+    return _flatten_pillow(png_data)
+
+
+def _flatten_pillow(png_data: bytes) -> bytes:
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png_data)).convert("RGBA")
+    background = Image.new("RGB", image.size, FLATTEN_BACKGROUND)
+    background.paste(image, mask=image.getchannel("A"))
+    output = io.BytesIO()
+    background.save(output, format="PNG")
+    return output.getvalue()
+
+
+def _flatten_cli(png_data: bytes) -> bytes:
+    try:
+        # Date/time chunks are dropped so identical inputs give identical bytes
+        return subprocess.run([
+            "magick", "png:-",
+            "-background", "white",
+            "-alpha", "remove",
+            "-alpha", "off",
+            "-define", "png:exclude-chunks=date,time",
+            "png24:-",
+        ], input=png_data, check=True, capture_output=True).stdout
+    except FileNotFoundError:
+        raise RuntimeError("magick not found. Install with: brew install imagemagick "
+                           "(or pip install pillow)")
+
+
+def _render_cli(svg_data: bytes, width: int, height: int, flatten: bool) -> bytes:
+    try:
+        png_data = subprocess.run([
+            "rsvg-convert",
+            "-w", str(width),
+            "-h", str(height),
+        ], input=svg_data, check=True, capture_output=True).stdout
+    except FileNotFoundError:
+        raise RuntimeError("rsvg-convert not found. Install with: brew install librsvg "
+                           "(or pip install cairosvg pillow)")
+    if not flatten:
+        return png_data
+    return _flatten_cli(png_data)
+
+
+def _render_job(svg_data: bytes, width: int, height: int, flatten: bool, backend: str) -> bytes:
+    """Process pool entry point"""
+    try:
+        if backend == "cairosvg":
+            return _render_inprocess(svg_data, width, height, flatten)
+        return _render_cli(svg_data, width, height, flatten)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.decode(errors="replace").strip() or str(e))
+
+
+def _render_job_timed(svg_data: bytes, width: int, height: int, flatten: bool, backend: str) -> tuple:
+    """_render_job() that also returns (start_us, end_us, pid) for tracing"""
+    start = tracing.now_us()
+    png_data = _render_job(svg_data, width, height, flatten, backend)
+    return png_data, start, tracing.now_us(), os.getpid()
+
+
+def _get_pool() -> "ProcessPoolExecutor":
+    """The shared render pool, created on first use (render_many runs on several threads)
+
+    Workers are started with forkserver (or spawn) rather than fork: forking
+    while upload threads hold locks can deadlock the child.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import atexit
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context(method))
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def _options(flatten: bool) -> dict:
+    renderer = "cairosvg+pillow" if BACKEND == "cairosvg" else "rsvg-convert+magick"
+    return {"renderer": renderer, "flatten": "white" if flatten else None}
+
+
+# ============================================================
+# Public API
+# ============================================================
+
+def flatten_png(png_data: bytes) -> bytes:
+    """Flatten PNG bytes onto white as 24-bit RGB (no alpha), in memory"""
+    with tracing.span("flatten png", "render", bytes=len(png_data)):
+        try:
+            if _has_pillow():
+                return _flatten_pillow(png_data)
+            return _flatten_cli(png_data)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(e.stderr.decode(errors="replace").strip() or str(e))
+
+
+def render_many(svg_paths: list, width: int, height: int, flatten: bool = True) -> list:
+    """Render SVG files to PNG bytes, in parallel across processes
+
+    Returns one entry per input path: PNG bytes, or the exception raised
+    while rendering that file.
+    """
+    results = [None] * len(svg_paths)
+    misses = []
+    for index, svg_path in enumerate(svg_paths):
+        svg_data = Path(svg_path).read_bytes()
+        key = cache_key(svg_data, width, height, _options(flatten))
+        cached = render_cache.get(key)
+        if cached is not None:
+            results[index] = cached
+        else:
+            misses.append((index, key, svg_data))
+
+    with tracing.span("render batch", "render", files=len(svg_paths),
+                      cache_hits=len(svg_paths) - len(misses), backend=BACKEND):
+        if len(misses) == 1:
+            index, key, svg_data = misses[0]
+            try:
+                with tracing.span("render", "render", file=Path(svg_paths[index]).name):
+                    results[index] = _render_job(svg_data, width, height, flatten, BACKEND)
+                render_cache.put(key, results[index])
+            except Exception as e:
+                results[index] = e
+        elif misses:
+            pool = _get_pool()
+            job = _render_job_timed if tracing.is_enabled() else _render_job
+            futures = [
+                (index, key, pool.submit(job, svg_data, width, height, flatten, BACKEND))
+                for index, key, svg_data in misses
+            ]
+            for index, key, future in futures:
+                try:
+                    result = future.result()
+                    if job is _render_job_timed:
+                        result, start, end, pid = result
+                        tracing.complete("render", "render", start, end, pid=pid, tid=pid,
+                                         file=Path(svg_paths[index]).name)
+                    results[index] = result
+                    render_cache.put(key, results[index])
+                except Exception as e:
+                    results[index] = e
+
+    return results
+
+
+def render_svg(svg_path: Path, width: int, height: int, flatten: bool = True) -> bytes:
+    """Render one SVG file to PNG bytes (raises RuntimeError on failure)"""
+    result = render_many([svg_path], width, height, flatten)[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+# ============================================================
+# Render-ahead Pipeline
+# ============================================================
+
+class RenderPipeline:
+    """Render batches of SVGs ahead of the threads that upload them
+
+    `batches` is an ordered list of (key, svg_paths). A producer thread
+    renders them in that order into a buffer of at most `capacity` batches;
+    consumers call take(key) for the render_many() results, or discard(key)
+    when they will never take a batch (failure, nothing to upload). The
+    buffer bound keeps memory flat however far rendering gets ahead.
+    """
+
+    def __init__(self, batches: list, width: int, height: int, flatten: bool = True, capacity: int = 2):
+        self._batches = list(batches)
+        self._keys = {key for key, _ in self._batches}
+        self._width = width
+        self._height = height
+        self._flatten = flatten
+        self._capacity = max(1, capacity)
+        self._ready = {}
+        self._done = set()
+        self._dropped = set()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="render-pipeline", daemon=True)
+
+        # Stage timings (seconds)
+        self.render_busy = 0.0
+        self.render_idle = 0.0
+        self.upload_busy = 0.0
+        self.upload_idle = 0.0
+
+    def start(self) -> "RenderPipeline":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        for key, svg_paths in self._batches:
+            with self._cond, tracing.span("render buffer full", "wait", key=key):
+                started = time.monotonic()
+                while len(self._ready) >= self._capacity and key not in self._dropped:
+                    self._cond.wait()
+                self.render_idle += time.monotonic() - started
+                skip = key in self._dropped
+
+            results = None
+            if not skip:
+                started = time.monotonic()
+                try:
+                    results = render_many(svg_paths, self._width, self._height, self._flatten)
+                except Exception as e:
+                    results = [e] * len(svg_paths)
+                self.render_busy += time.monotonic() - started
+
+            with self._cond:
+                if results is not None and key not in self._dropped:
+                    self._ready[key] = results
+                self._done.add(key)
+                self._cond.notify_all()
+
+    def take(self, key) -> list:
+        """Block until `key` is rendered and return its results (None if not queued)"""
+        with self._cond:
+            if key not in self._keys:
+                return None
+            started = time.monotonic()
+            with tracing.span("wait for render", "wait", key=key):
+                while key not in self._done:
+                    self._cond.wait()
+            self.upload_idle += time.monotonic() - started
+            self._dropped.add(key)
+            results = self._ready.pop(key, None)
+            self._cond.notify_all()
+        return results
+
+    def discard(self, key) -> None:
+        """Release `key`'s slot; it is skipped if not rendered yet (no-op after take)"""
+        with self._cond:
+            self._dropped.add(key)
+            self._ready.pop(key, None)
+            self._cond.notify_all()
+
+    def record_upload(self, seconds: float) -> None:
+        """Add time a consumer spent uploading a taken batch"""
+        with self._cond:
+            self.upload_busy += seconds
+
+    def close(self) -> None:
+        """Drop anything left in the buffer and wait for the producer to finish"""
+        with self._cond:
+            self._dropped.update(self._keys)
+            self._ready.clear()
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def print_stats(self) -> None:
+        print(f"🖼️  Render stage: {self.render_busy:.1f}s busy, "
+              f"{self.render_idle:.1f}s idle (buffer full)")
+        print(f"📤 Upload stage: {self.upload_busy:.1f}s busy, "
+              f"{self.upload_idle:.1f}s idle (waiting for renders)")
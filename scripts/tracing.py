@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tracing
+Records where a publishing run spends its time, as Chrome trace JSON.
+
+    python upload_app_store.py --all --trace out.json
+    # open out.json in https://ui.perfetto.dev or chrome://tracing
+
+Spans are recorded for every HTTP call (method, endpoint template, status,
+bytes), JWT signing, SVG renders (including process pool workers),
+screenshot part uploads and rate limit / retry sleeps. Scripts add a few
+phase spans on top. Tracing is off unless --trace is given; span() then
+costs next to nothing.
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+_enabled = False
+_events = []
+_threads = {}
+_lock = threading.Lock()
+
+# Path segments that are resource IDs: numeric Apple IDs, UUIDs, opaque (base64) tokens
+_ID_SEGMENT = re.compile(r"^(\d{6,}|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|(?=.*\d)[A-Za-z0-9_=-]{24,})$")
+
+
+# ============================================================
+# Recording
+# ============================================================
+
+def now_us() -> int:
+    """Wall clock in microseconds (comparable across processes)"""
+    return time.time_ns() // 1000
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def _thread_id() -> int:
+    tid = threading.get_native_id()
+    if tid not in _threads:
+        _threads[tid] = threading.current_thread().name
+    return tid
+
+
+def complete(name: str, category: str, start_us: int, end_us: int,
+             pid: int = None, tid: int = None, **args) -> None:
+    """Record a finished span (e.g. one timed in a worker process)"""
+    if not _enabled:
+        return
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start_us,
+        "dur": max(end_us - start_us, 0),
+        "pid": pid or os.getpid(),
+        "tid": tid or _thread_id(),
+        "args": args,
+    }
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name: str, category: str = "phase", **args):
+    """Time the enclosed block; yields a dict for adding args (status, bytes...)"""
+    if not _enabled:
+        yield args
+        return
+    start = now_us()
+    try:
+        yield args
+    except BaseException as e:
+        args.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        complete(name, category, start, now_us(), **args)
+
+
+def sleep(seconds: float, name: str = "sleep", **args) -> None:
+    """time.sleep() recorded as a span"""
+    with span(name, "sleep", seconds=round(seconds, 3), **args):
+        time.sleep(seconds)
+
+
+def endpoint_template(url: str) -> str:
+    """'https://host/v1/apps/123/appInfos?limit=200' -> '/v1/apps/{id}/appInfos'"""
+    path = urlsplit(url).path
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+# ============================================================
+# Output
+# ============================================================
+
+def write(path) -> int:
+    """Write recorded spans as Chrome trace JSON; returns the number of spans"""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        threads = dict(_threads)
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                 "args": {"name": Path(sys.argv[0]).name or "python"}}]
+    metadata += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in threads.items()]
+    metadata += [{"name": "process_name", "ph": "M", "pid": worker, "tid": 0,
+                  "args": {"name": f"render worker {worker}"}}
+                 for worker in sorted({e["pid"] for e in events} - {pid})]
+
+    Path(path).write_text(json.dumps({
+        "traceEvents": metadata + sorted(events, key=lambda e: e["ts"]),
+        "displayTimeUnit": "ms",
+    }))
+    return len(events)
+
+
+def start(path) -> None:
+    """Enable tracing and write the trace to `path` at exit (no-op when path is None)"""
+    if not path:
+        return
+    enable()
+
+    def _write():
+        count = write(path)
+        print(f"🧭 Trace: {count} spans written to {path}")
+
+    atexit.register(_write)
+
+
+def add_argument(parser) -> None:
+    """Add the standard --trace option to an argparse parser"""
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write a Chrome/Perfetto trace of this run to PATH")
+
+
+def pop_argument(argv: list = None):
+    """Remove `--trace PATH` from argv (sys.argv by default) and return PATH, for scripts without argparse"""
+    argv = sys.argv if argv is None else argv
+    for index, value in enumerate(argv):
+        if value == "--trace" and index + 1 < len(argv):
+            path = argv[index + 1]
+            del argv[index:index + 2]
+            return path
+        if value.startswith("--trace="):
+            del argv[index]
+            return value.split("=", 1)[1]
+    return None
@@ -4,26 +4,18 @@ App Store Connect API - Support URL Bulk Update Script
 Updates support URL for all version localizations
 """
 
+import functools
 import json
-import time
 import sys
-from pathlib import Path
-from datetime import datetime, timezone, timedelta
 
-import jwt
-import requests
+import asc_client
+import tracing
+from asc_client import BUNDLE_ID, paginate
 
 # ============================================================
 # Configuration
 # ============================================================
 
-BUNDLE_ID = "com.kobbokkom.scannie"
-ISSUER_ID = "a7524762-b1db-463b-84a8-bbee51a37cc2"
-KEY_ID = "74HC92L9NA"
-PRIVATE_KEY_PATH = Path("/Users/semanticist/Documents/API/AuthKey_74HC92L9NA.p8")
-
-BASE_URL = "https://api.appstoreconnect.apple.com/v1"
-
 # Support URL to set for all locales
 SUPPORT_URL = "https://kobbokkom.com/forum"
 
@@ -35,85 +27,26 @@ ALL_LOCALES = [
     "ru", "sk", "sv", "th", "tr", "uk", "vi", "zh-Hans", "zh-Hant"
 ]
 
-# ============================================================
-# JWT Token Generation
-# ============================================================
-
-def generate_token() -> str:
-    """Generate JWT token for App Store Connect API"""
-    private_key = PRIVATE_KEY_PATH.read_text()
-
-    now = datetime.now(timezone.utc)
-    payload = {
-        "iss": ISSUER_ID,
-        "iat": now,
-        "exp": now + timedelta(minutes=20),
-        "aud": "appstoreconnect-v1",
-    }
-
-    headers = {
-        "alg": "ES256",
-        "kid": KEY_ID,
-        "typ": "JWT",
-    }
-
-    token = jwt.encode(payload, private_key, algorithm="ES256", headers=headers)
-    return token
-
-
-def get_headers() -> dict:
-    """Get authorization headers"""
-    return {
-        "Authorization": f"Bearer {generate_token()}",
-        "Content-Type": "application/json",
-    }
-
-
-# ============================================================
-# API Calls
-# ============================================================
-
-def api_get(endpoint: str) -> dict:
-    """Make GET request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.get(url, headers=get_headers())
-    response.raise_for_status()
-    return response.json()
-
-
-def api_patch(endpoint: str, data: dict) -> dict:
-    """Make PATCH request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.patch(url, headers=get_headers(), json=data)
-    response.raise_for_status()
-    return response.json()
-
-
-def api_post(endpoint: str, data: dict) -> dict:
-    """Make POST request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.post(url, headers=get_headers(), json=data)
-    response.raise_for_status()
-    return response.json()
-
-
 # ============================================================
 # App Store Connect Operations
 # ============================================================
 
 def get_app_id() -> str:
     """Get app ID by bundle ID"""
-    response = api_get(f"/apps?filter[bundleId]={BUNDLE_ID}")
-    apps = response.get("data", [])
-    if not apps:
+    app = next(paginate("/apps", fields={"apps": ["bundleId"]},
+                        params={"filter[bundleId]": BUNDLE_ID}), None)
+    if not app:
         raise ValueError(f"App not found with bundle ID: {BUNDLE_ID}")
-    return apps[0]["id"]
+    return app["id"]
 
 
 def get_app_store_version(app_id: str) -> dict:
     """Get the latest editable app store version"""
-    response = api_get(f"/apps/{app_id}/appStoreVersions?filter[platform]=IOS")
-    versions = response.get("data", [])
+    versions = list(paginate(
+        f"/apps/{app_id}/appStoreVersions",
+        fields={"appStoreVersions": ["appStoreState", "versionString"]},
+        params={"filter[platform]": "IOS"}
+    ))
 
     # Find editable version
     editable_states = ["PREPARE_FOR_SUBMISSION", "DEVELOPER_REJECTED", "REJECTED",
@@ -132,15 +65,15 @@ def get_app_store_version(app_id: str) -> dict:
 
 def get_version_localizations(version_id: str) -> dict:
     """Get all version localizations"""
-    response = api_get(f"/appStoreVersions/{version_id}/appStoreVersionLocalizations")
     localizations = {}
-    for loc in response.get("data", []):
+    for loc in paginate(f"/appStoreVersions/{version_id}/appStoreVersionLocalizations",
+                        fields={"appStoreVersionLocalizations": ["locale", "supportUrl"]}):
         locale = loc["attributes"]["locale"]
         localizations[locale] = loc
     return localizations
 
 
-def update_support_url(localization_id: str, support_url: str) -> dict:
+async def update_support_url(client, localization_id: str, support_url: str) -> dict:
     """Update support URL for a version localization"""
     data = {
         "data": {
@@ -151,10 +84,11 @@ def update_support_url(localization_id: str, support_url: str) -> dict:
             }
         }
     }
-    return api_patch(f"/appStoreVersionLocalizations/{localization_id}", data)
+    return await client.patch(f"/appStoreVersionLocalizations/{localization_id}", data)
 
 
-def create_version_localization_with_support_url(version_id: str, locale: str, support_url: str) -> dict:
+async def create_version_localization_with_support_url(client, version_id: str, locale: str,
+                                                       support_url: str) -> dict:
     """Create a new version localization with support URL"""
     data = {
         "data": {
@@ -173,14 +107,64 @@ def create_version_localization_with_support_url(version_id: str, locale: str, s
             }
         }
     }
-    return api_post("/appStoreVersionLocalizations", data)
+    return await client.post("/appStoreVersionLocalizations", data)
+
+
+async def set_locale_support_url(client, locale: str, version_id: str, existing_locs: dict) -> bool:
+    """Patch or create one locale's localization; prints the outcome"""
+    import requests
+
+    try:
+        if locale in existing_locs:
+            # Update existing localization
+            loc_id = existing_locs[locale]["id"]
+            current_url = existing_locs[locale]["attributes"].get("supportUrl", "")
+
+            if current_url == SUPPORT_URL:
+                print(f"  ⏭️  {locale}: Already set")
+                return True
+
+            await update_support_url(client, loc_id, SUPPORT_URL)
+            print(f"  ✅ {locale}: Updated")
+        else:
+            # Create new localization
+            await create_version_localization_with_support_url(client, version_id, locale, SUPPORT_URL)
+            print(f"  ✅ {locale}: Created")
+        return True
+
+    except requests.exceptions.HTTPError as e:
+        print(f"  ❌ {locale}: HTTP Error - {e}")
+        if e.response is not None:
+            try:
+                error_detail = e.response.json()
+                errors = error_detail.get("errors", [])
+                for err in errors:
+                    print(f"      {err.get('detail', err)}")
+            except:
+                pass
+        return False
+    except Exception as e:
+        print(f"  ❌ {locale}: {e}")
+        return False
 
 
 # ============================================================
 # Main Function
 # ============================================================
 
-def main():
+def main(argv: list = None) -> bool:
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Set the Support URL for all App Store locales")
+    parser.add_argument("--concurrency", type=int, default=asc_client.API_POOL_SIZE, metavar="N",
+                        help="Locales updated at once (default: %(default)s)")
+    tracing.add_argument(parser)
+    args = parser.parse_args(argv)
+    tracing.start(args.trace)
+
+    import asc_async
+
     print("=" * 60)
     print(f"🔗 Setting Support URL for all locales")
     print(f"   URL: {SUPPORT_URL}")
@@ -203,49 +187,16 @@ def main():
         existing_locs = get_version_localizations(version_id)
         print(f"📍 Found {len(existing_locs)} existing localizations")
 
-        success_count = 0
-        fail_count = 0
-
-        for locale in ALL_LOCALES:
-            try:
-                if locale in existing_locs:
-                    # Update existing localization
-                    loc_id = existing_locs[locale]["id"]
-                    current_url = existing_locs[locale]["attributes"].get("supportUrl", "")
-
-                    if current_url == SUPPORT_URL:
-                        print(f"  ⏭️  {locale}: Already set")
-                        success_count += 1
-                        continue
-
-                    update_support_url(loc_id, SUPPORT_URL)
-                    print(f"  ✅ {locale}: Updated")
-                else:
-                    # Create new localization
-                    create_version_localization_with_support_url(version_id, locale, SUPPORT_URL)
-                    print(f"  ✅ {locale}: Created")
-
-                success_count += 1
-                time.sleep(0.3)  # Rate limiting
-
-            except requests.exceptions.HTTPError as e:
-                print(f"  ❌ {locale}: HTTP Error - {e}")
-                if e.response is not None:
-                    try:
-                        error_detail = e.response.json()
-                        errors = error_detail.get("errors", [])
-                        for err in errors:
-                            print(f"      {err.get('detail', err)}")
-                    except:
-                        pass
-                fail_count += 1
-            except Exception as e:
-                print(f"  ❌ {locale}: {e}")
-                fail_count += 1
+        # Every locale is independent: patch/create them concurrently
+        job = functools.partial(set_locale_support_url, version_id=version_id, existing_locs=existing_locs)
+        results = asc_async.run_all(ALL_LOCALES, job, concurrency=args.concurrency)
+        success_count = sum(1 for ok in results if ok is True)
+        fail_count = len(results) - success_count
 
         print("\n" + "=" * 60)
         print(f"✅ Summary: {success_count} succeeded, {fail_count} failed")
         print("=" * 60)
+        asc_client.print_connection_stats()
 
         return fail_count == 0
 
@@ -2,24 +2,46 @@
 """
 Google Play Alpha Track AAB Uploader
 Uploads App Bundle to internal/alpha track with release notes.
+
+The bundle is sent in CHUNK_SIZE pieces over a resumable upload session.
+The session URI, edit ID and bundle hash are saved after the first chunk,
+so if the network drops or the process dies, re-running the script asks
+Play how many bytes it already has and continues from there.
+
+If Play already holds this exact build (same versionCode from the AAB
+manifest and same sha256), the upload is skipped and only the track is
+updated.
+
+    SCANNIE_AAB_UPLOAD_STATE   resume state file ("" disables resuming)
 """
 
+import hashlib
+import json
 import os
 import sys
+import time
 from pathlib import Path
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+import tracing
+from aab_manifest import read_version_code
+from play_client import PACKAGE_NAME, get_play_service, thread_http
 
 # Configuration
-PACKAGE_NAME = "com.kobbokkom.scannie"
-SERVICE_ACCOUNT_JSON = "/Users/semanticist/Documents/API/simple-anzan-3e199a55a5b1.json"
 PROJECT_ROOT = Path(__file__).parent.parent
 AAB_PATH = PROJECT_ROOT / "build" / "app" / "outputs" / "bundle" / "release" / "app-release.aab"
 
-# Google Play API scopes
-SCOPES = ['https://www.googleapis.com/auth/androidpublisher']
+# Upload chunk size (must be a multiple of 256 KB); larger chunks mean fewer
+# round trips, smaller ones lose less progress when a connection drops
+CHUNK_SIZE = 8 * 1024 * 1024
+# Retries per chunk for 5xx and connection errors
+CHUNK_RETRIES = 3
+
+# Resumable session state (set SCANNIE_AAB_UPLOAD_STATE="" to disable)
+_state_env = os.environ.get("SCANNIE_AAB_UPLOAD_STATE")
+if _state_env is None:
+    UPLOAD_STATE_PATH = Path.home() / ".cache" / "scannie" / "aab_upload.json"
+else:
+    UPLOAD_STATE_PATH = Path(_state_env) if _state_env else None
 
 # Release notes (multi-language)
 RELEASE_NOTES = {
@@ -32,57 +54,227 @@ RELEASE_NOTES = {
 }
 
 
-def get_play_service():
-    """Create authenticated Google Play Developer API service."""
-    credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_JSON,
-        scopes=SCOPES
-    )
-    return build('androidpublisher', 'v3', credentials=credentials)
+# ============================================================
+# Resumable Upload State
+# ============================================================
 
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
-def upload_aab_to_alpha(track_name: str = 'alpha'):
-    """Upload AAB to specified track (alpha, beta, internal, production)."""
 
-    if not AAB_PATH.exists():
-        print(f"❌ AAB file not found: {AAB_PATH}")
-        print("   Run 'flutter build appbundle' first")
-        return False
+def load_upload_state(sha256: str, size: int):
+    """Saved session for this exact bundle, or None."""
+    if UPLOAD_STATE_PATH is None:
+        return None
+    try:
+        state = json.loads(UPLOAD_STATE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    if state.get('package') != PACKAGE_NAME or state.get('sha256') != sha256 or state.get('size') != size:
+        return None
+    return state
 
-    print(f"\n{'='*60}")
-    print(f"🚀 Google Play {track_name.upper()} Track Upload")
-    print(f"📱 Package: {PACKAGE_NAME}")
-    print(f"📦 AAB: {AAB_PATH}")
-    print(f"📊 Size: {AAB_PATH.stat().st_size / 1024 / 1024:.1f} MB")
-    print(f"{'='*60}")
 
-    service = get_play_service()
+def save_upload_state(state: dict) -> None:
+    """Atomically write the session state, readable by the current user only."""
+    if UPLOAD_STATE_PATH is None:
+        return
+    try:
+        UPLOAD_STATE_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = UPLOAD_STATE_PATH.with_name(f".{UPLOAD_STATE_PATH.name}.{os.getpid()}")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, UPLOAD_STATE_PATH)
+    except OSError:
+        # Resuming is an optimization only
+        pass
+
+
+def clear_upload_state() -> None:
+    if UPLOAD_STATE_PATH is None:
+        return
+    try:
+        UPLOAD_STATE_PATH.unlink()
+    except OSError:
+        pass
 
-    # 1. Create edit
-    print("\n📝 Creating edit...")
-    edit_request = service.edits().insert(
+
+def query_upload_progress(session_uri: str, size: int):
+    """Ask the upload session how far it got.
+
+    Returns (next_offset, None) for an unfinished session, (size, bundle)
+    if the upload already completed, or None if the session is gone.
+    """
+    resp, content = thread_http().request(
+        session_uri, 'PUT',
+        headers={'Content-Range': f'bytes */{size}', 'Content-Length': '0'}
+    )
+    if resp.status in (200, 201):
+        return size, json.loads(content)
+    if resp.status == 308:
+        # Range: bytes=0-N (absent when nothing was received)
+        received = resp.get('range', '')
+        return (int(received.rsplit('-', 1)[1]) + 1 if received else 0), None
+    return None
+
+
+def find_uploaded_bundle(service, edit_id: str, version_code: int):
+    """Bundle already on Play with this versionCode, or None."""
+    response = service.edits().bundles().list(
         packageName=PACKAGE_NAME,
-        body={}
+        editId=edit_id
     ).execute()
-    edit_id = edit_request['id']
-    print(f"✅ Edit ID: {edit_id}")
+    for bundle in response.get('bundles', []):
+        if bundle.get('versionCode') == version_code:
+            return bundle
+    return None
+
+
+def edit_exists(service, edit_id: str) -> bool:
+    try:
+        service.edits().get(packageName=PACKAGE_NAME, editId=edit_id).execute()
+        return True
+    except Exception:
+        return False
+
+
+# ============================================================
+# Chunked Upload
+# ============================================================
+
+def _format_eta(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def upload_bundle(service, edit_id: str, sha256: str, size: int, resume: dict = None,
+                  chunk_size: int = CHUNK_SIZE, aab_path: Path = AAB_PATH) -> dict:
+    """Upload aab_path in chunks with live throughput; returns the Bundle resource.
+
+    `resume` is a saved state for `edit_id` whose session is continued.
+    """
+    from googleapiclient.http import MediaFileUpload
 
-    # 2. Upload AAB
-    print(f"\n📤 Uploading AAB...")
     media = MediaFileUpload(
-        str(AAB_PATH),
+        str(aab_path),
         mimetype='application/octet-stream',
+        chunksize=chunk_size,
         resumable=True
     )
-
-    bundle_response = service.edits().bundles().upload(
+    request = service.edits().bundles().upload(
         packageName=PACKAGE_NAME,
         editId=edit_id,
         media_body=media
-    ).execute()
+    )
+
+    if resume:
+        progress = query_upload_progress(resume['session_uri'], size)
+        if progress is None:
+            print("   ⚠️  Upload session expired, starting over")
+        else:
+            offset, bundle = progress
+            if bundle is not None:
+                print("   ✅ Upload had already completed")
+                return bundle
+            print(f"   ↩️  Resuming at {offset / 1024 / 1024:.1f} / {size / 1024 / 1024:.1f} MB")
+            request.resumable_uri = resume['session_uri']
+            request.resumable_progress = offset
+
+    start_offset = request.resumable_progress
+    started = time.monotonic()
+    saved_uri = None
+    response = None
+    while response is None:
+        _, response = request.next_chunk(num_retries=CHUNK_RETRIES)
+
+        # Save the session as soon as it exists so a crash can resume
+        if request.resumable_uri and request.resumable_uri != saved_uri:
+            saved_uri = request.resumable_uri
+            save_upload_state({
+                'package': PACKAGE_NAME,
+                'edit_id': edit_id,
+                'session_uri': saved_uri,
+                'sha256': sha256,
+                'size': size,
+            })
+
+        sent = (size if response is not None else request.resumable_progress) - start_offset
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = sent / elapsed
+        done = start_offset + sent
+        eta = (size - done) / rate if rate else 0
+        print(f"\r   {done / size * 100:5.1f}%  {done / 1024 / 1024:6.1f}/{size / 1024 / 1024:.1f} MB"
+              f"  {rate / 1024 / 1024:5.2f} MB/s  ETA {_format_eta(eta)}", end="", flush=True)
+
+    print()
+    return response
+
+
+def upload_aab_to_alpha(track_name: str = 'alpha', chunk_size: int = CHUNK_SIZE,
+                        aab_path: Path = AAB_PATH):
+    """Upload AAB to specified track (alpha, beta, internal, production)."""
+
+    if not aab_path.exists():
+        print(f"❌ AAB file not found: {aab_path}")
+        print("   Run 'flutter build appbundle' first")
+        return False
+
+    print(f"\n{'='*60}")
+    print(f"🚀 Google Play {track_name.upper()} Track Upload")
+    print(f"📱 Package: {PACKAGE_NAME}")
+    print(f"📦 AAB: {aab_path}")
+    print(f"📊 Size: {aab_path.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"{'='*60}")
+
+    service = get_play_service()
+    size = aab_path.stat().st_size
+    with tracing.span("hash bundle", bytes=size):
+        sha256 = file_sha256(aab_path)
+    local_version_code = read_version_code(aab_path)
+    if local_version_code is not None:
+        print(f"🔢 Version Code (manifest): {local_version_code}")
+
+    # 1. Create edit (or reuse the one an interrupted upload of this bundle left open)
+    resume = load_upload_state(sha256, size)
+    if resume and edit_exists(service, resume['edit_id']):
+        edit_id = resume['edit_id']
+        print(f"\n📝 Reusing edit from interrupted upload: {edit_id}")
+    else:
+        resume = None
+        print("\n📝 Creating edit...")
+        edit_request = service.edits().insert(
+            packageName=PACKAGE_NAME,
+            body={}
+        ).execute()
+        edit_id = edit_request['id']
+        print(f"✅ Edit ID: {edit_id}")
+
+    # 2. Upload AAB (unless Play already has this exact build)
+    existing = None
+    if local_version_code is not None:
+        existing = find_uploaded_bundle(service, edit_id, local_version_code)
+    if existing and existing.get('sha256') == sha256:
+        print(f"\n⏭️  Version Code {local_version_code} already on Play (sha256 matches), skipping upload")
+        bundle_response = existing
+        clear_upload_state()
+    elif existing:
+        print(f"\n❌ Version Code {local_version_code} already exists on Play with a different build")
+        print("   Bump the versionCode in pubspec.yaml and rebuild")
+        return False
+    else:
+        print(f"\n📤 Uploading AAB ({chunk_size // 1024 // 1024} MB chunks)...")
+        with tracing.span("upload bundle", "upload", bytes=size, resumed=bool(resume)):
+            bundle_response = upload_bundle(service, edit_id, sha256, size, resume, chunk_size, aab_path)
+        clear_upload_state()
+        print(f"✅ Uploaded! Version Code: {bundle_response['versionCode']}")
 
     version_code = bundle_response['versionCode']
-    print(f"✅ Uploaded! Version Code: {version_code}")
 
     # 3. Assign to track with release notes
     print(f"\n🎯 Assigning to {track_name} track...")
@@ -126,7 +318,7 @@ def upload_aab_to_alpha(track_name: str = 'alpha'):
     return True
 
 
-def main():
+def main(argv: list = None):
     """Main entry point."""
     import argparse
 
@@ -146,10 +338,25 @@ Examples:
         choices=['internal', 'alpha', 'beta', 'production'],
         help='Release track (default: alpha)'
     )
+    parser.add_argument(
+        '--chunk-mb',
+        type=int,
+        default=CHUNK_SIZE // 1024 // 1024,
+        help='Upload chunk size in MB (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--aab',
+        type=Path,
+        default=AAB_PATH,
+        help='App Bundle to upload (default: the flutter release build)'
+    )
+    tracing.add_argument(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    tracing.start(args.trace)
 
-    success = upload_aab_to_alpha(args.track)
+    success = upload_aab_to_alpha(args.track, chunk_size=max(args.chunk_mb, 1) * 1024 * 1024,
+                                  aab_path=args.aab)
     sys.exit(0 if success else 1)
 
 
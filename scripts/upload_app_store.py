@@ -5,33 +5,35 @@ Uploads localized metadata and promotional images for Scannie iOS app
 """
 
 import json
+import threading
 import time
-import subprocess
 import sys
 import re
 from pathlib import Path
-from datetime import datetime, timedelta
-import xml.etree.ElementTree as ET
 
-import jwt
-import requests
+import asc_client
+from asc_client import BUNDLE_ID, api_post, api_patch, paginate
+import asc_screenshots
+import tracing
+from asc_screenshots import get_or_create_screenshot_set, sync_screenshot_set
+from parallel import run_grouped
 
 # ============================================================
 # Configuration
 # ============================================================
 
-BUNDLE_ID = "com.kobbokkom.scannie"
-ISSUER_ID = "a7524762-b1db-463b-84a8-bbee51a37cc2"
-KEY_ID = "74HC92L9NA"
-PRIVATE_KEY_PATH = Path("/Users/semanticist/Documents/API/AuthKey_74HC92L9NA.p8")
-
-BASE_URL = "https://api.appstoreconnect.apple.com/v1"
-
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 METADATA_DIR = PROJECT_ROOT / "store" / "metadata" / "ios"
 PROMO_DIR = PROJECT_ROOT / "store" / "screenshots" / "promotions" / "ios" / "lang"
 
+# iPhone 6.7" display size (width, height)
+SCREENSHOT_SIZE = (1290, 2796)
+
+# Localization attributes fetched from the API (everything plan_locale diffs)
+VERSION_LOCALIZATION_FIELDS = ["locale", "description", "keywords", "whatsNew"]
+APP_INFO_LOCALIZATION_FIELDS = ["locale", "name", "subtitle"]
+
 # iOS locale code mapping (XML filename -> App Store Connect locale)
 LOCALE_MAPPING = {
     "ar-SA": "ar-SA",
@@ -118,92 +120,26 @@ PROMO_FOLDER_MAPPING = {
     "zh-Hant": "zh-Hant",
 }
 
-# ============================================================
-# JWT Token Generation
-# ============================================================
-
-def generate_token() -> str:
-    """Generate JWT token for App Store Connect API"""
-    private_key = PRIVATE_KEY_PATH.read_text()
-
-    now = datetime.utcnow()
-    payload = {
-        "iss": ISSUER_ID,
-        "iat": now,
-        "exp": now + timedelta(minutes=20),
-        "aud": "appstoreconnect-v1",
-    }
-
-    headers = {
-        "alg": "ES256",
-        "kid": KEY_ID,
-        "typ": "JWT",
-    }
-
-    token = jwt.encode(payload, private_key, algorithm="ES256", headers=headers)
-    return token
-
-
-def get_headers() -> dict:
-    """Get authorization headers"""
-    return {
-        "Authorization": f"Bearer {generate_token()}",
-        "Content-Type": "application/json",
-    }
-
-
-# ============================================================
-# API Calls
-# ============================================================
-
-def api_get(endpoint: str) -> dict:
-    """Make GET request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.get(url, headers=get_headers())
-    response.raise_for_status()
-    return response.json()
-
-
-def api_patch(endpoint: str, data: dict) -> dict:
-    """Make PATCH request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.patch(url, headers=get_headers(), json=data)
-    response.raise_for_status()
-    return response.json()
-
-
-def api_post(endpoint: str, data: dict) -> dict:
-    """Make POST request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.post(url, headers=get_headers(), json=data)
-    response.raise_for_status()
-    return response.json()
-
-
-def api_delete(endpoint: str) -> None:
-    """Make DELETE request to App Store Connect API"""
-    url = f"{BASE_URL}{endpoint}"
-    response = requests.delete(url, headers=get_headers())
-    response.raise_for_status()
-
-
 # ============================================================
 # App Store Connect Operations
 # ============================================================
 
 def get_app_id() -> str:
     """Get app ID by bundle ID"""
-    response = api_get(f"/apps?filter[bundleId]={BUNDLE_ID}")
-    apps = response.get("data", [])
-    if not apps:
+    app = next(paginate("/apps", fields={"apps": ["bundleId"]},
+                        params={"filter[bundleId]": BUNDLE_ID}), None)
+    if not app:
         raise ValueError(f"App not found with bundle ID: {BUNDLE_ID}")
-    return apps[0]["id"]
+    return app["id"]
 
 
 def get_app_store_version(app_id: str) -> dict:
     """Get the latest editable app store version"""
-    response = api_get(f"/apps/{app_id}/appStoreVersions?filter[platform]=IOS")
-    versions = response.get("data", [])
+    versions = list(paginate(
+        f"/apps/{app_id}/appStoreVersions",
+        fields={"appStoreVersions": ["appStoreState", "versionString"]},
+        params={"filter[platform]": "IOS"}
+    ))
 
     # Find editable version (PREPARE_FOR_SUBMISSION, DEVELOPER_REJECTED, etc.)
     editable_states = ["PREPARE_FOR_SUBMISSION", "DEVELOPER_REJECTED", "REJECTED", "METADATA_REJECTED", "WAITING_FOR_REVIEW", "IN_REVIEW"]
@@ -222,18 +158,18 @@ def get_app_store_version(app_id: str) -> dict:
 
 def get_app_info(app_id: str) -> dict:
     """Get app info"""
-    response = api_get(f"/apps/{app_id}/appInfos")
-    infos = response.get("data", [])
-    if not infos:
+    # Only the ID is used; request a single relationship instead of every attribute
+    info = next(paginate(f"/apps/{app_id}/appInfos", fields={"appInfos": ["app"]}), None)
+    if not info:
         raise ValueError("No app info found")
-    return infos[0]
+    return info
 
 
 def get_version_localizations(version_id: str) -> dict:
     """Get all version localizations (title, subtitle, keywords)"""
-    response = api_get(f"/appStoreVersions/{version_id}/appStoreVersionLocalizations")
     localizations = {}
-    for loc in response.get("data", []):
+    for loc in paginate(f"/appStoreVersions/{version_id}/appStoreVersionLocalizations",
+                        fields={"appStoreVersionLocalizations": VERSION_LOCALIZATION_FIELDS}):
         locale = loc["attributes"]["locale"]
         localizations[locale] = loc
     return localizations
@@ -241,9 +177,9 @@ def get_version_localizations(version_id: str) -> dict:
 
 def get_app_info_localizations(app_info_id: str) -> dict:
     """Get all app info localizations (description)"""
-    response = api_get(f"/appInfos/{app_info_id}/appInfoLocalizations")
     localizations = {}
-    for loc in response.get("data", []):
+    for loc in paginate(f"/appInfos/{app_info_id}/appInfoLocalizations",
+                        fields={"appInfoLocalizations": APP_INFO_LOCALIZATION_FIELDS}):
         locale = loc["attributes"]["locale"]
         localizations[locale] = loc
     return localizations
@@ -273,23 +209,28 @@ def create_version_localization(version_id: str, locale: str, metadata: dict) ->
     return api_post("/appStoreVersionLocalizations", data)
 
 
-def update_version_localization(localization_id: str, metadata: dict) -> dict:
+def version_localization_attributes(metadata: dict) -> dict:
+    """Map parsed metadata to appStoreVersionLocalization attributes"""
+    attributes = {}
+    if "description" in metadata:
+        attributes["description"] = metadata["description"]
+    if "keywords" in metadata:
+        attributes["keywords"] = metadata["keywords"]
+    if "whats_new" in metadata:
+        attributes["whatsNew"] = metadata["whats_new"]
+    return attributes
+
+
+def update_version_localization(localization_id: str, attributes: dict) -> dict:
     """Update version localization (description, keywords, whatsNew)"""
     data = {
         "data": {
             "type": "appStoreVersionLocalizations",
             "id": localization_id,
-            "attributes": {}
+            "attributes": attributes
         }
     }
 
-    if "description" in metadata:
-        data["data"]["attributes"]["description"] = metadata["description"]
-    if "keywords" in metadata:
-        data["data"]["attributes"]["keywords"] = metadata["keywords"]
-    if "whats_new" in metadata:
-        data["data"]["attributes"]["whatsNew"] = metadata["whats_new"]
-
     return api_patch(f"/appStoreVersionLocalizations/{localization_id}", data)
 
 
@@ -316,21 +257,26 @@ def create_app_info_localization(app_info_id: str, locale: str, metadata: dict)
     return api_post("/appInfoLocalizations", data)
 
 
-def update_app_info_localization(localization_id: str, metadata: dict) -> dict:
+def app_info_localization_attributes(metadata: dict) -> dict:
+    """Map parsed metadata to appInfoLocalization attributes"""
+    attributes = {}
+    if "title" in metadata:
+        attributes["name"] = metadata["title"][:30]
+    if "subtitle" in metadata:
+        attributes["subtitle"] = metadata["subtitle"][:30]
+    return attributes
+
+
+def update_app_info_localization(localization_id: str, attributes: dict) -> dict:
     """Update app info localization (name, subtitle)"""
     data = {
         "data": {
             "type": "appInfoLocalizations",
             "id": localization_id,
-            "attributes": {}
+            "attributes": attributes
         }
     }
 
-    if "title" in metadata:
-        data["data"]["attributes"]["name"] = metadata["title"][:30]
-    if "subtitle" in metadata:
-        data["data"]["attributes"]["subtitle"] = metadata["subtitle"][:30]
-
     return api_patch(f"/appInfoLocalizations/{localization_id}", data)
 
 
@@ -385,6 +331,8 @@ def strip_emojis(text: str) -> str:
 
 def parse_metadata_xml(xml_path: Path) -> dict:
     """Parse iOS metadata XML file"""
+    import xml.etree.ElementTree as ET
+
     content = xml_path.read_text(encoding='utf-8')
 
     # Escape unescaped & characters
@@ -423,236 +371,238 @@ def parse_metadata_xml(xml_path: Path) -> dict:
 # Screenshot Upload
 # ============================================================
 
-def convert_svg_to_png(svg_path: Path, png_path: Path, width: int = 1290, height: int = 2796) -> bool:
-    """Convert SVG to PNG using rsvg-convert (iPhone 6.7" display size)
+def promo_svgs(promo_folder: str) -> list:
+    """Promo SVGs for a folder in display order (empty if the folder is missing)"""
+    return sorted((PROMO_DIR / promo_folder).glob("promo_*.svg"))
 
-    Note: App Store does not allow alpha channel in screenshots,
-    so we use ImageMagick to flatten the image after conversion.
-    """
-    temp_png = png_path.with_suffix('.temp.png')
-
-    try:
-        # Step 1: Convert SVG to PNG with rsvg-convert
-        subprocess.run([
-            "rsvg-convert",
-            "-w", str(width),
-            "-h", str(height),
-            str(svg_path),
-            "-o", str(temp_png)
-        ], check=True, capture_output=True)
-
-        # Step 2: Remove alpha channel using ImageMagick
-        # App Store requires screenshots without transparency (RGB, not RGBA)
-        subprocess.run([
-            "magick",
-            str(temp_png),
-            "-background", "white",
-            "-alpha", "remove",
-            "-alpha", "off",
-            str(png_path)
-        ], check=True, capture_output=True)
 
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"    Error converting {svg_path}: {e.stderr.decode()}")
-        return False
-    except FileNotFoundError as e:
-        if "rsvg-convert" in str(e):
-            print("    Error: rsvg-convert not found. Install with: brew install librsvg")
-        else:
-            print("    Error: magick not found. Install with: brew install imagemagick")
-        return False
-    finally:
-        # Clean up temp file
-        if temp_png.exists():
-            temp_png.unlink()
+def create_render_pipeline(locales: list, capacity: int) -> "RenderPipeline":
+    """Start rendering the promos of `locales`, in order, ahead of their uploads"""
+    from svg_render import RenderPipeline
 
+    batches = []
+    for locale in locales:
+        promo_folder = PROMO_FOLDER_MAPPING.get(locale)
+        if promo_folder:
+            batches.append((locale, promo_svgs(promo_folder)))
+    return RenderPipeline(batches, *SCREENSHOT_SIZE, capacity=capacity).start()
 
-def get_screenshot_sets(localization_id: str) -> list:
-    """Get all screenshot sets for a localization"""
-    response = api_get(f"/appStoreVersionLocalizations/{localization_id}/appScreenshotSets")
-    return response.get("data", [])
 
+def upload_screenshots_for_locale(localization_id: str, locale: str, promo_folder: str,
+                                  pipeline: "RenderPipeline" = None) -> bool:
+    """Sync promotional screenshots for a locale, re-uploading only what changed
 
-def create_screenshot_set(localization_id: str, display_type: str) -> dict:
-    """Create a new screenshot set"""
-    data = {
-        "data": {
-            "type": "appScreenshotSets",
-            "attributes": {
-                "screenshotDisplayType": display_type
-            },
-            "relationships": {
-                "appStoreVersionLocalization": {
-                    "data": {
-                        "type": "appStoreVersionLocalizations",
-                        "id": localization_id
-                    }
-                }
-            }
-        }
-    }
-    return api_post("/appScreenshotSets", data)
-
-
-def get_screenshots_in_set(screenshot_set_id: str) -> list:
-    """Get all screenshots in a set"""
-    response = api_get(f"/appScreenshotSets/{screenshot_set_id}/appScreenshots")
-    return response.get("data", [])
+    With a `pipeline` the PNGs were rendered ahead of time under the
+    locale's XML name; otherwise they are rendered here. Returns False if
+    any screenshot failed to render or upload.
+    """
+    promo_path = PROMO_DIR / promo_folder
 
+    if not promo_path.exists():
+        print(f"    No promo folder found: {promo_path}")
+        return True
 
-def delete_screenshot(screenshot_id: str) -> None:
-    """Delete a screenshot"""
-    api_delete(f"/appScreenshots/{screenshot_id}")
+    # Get or create screenshot set for iPhone 6.7" display (largest available)
+    screenshot_set = get_or_create_screenshot_set(localization_id, "APP_IPHONE_67")
+
+    # Render SVGs first so checksums can be compared with the remote set
+    svg_paths = promo_svgs(promo_folder)
+    results = pipeline.take(locale) if pipeline else None
+    if results is None:
+        from svg_render import render_many
+        print(f"    Rendering {len(svg_paths)} SVGs to PNG...")
+        results = render_many(svg_paths, *SCREENSHOT_SIZE)
+
+    files = []
+    render_failures = 0
+    for svg_path, result in zip(svg_paths, results):
+        if isinstance(result, Exception):
+            print(f"    Error converting {svg_path}: {result}")
+            render_failures += 1
+            continue
+        files.append((svg_path.with_suffix(".png").name, result))
 
+    started = time.monotonic()
+    stats = sync_screenshot_set(screenshot_set["id"], files, missing=render_failures)
+    if pipeline:
+        pipeline.record_upload(time.monotonic() - started)
+    return stats["failed"] == 0
 
-def reserve_screenshot(screenshot_set_id: str, filename: str, file_size: int) -> dict:
-    """Reserve a screenshot upload"""
-    data = {
-        "data": {
-            "type": "appScreenshots",
-            "attributes": {
-                "fileName": filename,
-                "fileSize": file_size
-            },
-            "relationships": {
-                "appScreenshotSet": {
-                    "data": {
-                        "type": "appScreenshotSets",
-                        "id": screenshot_set_id
-                    }
-                }
-            }
-        }
-    }
-    return api_post("/appScreenshots", data)
 
+# ============================================================
+# Metadata Plan / Apply
+# ============================================================
 
-def upload_screenshot_part(upload_url: str, data: bytes, offset: int, length: int) -> None:
-    """Upload a screenshot part"""
-    headers = {
-        "Content-Type": "application/octet-stream",
-        "Content-Range": f"bytes {offset}-{offset + length - 1}/{len(data)}"
-    }
-    response = requests.put(upload_url, headers=headers, data=data[offset:offset + length])
-    response.raise_for_status()
+def _normalize_text(value) -> str:
+    """Normalize remote/local text before comparing (ASC may return CRLF or null)"""
+    return (value or "").replace("\r\n", "\n").strip()
 
 
-def commit_screenshot(screenshot_id: str, checksum: str) -> dict:
-    """Commit a screenshot upload"""
-    data = {
-        "data": {
-            "type": "appScreenshots",
-            "id": screenshot_id,
-            "attributes": {
-                "uploaded": True,
-                "sourceFileChecksum": checksum
-            }
-        }
+def _changed_attributes(desired: dict, remote: dict) -> dict:
+    """Return the subset of `desired` that differs from the remote attributes"""
+    return {
+        key: value for key, value in desired.items()
+        if _normalize_text(remote.get(key)) != _normalize_text(value)
     }
-    return api_patch(f"/appScreenshots/{screenshot_id}", data)
 
 
-def upload_screenshot(screenshot_set_id: str, png_path: Path) -> bool:
-    """Upload a single screenshot"""
-    import hashlib
+def plan_locale(api_locale: str, metadata: dict, state: "RemoteState") -> list:
+    """Diff local metadata against remote localizations
 
-    file_data = png_path.read_bytes()
-    file_size = len(file_data)
-    checksum = hashlib.md5(file_data).hexdigest()
-
-    # Reserve upload
-    reservation = reserve_screenshot(screenshot_set_id, png_path.name, file_size)
-    screenshot_id = reservation["data"]["id"]
-
-    # Get upload operations
-    upload_ops = reservation["data"]["attributes"].get("uploadOperations", [])
-
-    if not upload_ops:
-        print(f"    No upload operations returned for {png_path.name}")
-        return False
-
-    # Upload parts
-    for op in upload_ops:
-        upload_url = op["url"]
-        offset = op["offset"]
-        length = op["length"]
-
-        headers = {k: v for k, v in op.get("requestHeaders", []) if isinstance(op.get("requestHeaders"), list)}
-        if isinstance(op.get("requestHeaders"), list):
-            headers = {h["name"]: h["value"] for h in op["requestHeaders"]}
-
-        part_data = file_data[offset:offset + length]
-        response = requests.put(upload_url, headers=headers, data=part_data)
-        response.raise_for_status()
-
-    # Commit upload
-    commit_screenshot(screenshot_id, checksum)
-    return True
+    Returns the minimal list of changes; each change is a dict with
+    `type`, `action` ("create" or "update"), `locale`, `id` (updates only)
+    and the `attributes` that will be sent.
+    """
+    changes = []
 
+    desired = version_localization_attributes(metadata)
+    remote = state.version_localizations.get(api_locale)
+    if remote is None:
+        changes.append({
+            "type": "appStoreVersionLocalizations",
+            "action": "create",
+            "locale": api_locale,
+            "attributes": desired,
+            "metadata": metadata,
+        })
+    else:
+        changed = _changed_attributes(desired, remote["attributes"])
+        if changed:
+            changes.append({
+                "type": "appStoreVersionLocalizations",
+                "action": "update",
+                "locale": api_locale,
+                "id": remote["id"],
+                "attributes": changed,
+            })
+
+    desired = app_info_localization_attributes(metadata)
+    remote = state.app_info_localizations.get(api_locale)
+    if remote is None:
+        changes.append({
+            "type": "appInfoLocalizations",
+            "action": "create",
+            "locale": api_locale,
+            "attributes": desired,
+            "metadata": metadata,
+        })
+    else:
+        changed = _changed_attributes(desired, remote["attributes"])
+        if changed:
+            changes.append({
+                "type": "appInfoLocalizations",
+                "action": "update",
+                "locale": api_locale,
+                "id": remote["id"],
+                "attributes": changed,
+            })
+
+    return changes
+
+
+def describe_change(change: dict) -> str:
+    """One-line summary of a planned change"""
+    fields = ", ".join(sorted(change["attributes"]))
+    if change["action"] == "create":
+        return f"+ create {change['type']} ({change['locale']}): {fields}"
+    return f"~ update {change['type']} {change['id']} ({change['locale']}): {fields}"
+
+
+def apply_change(change: dict, state: "RemoteState") -> None:
+    """Send one planned change and record the result in the run state"""
+    if change["type"] == "appStoreVersionLocalizations":
+        if change["action"] == "create":
+            result = create_version_localization(state.version_id, change["locale"], change["metadata"])
+        else:
+            result = update_version_localization(change["id"], change["attributes"])
+        state.record_version_localization(result["data"])
+    else:
+        if change["action"] == "create":
+            result = create_app_info_localization(state.app_info_id, change["locale"], change["metadata"])
+        else:
+            result = update_app_info_localization(change["id"], change["attributes"])
+        state.record_app_info_localization(result["data"])
+
+
+def plan_metadata(locales: list, state: "RemoteState") -> dict:
+    """Plan metadata changes for every locale; returns {locale: [changes]}"""
+    plan = {}
+    for locale in locales:
+        api_locale = LOCALE_MAPPING.get(locale)
+        xml_path = METADATA_DIR / f"{locale}.xml"
+        if not api_locale or not xml_path.exists():
+            print(f"  ⚠️ Skipping {locale}: no mapping or metadata file")
+            continue
+        plan[locale] = plan_locale(api_locale, parse_metadata_xml(xml_path), state)
+    return plan
 
-def upload_screenshots_for_locale(localization_id: str, locale: str, promo_folder: str) -> None:
-    """Upload all promotional screenshots for a locale"""
-    promo_path = PROMO_DIR / promo_folder
 
-    if not promo_path.exists():
-        print(f"    No promo folder found: {promo_path}")
-        return
+def print_plan(plan: dict) -> None:
+    """Print planned creates and patches grouped by locale"""
+    creates = updates = 0
+    for locale, changes in plan.items():
+        if not changes:
+            continue
+        print(f"  {locale}:")
+        for change in changes:
+            print(f"    {describe_change(change)}")
+            if change["action"] == "create":
+                creates += 1
+            else:
+                updates += 1
 
-    # Get or create screenshot set for iPhone 6.7" display (largest available)
-    screenshot_sets = get_screenshot_sets(localization_id)
+    unchanged = sum(1 for changes in plan.values() if not changes)
+    print(f"\nPlan: {creates} to create, {updates} to update, {unchanged} locales unchanged")
 
-    display_type = "APP_IPHONE_67"  # iPhone 6.7" display
-    screenshot_set = None
 
-    for ss in screenshot_sets:
-        if ss["attributes"]["screenshotDisplayType"] == display_type:
-            screenshot_set = ss
-            break
+# ============================================================
+# Main Upload Function
+# ============================================================
 
-    if not screenshot_set:
-        print(f"    Creating screenshot set for {display_type}")
-        screenshot_set = create_screenshot_set(localization_id, display_type)["data"]
+class RemoteState:
+    """Run-scoped snapshot of the remote resources upload_locale works against
 
-    screenshot_set_id = screenshot_set["id"]
+    The app, app info, editable version and both localization lists are
+    fetched once per run. Creates and patches record the returned resource
+    here, so later steps read the local copy instead of re-fetching.
+    """
 
-    # Delete existing screenshots
-    existing = get_screenshots_in_set(screenshot_set_id)
-    for ss in existing:
-        print(f"    Deleting existing screenshot: {ss['attributes']['fileName']}")
-        delete_screenshot(ss["id"])
-        time.sleep(0.5)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.app_id = get_app_id()
+        self.app_info = get_app_info(self.app_id)
+        self.version = get_app_store_version(self.app_id)
+        self.version_localizations = get_version_localizations(self.version["id"])
+        self.app_info_localizations = get_app_info_localizations(self.app_info["id"])
 
-    # Convert and upload SVGs
-    svg_files = sorted(promo_path.glob("promo_*.svg"))
+    @property
+    def version_id(self) -> str:
+        return self.version["id"]
 
-    for svg_path in svg_files:
-        png_path = svg_path.with_suffix(".png")
+    @property
+    def app_info_id(self) -> str:
+        return self.app_info["id"]
 
-        print(f"    Converting {svg_path.name} to PNG...")
-        if not convert_svg_to_png(svg_path, png_path):
-            continue
+    def record_version_localization(self, resource: dict) -> None:
+        """Store a created/updated appStoreVersionLocalization"""
+        with self._lock:
+            self.version_localizations[resource["attributes"]["locale"]] = resource
 
-        print(f"    Uploading {png_path.name}...")
-        try:
-            upload_screenshot(screenshot_set_id, png_path)
-            print(f"    ✓ Uploaded {png_path.name}")
-        except Exception as e:
-            print(f"    ✗ Failed to upload {png_path.name}: {e}")
-        finally:
-            # Clean up PNG
-            if png_path.exists():
-                png_path.unlink()
+    def record_app_info_localization(self, resource: dict) -> None:
+        """Store a created/updated appInfoLocalization"""
+        with self._lock:
+            self.app_info_localizations[resource["attributes"]["locale"]] = resource
 
-        time.sleep(1)
 
+def upload_locale(locale: str, skip_screenshots: bool = False, state: RemoteState = None,
+                  pipeline: "RenderPipeline" = None) -> bool:
+    """Upload metadata and screenshots for a single locale
 
-# ============================================================
-# Main Upload Function
-# ============================================================
+    `state` is shared across locales in --all runs; it is fetched here when
+    not given. `pipeline` holds promos rendered ahead for --all runs.
+    """
+    import requests
 
-def upload_locale(locale: str, skip_screenshots: bool = False) -> bool:
-    """Upload metadata and screenshots for a single locale"""
     xml_locale = locale
     api_locale = LOCALE_MAPPING.get(locale)
     promo_folder = PROMO_FOLDER_MAPPING.get(locale)
@@ -676,53 +626,37 @@ def upload_locale(locale: str, skip_screenshots: bool = False) -> bool:
         print(f"  Title: {metadata['title'][:40]}...")
         print(f"  Subtitle: {metadata['subtitle'][:40]}...")
 
-        # Get app info
-        app_id = get_app_id()
-        print(f"  App ID: {app_id}")
+        # App, version and existing localizations (shared across locales when given)
+        if state is None:
+            state = RemoteState()
+        print(f"  App ID: {state.app_id}")
 
-        # Get app info and version
-        app_info = get_app_info(app_id)
-        app_info_id = app_info["id"]
+        version_string = state.version["attributes"]["versionString"]
+        print(f"  Version: {version_string} ({state.version_id})")
 
-        version = get_app_store_version(app_id)
-        version_id = version["id"]
-        version_string = version["attributes"]["versionString"]
-        print(f"  Version: {version_string} ({version_id})")
+        version_locs = state.version_localizations
 
-        # Get existing localizations
-        version_locs = get_version_localizations(version_id)
-        app_info_locs = get_app_info_localizations(app_info_id)
+        # Create or patch only what differs from the remote localizations
+        changes = plan_locale(api_locale, metadata, state)
+        with tracing.span("metadata", locale=api_locale, changes=len(changes)):
+            for change in changes:
+                print(f"  {describe_change(change)}")
+                apply_change(change, state)
 
-        # Update or create version localization (description, keywords)
-        if api_locale in version_locs:
-            loc_id = version_locs[api_locale]["id"]
-            print(f"  Updating version localization: {loc_id}")
-            update_version_localization(loc_id, metadata)
+        if changes:
+            print(f"  ✓ Metadata updated ({len(changes)} changes)")
         else:
-            print(f"  Creating version localization for {api_locale}")
-            result = create_version_localization(version_id, api_locale, metadata)
-            loc_id = result["data"]["id"]
-
-        # Update or create app info localization (name, subtitle)
-        if api_locale in app_info_locs:
-            info_loc_id = app_info_locs[api_locale]["id"]
-            print(f"  Updating app info localization: {info_loc_id}")
-            update_app_info_localization(info_loc_id, metadata)
-        else:
-            print(f"  Creating app info localization for {api_locale}")
-            create_app_info_localization(app_info_id, api_locale, metadata)
-
-        print(f"  ✓ Metadata updated")
+            print(f"  ✓ Metadata unchanged")
 
         # Upload screenshots
         if not skip_screenshots and promo_folder:
             print(f"  Uploading screenshots from: {promo_folder}")
 
-            # Get version localization ID for screenshots
-            version_locs = get_version_localizations(version_id)
             if api_locale in version_locs:
                 ver_loc_id = version_locs[api_locale]["id"]
-                upload_screenshots_for_locale(ver_loc_id, api_locale, promo_folder)
+                if not upload_screenshots_for_locale(ver_loc_id, locale, promo_folder, pipeline):
+                    print(f"❌ Screenshots incomplete for {locale}")
+                    return False
             else:
                 print(f"    ⚠️ No version localization found for screenshots")
 
@@ -745,7 +679,7 @@ def upload_locale(locale: str, skip_screenshots: bool = False) -> bool:
         return False
 
 
-def main():
+def main(argv: list = None):
     """Main entry point"""
     import argparse
 
@@ -754,8 +688,17 @@ def main():
     parser.add_argument("--all", action="store_true", help="Upload all locales")
     parser.add_argument("--skip-screenshots", action="store_true", help="Skip screenshot upload")
     parser.add_argument("--list", action="store_true", help="List available locales")
-
-    args = parser.parse_args()
+    parser.add_argument("--plan", action="store_true",
+                        help="Show metadata creates/patches without applying them")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Upload N locales concurrently with --all (default: 1)")
+    parser.add_argument("--part-concurrency", type=int, default=asc_screenshots.PART_CONCURRENCY,
+                        metavar="N", help="Parallel part uploads per screenshot (default: %(default)s)")
+    tracing.add_argument(parser)
+
+    args = parser.parse_args(argv)
+    asc_screenshots.PART_CONCURRENCY = args.part_concurrency
+    tracing.start(args.trace)
 
     if args.list:
         print("Available locales:")
@@ -765,24 +708,50 @@ def main():
             print(f"  {status} {locale}")
         return
 
+    if args.plan:
+        locales = [args.locale] if args.locale else sorted(LOCALE_MAPPING.keys())
+        state = RemoteState()
+        print_plan(plan_metadata(locales, state))
+        return
+
     if args.locale:
         success = upload_locale(args.locale, args.skip_screenshots)
         sys.exit(0 if success else 1)
 
     elif args.all:
-        success_count = 0
-        fail_count = 0
+        locales = sorted(LOCALE_MAPPING.keys())
+        state = RemoteState()
 
-        for locale in sorted(LOCALE_MAPPING.keys()):
-            if upload_locale(locale, args.skip_screenshots):
-                success_count += 1
-            else:
-                fail_count += 1
-            time.sleep(2)  # Rate limiting
+        # Render upcoming locales while earlier ones upload; the buffer holds
+        # at most one batch per upload worker plus one ready to go
+        pipeline = None
+        if not args.skip_screenshots:
+            pipeline = create_render_pipeline(locales, capacity=max(args.jobs, 1) + 1)
+
+        def upload(locale: str) -> bool:
+            try:
+                with tracing.span("locale", locale=locale):
+                    return upload_locale(locale, args.skip_screenshots, state, pipeline)
+            finally:
+                # Free the render buffer slot if the screenshots were never taken
+                if pipeline:
+                    pipeline.discard(locale)
+
+        try:
+            results = run_grouped(locales, upload, jobs=args.jobs)
+        finally:
+            if pipeline:
+                pipeline.close()
+        failed = [locale for locale, success in zip(locales, results) if not success]
 
         print(f"\n{'='*60}")
-        print(f"Summary: {success_count} succeeded, {fail_count} failed")
+        print(f"Summary: {len(locales) - len(failed)} succeeded, {len(failed)} failed")
+        if failed:
+            print(f"Failed: {', '.join(failed)}")
         print(f"{'='*60}")
+        asc_client.print_connection_stats()
+        if pipeline:
+            pipeline.print_stats()
 
     else:
         parser.print_help()
@@ -7,42 +7,33 @@ Uploads store listings and promotional images.
 단일 모드: 언어 하나씩 업로드
 """
 
+import hashlib
+import io
 import os
 import sys
-import xml.etree.ElementTree as ET
-import subprocess
-import tempfile
+import threading
 from pathlib import Path
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+import tracing
+from parallel import run_grouped
+from play_client import PACKAGE_NAME, execute_batch, get_play_service
 
 # Configuration
-PACKAGE_NAME = "com.kobbokkom.scannie"
-SERVICE_ACCOUNT_JSON = "/Users/semanticist/Documents/API/simple-anzan-3e199a55a5b1.json"
 PROJECT_ROOT = Path(__file__).parent.parent
 METADATA_DIR = PROJECT_ROOT / "store" / "metadata" / "android"
 PROMO_DIR = PROJECT_ROOT / "store" / "screenshots" / "promotions" / "android" / "lang"
 FEATURE_GRAPHIC = PROJECT_ROOT / "store" / "screenshots" / "graphic" / "feature_graphic.png"
 
-# Google Play API scopes
-SCOPES = ['https://www.googleapis.com/auth/androidpublisher']
-
-
-def get_play_service():
-    """Create authenticated Google Play Developer API service."""
-    credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_JSON,
-        scopes=SCOPES
-    )
-    return build('androidpublisher', 'v3', credentials=credentials)
+# Phone screenshots: 1080x1920 (9:16 ratio)
+SCREENSHOT_SIZE = (1080, 1920)
 
 
 def parse_metadata_xml(xml_path: Path) -> dict:
     """Parse metadata XML file and return title, short_description, full_description."""
-    content = xml_path.read_text(encoding='utf-8')
     import re
+    import xml.etree.ElementTree as ET
+
+    content = xml_path.read_text(encoding='utf-8')
     content = re.sub(r'&(?!amp;|lt;|gt;|quot;|apos;|#)', '&amp;', content)
     root = ET.fromstring(content)
 
@@ -53,55 +44,55 @@ def parse_metadata_xml(xml_path: Path) -> dict:
     }
 
 
-def convert_svg_to_png(svg_path: Path, output_path: Path, width: int = 1024, height: int = 500):
-    """Convert SVG to PNG using rsvg-convert."""
-    subprocess.run([
-        'rsvg-convert',
-        '-w', str(width),
-        '-h', str(height),
-        str(svg_path),
-        '-o', str(output_path)
-    ], check=True)
+def png_media(png_data: bytes) -> "MediaIoBaseUpload":
+    """Wrap in-memory PNG bytes for an images().upload() call."""
+    from googleapiclient.http import MediaIoBaseUpload
+    return MediaIoBaseUpload(io.BytesIO(png_data), mimetype='image/png')
+
 
+def image_sha256(png_data: bytes) -> str:
+    """Hash in the form images().list reports for uploaded images."""
+    return hashlib.sha256(png_data).hexdigest()
 
-def ensure_24bit_png(input_path: Path, output_path: Path = None):
-    """Convert PNG to 24-bit RGB (no alpha) for Google Play compatibility.
 
-    Google Play requires 24-bit PNG (no alpha) for screenshots and feature graphics.
-    This removes alpha channel and converts to 8-bit/channel RGB.
+def list_images(service, edit_id: str, lang_code: str, image_type: str) -> list:
+    """Images of one type for a language, in display order."""
+    response = service.edits().images().list(
+        packageName=PACKAGE_NAME,
+        editId=edit_id,
+        language=lang_code,
+        imageType=image_type
+    ).execute()
+    return response.get('images', [])
+
+
+def list_images_batched(service, edit_id: str, languages: list, image_type: str) -> dict:
+    """images().list for many languages in batch requests; {language: images}.
+
+    Languages whose list call failed are left out (callers fall back to
+    listing them individually).
     """
-    if output_path is None:
-        output_path = input_path
-
-    # Use sips (macOS built-in) to convert to RGB without alpha
-    subprocess.run([
-        'sips',
-        '-s', 'format', 'png',
-        '-s', 'formatOptions', 'best',
-        '--setProperty', 'format', 'png',
-        str(input_path),
-        '--out', str(output_path)
-    ], check=True, capture_output=True)
-
-    # Flatten to remove alpha and ensure 24-bit using ImageMagick if available
-    try:
-        subprocess.run([
-            'convert',
-            str(output_path),
-            '-background', 'white',
-            '-alpha', 'remove',
-            '-alpha', 'off',
-            '-depth', '8',
-            str(output_path)
-        ], check=True, capture_output=True)
-    except FileNotFoundError:
-        # ImageMagick not installed, try with sips only
-        pass
+    requests = {
+        lang_code: service.edits().images().list(
+            packageName=PACKAGE_NAME,
+            editId=edit_id,
+            language=lang_code,
+            imageType=image_type
+        )
+        for lang_code in languages
+    }
+    return {
+        lang_code: (response or {}).get('images', [])
+        for lang_code, (response, exception) in execute_batch(service, requests).items()
+        if exception is None
+    }
 
 
 def delete_feature_graphic_for_language(service, edit_id: str, lang_code: str) -> bool:
-    """Delete feature graphic for a specific language."""
+    """Delete feature graphic for a specific language, if it has one."""
     try:
+        if not list_images(service, edit_id, lang_code, 'featureGraphic'):
+            return False
         service.edits().images().deleteall(
             packageName=PACKAGE_NAME,
             editId=edit_id,
@@ -116,6 +107,9 @@ def delete_feature_graphic_for_language(service, edit_id: str, lang_code: str) -
 def upload_feature_graphic(service, edit_id: str) -> bool:
     """Upload feature graphic for en-US only (shared across all languages).
 
+    Skipped when Play already has the same image (by sha256). Returns True
+    if a new graphic was uploaded.
+
     Requirements: 1024 x 500 pixels, 24-bit PNG (no alpha), max 1MB
     """
     if not FEATURE_GRAPHIC.exists():
@@ -123,51 +117,155 @@ def upload_feature_graphic(service, edit_id: str) -> bool:
         return False
 
     try:
-        # Delete existing
-        delete_feature_graphic_for_language(service, edit_id, 'en-US')
+        # Flatten to 24-bit PNG for Google Play compatibility
+        from svg_render import flatten_png
+        png_data = flatten_png(FEATURE_GRAPHIC.read_bytes())
 
-        # Convert to 24-bit PNG for Google Play compatibility
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            tmp_path = Path(tmp.name)
+        existing = list_images(service, edit_id, 'en-US', 'featureGraphic')
+        if [image.get('sha256') for image in existing] == [image_sha256(png_data)]:
+            print("     ⏭️  Feature Graphic unchanged (en-US)")
+            return False
 
-        try:
-            ensure_24bit_png(FEATURE_GRAPHIC, tmp_path)
-            media = MediaFileUpload(str(tmp_path), mimetype='image/png')
-            service.edits().images().upload(
+        # Delete existing
+        if existing:
+            service.edits().images().deleteall(
                 packageName=PACKAGE_NAME,
                 editId=edit_id,
                 language='en-US',
-                imageType='featureGraphic',
-                media_body=media
+                imageType='featureGraphic'
             ).execute()
-            print("     ✅ Feature Graphic (en-US)")
-            return True
-        finally:
-            if tmp_path.exists():
-                tmp_path.unlink()
+
+        service.edits().images().upload(
+            packageName=PACKAGE_NAME,
+            editId=edit_id,
+            language='en-US',
+            imageType='featureGraphic',
+            media_body=png_media(png_data)
+        ).execute()
+        print("     ✅ Feature Graphic (en-US)")
+        return True
     except Exception as e:
         print(f"     ❌ Feature Graphic: {e}")
         return False
 
 
-def upload_language(service, edit_id: str, lang_code: str, skip_screenshots: bool = False) -> bool:
-    """Upload metadata and image for a single language within an existing edit."""
+def build_listing_body(lang_code: str):
+    """Listing fields for a language from its metadata XML (None if there is none)."""
+    xml_path = METADATA_DIR / f"{lang_code}.xml"
+    if not xml_path.exists():
+        return None
+    metadata = parse_metadata_xml(xml_path)
+
+    listing_body = {}
+    if metadata.get('title'):
+        listing_body['title'] = metadata['title'][:30]
+    if metadata.get('short_description'):
+        listing_body['shortDescription'] = metadata['short_description'][:80]
+    if metadata.get('full_description'):
+        listing_body['fullDescription'] = metadata['full_description'][:4000]
+    return listing_body
+
+
+def get_remote_listings(service, edit_id: str) -> dict:
+    """All listings currently in the edit, keyed by language."""
+    response = service.edits().listings().list(
+        packageName=PACKAGE_NAME,
+        editId=edit_id
+    ).execute()
+    return {listing['language']: listing for listing in response.get('listings', [])}
+
+
+def _normalize_text(value) -> str:
+    """Normalize text before comparing (the API may return CRLF or omit fields)."""
+    return (value or '').replace('\r\n', '\n').strip()
+
+
+def listing_differs(listing_body: dict, remote_listing: dict) -> bool:
+    """True if any field we would send differs from the listing Play already has."""
+    if remote_listing is None:
+        return True
+    return any(
+        _normalize_text(value) != _normalize_text(remote_listing.get(field))
+        for field, value in listing_body.items()
+    )
+
+
+def update_listings_batched(service, edit_id: str, languages: list, remote_listings: dict) -> tuple:
+    """Update differing listings in batch requests; returns (updated, failed) languages."""
+    requests = {}
+    unchanged = 0
+    for lang_code in languages:
+        listing_body = build_listing_body(lang_code)
+        if listing_body is None:
+            print(f"     ⚠️  {lang_code}: No metadata")
+            continue
+        if not listing_differs(listing_body, remote_listings.get(lang_code)):
+            unchanged += 1
+            continue
+        requests[lang_code] = service.edits().listings().update(
+            packageName=PACKAGE_NAME,
+            editId=edit_id,
+            language=lang_code,
+            body=listing_body
+        )
+
+    updated = []
+    failed = []
+    for lang_code, (_, exception) in execute_batch(service, requests).items():
+        if exception is not None:
+            print(f"     ❌ {lang_code} Metadata: {exception}")
+            failed.append(lang_code)
+        else:
+            updated.append(lang_code)
+    print(f"     ✅ Metadata: {len(updated)} updated, {unchanged} unchanged")
+    return updated, failed
+
+
+def delete_feature_graphics_batched(service, edit_id: str, languages: list) -> list:
+    """Delete per-language feature graphics in batch requests (en-US is the fallback).
+
+    Existing graphics are listed first so deleteall is only sent where one exists.
+    """
+    existing = list_images_batched(service, edit_id, languages, 'featureGraphic')
+    requests = {
+        lang_code: service.edits().images().deleteall(
+            packageName=PACKAGE_NAME,
+            editId=edit_id,
+            language=lang_code,
+            imageType='featureGraphic'
+        )
+        for lang_code in languages
+        # Unknown (list failed): delete blindly as before
+        if existing.get(lang_code, True)
+    }
+    deleted = [
+        lang_code for lang_code, (response, exception) in execute_batch(service, requests).items()
+        if exception is None and (response or {}).get('deleted')
+    ]
+    if deleted:
+        print(f"     🗑️  Feature Graphic deleted (using en-US fallback): {', '.join(sorted(deleted))}")
+    return deleted
+
+
+def upload_language(service, edit_id: str, lang_code: str, remote_listing: dict = None,
+                    skip_screenshots: bool = False) -> tuple:
+    """Upload metadata and image for a single language within an existing edit.
+
+    The listing is only updated if it differs from `remote_listing` (the
+    language's listings().list entry). Returns (success, changes), where
+    changes counts what was modified in the edit.
+    """
     print(f"\n  📌 {lang_code}")
     success = True
+    changes = 0
 
     # 1. Upload metadata
-    xml_path = METADATA_DIR / f"{lang_code}.xml"
-    if xml_path.exists():
-        metadata = parse_metadata_xml(xml_path)
-
-        listing_body = {}
-        if metadata.get('title'):
-            listing_body['title'] = metadata['title'][:30]
-        if metadata.get('short_description'):
-            listing_body['shortDescription'] = metadata['short_description'][:80]
-        if metadata.get('full_description'):
-            listing_body['fullDescription'] = metadata['full_description'][:4000]
-
+    listing_body = build_listing_body(lang_code)
+    if listing_body is None:
+        print(f"     ⚠️  No metadata")
+    elif not listing_differs(listing_body, remote_listing):
+        print(f"     ⏭️  Metadata unchanged")
+    else:
         try:
             service.edits().listings().update(
                 packageName=PACKAGE_NAME,
@@ -176,80 +274,135 @@ def upload_language(service, edit_id: str, lang_code: str, skip_screenshots: boo
                 body=listing_body
             ).execute()
             print(f"     ✅ Metadata")
+            changes += 1
         except Exception as e:
             print(f"     ❌ Metadata: {e}")
             success = False
-    else:
-        print(f"     ⚠️  No metadata")
 
     # 2. Delete feature graphic for this language (en-US will be the only one with it)
     #    This cleans up any incorrectly uploaded graphics per language
     if lang_code != 'en-US':
         if delete_feature_graphic_for_language(service, edit_id, lang_code):
             print(f"     🗑️  Feature Graphic deleted (using en-US fallback)")
+            changes += 1
 
     # 3. Upload phone screenshots (promo_1~4.svg → PNG)
     if skip_screenshots:
         print(f"     ⏭️  Screenshots skipped")
-        return success
+        return success, changes
+
+    stats = upload_screenshots(service, edit_id, lang_code)
+    changes += stats['uploaded'] + stats['deleted']
+    return stats['failed'] == 0 and success, changes
+
 
+def upload_screenshots(service, edit_id: str, lang_code: str, existing: list = None) -> dict:
+    """Make a language's phone screenshots match its rendered promos.
+
+    Play keeps images in upload order, so the longest prefix of `existing`
+    (images().list result; fetched when None) whose sha256 matches the
+    rendered PNGs is kept, the remaining remote images are deleted and only
+    the rest is uploaded. Returns counts of kept/deleted/uploaded/failed.
+    """
+    stats = {'kept': 0, 'deleted': 0, 'uploaded': 0, 'failed': 0}
     promo_dir = PROMO_DIR / lang_code
     if promo_dir.exists():
-        # Delete existing phone screenshots
-        try:
-            service.edits().images().deleteall(
-                packageName=PACKAGE_NAME,
-                editId=edit_id,
-                language=lang_code,
-                imageType='phoneScreenshots'
-            ).execute()
-        except Exception:
-            pass
-
-        screenshot_count = 0
-        for i in range(1, 5):  # promo_1 ~ promo_4
-            promo_svg = promo_dir / f"promo_{i}.svg"
-            if promo_svg.exists():
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                    png_path = Path(tmp.name)
-
-                try:
-                    # Phone screenshots: 1080x1920 (9:16 ratio)
-                    convert_svg_to_png(promo_svg, png_path, width=1080, height=1920)
-
-                    media = MediaFileUpload(str(png_path), mimetype='image/png')
-                    service.edits().images().upload(
-                        packageName=PACKAGE_NAME,
-                        editId=edit_id,
-                        language=lang_code,
-                        imageType='phoneScreenshots',
-                        media_body=media
-                    ).execute()
-                    screenshot_count += 1
-
-                except Exception as e:
-                    print(f"     ❌ Screenshot {i}: {e}")
-                    success = False
-                finally:
-                    if png_path.exists():
-                        png_path.unlink()
-
-        if screenshot_count > 0:
-            print(f"     ✅ Screenshots ({screenshot_count})")
-        else:
+        # promo_1 ~ promo_4, rendered and flattened to 24-bit PNG in memory
+        promo_svgs = [
+            (i, promo_dir / f"promo_{i}.svg") for i in range(1, 5)
+            if (promo_dir / f"promo_{i}.svg").exists()
+        ]
+        from svg_render import render_many
+        rendered = render_many([svg for _, svg in promo_svgs], *SCREENSHOT_SIZE, flatten=True)
+
+        desired = []
+        for (i, _), png_data in zip(promo_svgs, rendered):
+            if isinstance(png_data, Exception):
+                print(f"     ❌ Screenshot {i}: {png_data}")
+                stats['failed'] += 1
+            else:
+                desired.append((i, png_data))
+        if not desired:
             print(f"     ⚠️  No screenshots")
+            return stats
+
+        if existing is None:
+            existing = list_images(service, edit_id, lang_code, 'phoneScreenshots')
+
+        keep = 0
+        while (keep < min(len(existing), len(desired))
+               and existing[keep].get('sha256') == image_sha256(desired[keep][1])):
+            keep += 1
+        stats['kept'] = keep
+
+        # Delete remote screenshots past the matching prefix
+        for image in existing[keep:]:
+            try:
+                service.edits().images().delete(
+                    packageName=PACKAGE_NAME,
+                    editId=edit_id,
+                    language=lang_code,
+                    imageType='phoneScreenshots',
+                    imageId=image['id']
+                ).execute()
+                stats['deleted'] += 1
+            except Exception as e:
+                print(f"     ❌ Delete screenshot {image['id']}: {e}")
+                stats['failed'] += 1
+
+        for i, png_data in desired[keep:]:
+            try:
+                service.edits().images().upload(
+                    packageName=PACKAGE_NAME,
+                    editId=edit_id,
+                    language=lang_code,
+                    imageType='phoneScreenshots',
+                    media_body=png_media(png_data)
+                ).execute()
+                stats['uploaded'] += 1
+
+            except Exception as e:
+                print(f"     ❌ Screenshot {i}: {e}")
+                stats['failed'] += 1
+
+        if stats['uploaded'] or stats['deleted']:
+            print(f"     ✅ Screenshots: {stats['uploaded']} uploaded, "
+                  f"{stats['deleted']} deleted, {stats['kept']} unchanged")
+        else:
+            print(f"     ⏭️  Screenshots unchanged ({stats['kept']})")
     else:
         print(f"     ⚠️  No promo dir")
 
-    return success
+    return stats
+
+
+def discard_edit(service, edit_id: str) -> bool:
+    """Delete an edit that has no changes instead of committing it (no quota used)."""
+    try:
+        service.edits().delete(
+            packageName=PACKAGE_NAME,
+            editId=edit_id
+        ).execute()
+        return True
+    except Exception as e:
+        print(f"❌ Edit 삭제 실패: {e}")
+        return False
+
 
+def upload_batch(languages: list, skip_screenshots: bool = False, jobs: int = 1):
+    """Upload multiple languages in a single edit (1 quota usage).
 
-def upload_batch(languages: list, skip_screenshots: bool = False):
-    """Upload multiple languages in a single edit (1 quota usage)."""
+    Only listings that differ from Play are updated. If the edit ends up
+    with no changes at all it is deleted instead of committed, so no quota
+    is used. With jobs > 1, screenshots are uploaded for several languages
+    concurrently; each language's output is printed as one block.
+    """
     print(f"\n{'='*60}")
     print(f"🚀 배치 업로드: {len(languages)}개 언어")
     if skip_screenshots:
         print(f"📷 스크린샷 업로드 건너뜀 (메타데이터만)")
+    if jobs > 1:
+        print(f"⚡ 동시 업로드: {jobs}개 언어씩")
     print(f"💡 할당량 1개만 사용합니다!")
     print(f"{'='*60}")
 
@@ -264,21 +417,63 @@ def upload_batch(languages: list, skip_screenshots: bool = False):
     edit_id = edit_request['id']
     print(f"✅ Edit ID: {edit_id}")
 
-    # Upload Feature Graphic for en-US only (fallback for all languages)
-    print(f"\n🖼️  Feature Graphic 업로드 (en-US만)...")
-    upload_feature_graphic(service, edit_id)
+    # Metadata: diff against the edit's listings, batch-update only what differs
+    print(f"\n📤 메타데이터 배치 업로드 중...")
+    with tracing.span("metadata", languages=len(languages)):
+        remote_listings = get_remote_listings(service, edit_id)
+        updated, failed = update_listings_batched(service, edit_id, languages, remote_listings)
+    failed = set(failed)
+    changes = len(updated)
 
-    # Upload all languages (metadata + delete feature graphic + screenshots)
-    print(f"\n📤 언어별 업로드 중...")
-    success_count = 0
-    fail_count = 0
+    # Upload Feature Graphic for en-US only (fallback for all languages);
+    # skipped by hash when unchanged
+    print(f"\n🖼️  Feature Graphic 업로드 (en-US만)...")
+    with tracing.span("feature graphic"):
+        if upload_feature_graphic(service, edit_id):
+            changes += 1
+        changes += len(delete_feature_graphics_batched(
+            service, edit_id, [lang for lang in languages if lang != 'en-US']))
 
-    for i, lang in enumerate(languages, 1):
-        print(f"\n[{i}/{len(languages)}]", end="")
-        if upload_language(service, edit_id, lang, skip_screenshots=skip_screenshots):
-            success_count += 1
-        else:
-            fail_count += 1
+    if skip_screenshots:
+        print(f"\n⏭️  Screenshots skipped")
+    else:
+        # Screenshots: existing images are listed in batches, then media uploads
+        # (which can't be batched) go through the worker pool
+        print(f"\n📤 언어별 스크린샷 업로드 중...")
+        remote_screenshots = list_images_batched(service, edit_id, languages, 'phoneScreenshots')
+        done = [0]
+        done_lock = threading.Lock()
+
+        def upload(lang: str) -> dict:
+            print(f"\n  📌 {lang}")
+            try:
+                with tracing.span("language", language=lang):
+                    stats = upload_screenshots(service, edit_id, lang, remote_screenshots.get(lang))
+            except Exception as e:
+                print(f"     ❌ {e}")
+                stats = {'kept': 0, 'deleted': 0, 'uploaded': 0, 'failed': 1}
+            with done_lock:
+                done[0] += 1
+                print(f"     [{done[0]}/{len(languages)}] {lang} {'✅' if not stats['failed'] else '❌'}")
+            return stats
+
+        results = run_grouped(languages, upload, jobs=jobs)
+        failed.update(lang for lang, stats in zip(languages, results) if stats['failed'])
+        changes += sum(stats['uploaded'] + stats['deleted'] for stats in results)
+
+    failed = [lang for lang in languages if lang in failed]
+    success_count = len(languages) - len(failed)
+    fail_count = len(failed)
+
+    # Nothing differs from Play: drop the edit instead of spending a commit
+    if changes == 0:
+        print(f"\n\n{'='*60}")
+        print(f"⏭️  변경 사항 없음 - Edit 삭제, commit 건너뜀 (할당량 사용 안 함)")
+        if not discard_edit(service, edit_id):
+            return False
+        if fail_count > 0:
+            print(f"⚠️  {fail_count}개 언어 실패: {', '.join(failed)}")
+        return fail_count == 0
 
     # Commit once
     print(f"\n\n{'='*60}")
@@ -290,7 +485,7 @@ def upload_batch(languages: list, skip_screenshots: bool = False):
         ).execute()
         print(f"✅ 성공! {success_count}개 언어 업로드 완료")
         if fail_count > 0:
-            print(f"⚠️  {fail_count}개 언어 실패")
+            print(f"⚠️  {fail_count}개 언어 실패: {', '.join(failed)}")
         return True
     except Exception as e:
         print(f"❌ Commit 실패: {e}")
@@ -298,7 +493,11 @@ def upload_batch(languages: list, skip_screenshots: bool = False):
 
 
 def upload_single_language(lang_code: str):
-    """Upload metadata and image for a single language (legacy mode)."""
+    """Upload metadata and image for a single language (legacy mode).
+
+    Like upload_batch, the edit is deleted instead of committed when nothing
+    differs from Play.
+    """
     print(f"\n{'='*60}")
     print(f"🚀 단일 업로드: {lang_code}")
     print(f"{'='*60}")
@@ -313,12 +512,21 @@ def upload_single_language(lang_code: str):
     edit_id = edit_request['id']
     print(f"✅ Edit ID: {edit_id}")
 
+    changes = 0
+
     # Upload feature graphic if en-US
     if lang_code == 'en-US':
         print(f"\n🖼️  Feature Graphic 업로드...")
-        upload_feature_graphic(service, edit_id)
+        if upload_feature_graphic(service, edit_id):
+            changes += 1
 
-    upload_language(service, edit_id, lang_code)
+    remote_listings = get_remote_listings(service, edit_id)
+    success, language_changes = upload_language(service, edit_id, lang_code, remote_listings.get(lang_code))
+    changes += language_changes
+
+    if changes == 0:
+        print(f"\n⏭️  변경 사항 없음 - Edit 삭제, commit 건너뜀 (할당량 사용 안 함)")
+        return discard_edit(service, edit_id) and success
 
     print(f"\n📤 Commit 중...")
     try:
@@ -327,13 +535,13 @@ def upload_single_language(lang_code: str):
             editId=edit_id
         ).execute()
         print(f"✅ {lang_code} 완료!")
-        return True
+        return success
     except Exception as e:
         print(f"❌ Commit 실패: {e}")
         return False
 
 
-def main():
+def main(argv: list = None):
     """Main entry point."""
     import argparse
 
@@ -344,6 +552,7 @@ def main():
 예시:
   python upload_play_store.py --all                    # 모든 언어 (메타데이터 + 스크린샷)
   python upload_play_store.py --all --skip-screenshots # 모든 언어 (메타데이터만)
+  python upload_play_store.py --all --jobs 8           # 8개 언어씩 동시 업로드
   python upload_play_store.py ko-KR                    # 단일 언어
   python upload_play_store.py --batch ko-KR en-US      # 특정 언어들만
   python upload_play_store.py --list                   # 언어 목록
@@ -354,8 +563,12 @@ def main():
     parser.add_argument('--batch', nargs='+', metavar='LANG', help='특정 언어들 배치 업로드')
     parser.add_argument('--list', action='store_true', help='사용 가능한 언어 목록')
     parser.add_argument('--skip-screenshots', action='store_true', help='스크린샷 업로드 건너뜀 (메타데이터만)')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='배치 업로드 시 N개 언어 동시 업로드 (기본: 1)')
+    tracing.add_argument(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    tracing.start(args.trace)
 
     print("🚀 Google Play Store Uploader")
     print(f"📱 Package: {PACKAGE_NAME}")
@@ -371,7 +584,7 @@ def main():
         return
 
     if args.all:
-        upload_batch(languages, skip_screenshots=args.skip_screenshots)
+        upload_batch(languages, skip_screenshots=args.skip_screenshots, jobs=args.jobs)
         return
 
     if args.batch:
@@ -380,7 +593,7 @@ def main():
         if invalid_langs:
             print(f"⚠️  유효하지 않은 언어: {', '.join(invalid_langs)}")
         if valid_langs:
-            upload_batch(valid_langs, skip_screenshots=args.skip_screenshots)
+            upload_batch(valid_langs, skip_screenshots=args.skip_screenshots, jobs=args.jobs)
         else:
             print("❌ 유효한 언어가 없습니다")
         return